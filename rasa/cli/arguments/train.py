@@ -18,12 +18,15 @@ def set_train_arguments(parser: argparse.ArgumentParser):
     add_out_param(parser, help_text="Directory where your models should be stored.")
 
     add_augmentation_param(parser)
+    add_generation_workers_param(parser)
     add_debug_plots_param(parser)
     add_dump_stories_param(parser)
 
     add_model_name_param(parser)
     add_persist_nlu_data_param(parser)
     add_force_param(parser)
+    add_no_cache_param(parser)
+    add_training_jobs_params(parser)
 
 
 def set_train_core_arguments(parser: argparse.ArgumentParser):
@@ -33,10 +36,13 @@ def set_train_core_arguments(parser: argparse.ArgumentParser):
     add_out_param(parser, help_text="Directory where your models should be stored.")
 
     add_augmentation_param(parser)
+    add_generation_workers_param(parser)
     add_debug_plots_param(parser)
     add_dump_stories_param(parser)
 
     add_force_param(parser)
+    add_no_cache_param(parser)
+    add_training_jobs_params(parser)
 
     add_model_name_param(parser)
 
@@ -98,6 +104,39 @@ def add_compare_params(
     )
 
 
+def add_no_cache_param(
+    parser: Union[argparse.ArgumentParser, argparse._ActionsContainer]
+):
+    parser.add_argument(
+        "--no-cache",
+        default=False,
+        action="store_true",
+        help="If enabled, the generated and featurized Core training data is not "
+        "cached in the output directory to speed up the next training. The cache "
+        "is stored in the `.cache` directory of the output directory, which keeps "
+        "the most recently used entries and can be deleted at any time.",
+    )
+
+
+def add_training_jobs_params(
+    parser: Union[argparse.ArgumentParser, argparse._ActionsContainer]
+):
+    parser.add_argument(
+        "--training-jobs",
+        type=int,
+        default=1,
+        help="Number of processes which train at the same time. Core and NLU "
+        "are trained in parallel, and so are the policies of the Core model.",
+    )
+    parser.add_argument(
+        "--threads-per-job",
+        type=int,
+        default=None,
+        help="Number of threads each of the parallel training processes uses. "
+        "Defaults to an equal share of the CPUs.",
+    )
+
+
 def add_augmentation_param(
     parser: Union[argparse.ArgumentParser, argparse._ActionsContainer]
 ):
@@ -109,6 +148,18 @@ def add_augmentation_param(
     )
 
 
+def add_generation_workers_param(
+    parser: Union[argparse.ArgumentParser, argparse._ActionsContainer]
+):
+    parser.add_argument(
+        "--generation-workers",
+        type=int,
+        default=1,
+        help="Number of processes used to generate the training data from the "
+        "stories.",
+    )
+
+
 def add_dump_stories_param(
     parser: Union[argparse.ArgumentParser, argparse._ActionsContainer]
 ):
@@ -146,10 +146,18 @@ def extract_additional_arguments(args: argparse.Namespace) -> Dict:
 
     if "augmentation" in args:
         arguments["augmentation_factor"] = args.augmentation
+    if "generation_workers" in args:
+        arguments["num_generation_workers"] = args.generation_workers
     if "dump_stories" in args:
         arguments["dump_stories"] = args.dump_stories
     if "debug_plots" in args:
         arguments["debug_plots"] = args.debug_plots
+    if "no_cache" in args:
+        arguments["use_training_cache"] = not args.no_cache
+    if "training_jobs" in args:
+        arguments["training_jobs"] = args.training_jobs
+    if "threads_per_job" in args:
+        arguments["threads_per_job"] = args.threads_per_job
 
     return arguments
 
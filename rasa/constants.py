@@ -10,6 +10,7 @@ DEFAULT_DATA_PATH = "data"
 DEFAULT_RESULTS_PATH = "results"
 DEFAULT_NLU_RESULTS_PATH = "nlu_comparison_results"
 DEFAULT_CORE_SUBDIRECTORY_NAME = "core"
+DEFAULT_TRAINING_CACHE_DIRECTORY_NAME = ".cache"
 DEFAULT_REQUEST_TIMEOUT = 60 * 5  # 5 minutes
 
 TEST_DATA_FILE = "test.md"
@@ -53,9 +54,48 @@ DEFAULT_LOG_LEVEL_LIBRARIES = "ERROR"
 ENV_LOG_LEVEL = "LOG_LEVEL"
 ENV_LOG_LEVEL_LIBRARIES = "LOG_LEVEL_LIBRARIES"
 
+# thread budget of TensorFlow when several trainings run in parallel
+ENV_CPU_INTER_OP_CONFIG = "TF_INTER_OP_PARALLELISM_THREADS"
+ENV_CPU_INTRA_OP_CONFIG = "TF_INTRA_OP_PARALLELISM_THREADS"
+
 DEFAULT_SANIC_WORKERS = 1
 ENV_SANIC_WORKERS = "SANIC_WORKERS"
 ENV_SANIC_BACKLOG = "SANIC_BACKLOG"
+DEFAULT_SANIC_WORKER_ROUTING = "default"
+ENV_SANIC_WORKER_ROUTING = "SANIC_WORKER_ROUTING"
+
+DEFAULT_INFERENCE_EXECUTOR = "inline"
+ENV_INFERENCE_EXECUTOR = "INFERENCE_EXECUTOR"
+ENV_INFERENCE_EXECUTOR_WORKERS = "INFERENCE_EXECUTOR_WORKERS"
+
+DEFAULT_MAX_PARSE_BATCH_TEXTS = 1000
+ENV_MAX_PARSE_BATCH_TEXTS = "MAX_PARSE_BATCH_TEXTS"
+
+DEFAULT_NLU_MAX_BATCH_SIZE = 1
+DEFAULT_NLU_MAX_BATCH_WAIT_MS = 5
+ENV_NLU_MAX_BATCH_SIZE = "NLU_MAX_BATCH_SIZE"
+ENV_NLU_MAX_BATCH_WAIT_MS = "NLU_MAX_BATCH_WAIT_MS"
+
+DEFAULT_HTTP_CONNECTION_LIMIT = 100
+DEFAULT_HTTP_CONNECTION_LIMIT_PER_HOST = 0  # no limit
+DEFAULT_HTTP_KEEPALIVE_TIMEOUT = 15  # in seconds
+DEFAULT_HTTP_DNS_CACHE_TTL = 10  # in seconds
+ENV_HTTP_CONNECTION_LIMIT = "HTTP_CONNECTION_LIMIT"
+ENV_HTTP_CONNECTION_LIMIT_PER_HOST = "HTTP_CONNECTION_LIMIT_PER_HOST"
+ENV_HTTP_KEEPALIVE_TIMEOUT = "HTTP_KEEPALIVE_TIMEOUT"
+ENV_HTTP_DNS_CACHE_TTL = "HTTP_DNS_CACHE_TTL"
+
+DEFAULT_EVENT_BROKER_BUFFER_SIZE = 0
+DEFAULT_EVENT_BROKER_BATCH_SIZE = 100
+DEFAULT_EVENT_BROKER_FLUSH_INTERVAL_MS = 200
+ENV_EVENT_BROKER_BUFFER_SIZE = "EVENT_BROKER_BUFFER_SIZE"
+ENV_EVENT_BROKER_BATCH_SIZE = "EVENT_BROKER_BATCH_SIZE"
+ENV_EVENT_BROKER_FLUSH_INTERVAL_MS = "EVENT_BROKER_FLUSH_INTERVAL_MS"
+
+DEFAULT_TRACKER_CACHE_SIZE = 0
+DEFAULT_TRACKER_CACHE_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+ENV_TRACKER_CACHE_SIZE = "TRACKER_CACHE_SIZE"
+ENV_TRACKER_CACHE_MAX_BYTES = "TRACKER_CACHE_MAX_BYTES"
 
 DEFAULT_SESSION_EXPIRATION_TIME_IN_MINUTES = 60
 DEFAULT_CARRY_OVER_SLOTS_TO_NEW_SESSION = True
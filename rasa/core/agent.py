@@ -31,11 +31,13 @@ from rasa.core.policies.memoization import MemoizationPolicy
 from rasa.core.policies.policy import Policy
 from rasa.core.processor import MessageProcessor
 from rasa.core.tracker_store import (
+    CachedTrackerStore,
     InMemoryTrackerStore,
     TrackerStore,
     FailSafeTrackerStore,
 )
 from rasa.core.trackers import DialogueStateTracker
+from rasa.core.training.cache import TrainingDataCache
 from rasa.exceptions import ModelNotFound
 from rasa.importers.importer import TrainingDataImporter
 from rasa.model import (
@@ -140,59 +142,58 @@ async def _pull_model_and_fingerprint(
 
     logger.debug(f"Requesting model from server {model_server.url}...")
 
-    async with model_server.session() as session:
-        try:
-            params = model_server.combine_parameters()
-            async with session.request(
-                "GET",
-                model_server.url,
-                timeout=DEFAULT_REQUEST_TIMEOUT,
-                headers=headers,
-                params=params,
-            ) as resp:
-
-                if resp.status in [204, 304]:
-                    logger.debug(
-                        "Model server returned {} status code, "
-                        "indicating that no new model is available. "
-                        "Current fingerprint: {}"
-                        "".format(resp.status, fingerprint)
-                    )
-                    return None
-                elif resp.status == 404:
-                    logger.debug(
-                        "Model server could not find a model at the requested "
-                        "endpoint '{}'. It's possible that no model has been "
-                        "trained, or that the requested tag hasn't been "
-                        "assigned.".format(model_server.url)
-                    )
-                    return None
-                elif resp.status != 200:
-                    logger.debug(
-                        "Tried to fetch model from server, but server response "
-                        "status code is {}. We'll retry later..."
-                        "".format(resp.status)
-                    )
-                    return None
-
-                model_directory = tempfile.mkdtemp()
-                rasa.utils.io.unarchive(await resp.read(), model_directory)
+    try:
+        params = model_server.combine_parameters()
+        async with model_server.pooled_session().request(
+            "GET",
+            model_server.url,
+            timeout=DEFAULT_REQUEST_TIMEOUT,
+            headers=headers,
+            params=params,
+        ) as resp:
+
+            if resp.status in [204, 304]:
                 logger.debug(
-                    "Unzipped model to '{}'".format(os.path.abspath(model_directory))
+                    "Model server returned {} status code, "
+                    "indicating that no new model is available. "
+                    "Current fingerprint: {}"
+                    "".format(resp.status, fingerprint)
                 )
+                return None
+            elif resp.status == 404:
+                logger.debug(
+                    "Model server could not find a model at the requested "
+                    "endpoint '{}'. It's possible that no model has been "
+                    "trained, or that the requested tag hasn't been "
+                    "assigned.".format(model_server.url)
+                )
+                return None
+            elif resp.status != 200:
+                logger.debug(
+                    "Tried to fetch model from server, but server response "
+                    "status code is {}. We'll retry later..."
+                    "".format(resp.status)
+                )
+                return None
 
-                # get the new fingerprint
-                new_fingerprint = resp.headers.get("ETag")
-                # return new tmp model directory and new fingerprint
-                return model_directory, new_fingerprint
-
-        except aiohttp.ClientError as e:
+            model_directory = tempfile.mkdtemp()
+            rasa.utils.io.unarchive(await resp.read(), model_directory)
             logger.debug(
-                "Tried to fetch model from server, but "
-                "couldn't reach server. We'll retry later... "
-                "Error: {}.".format(e)
+                "Unzipped model to '{}'".format(os.path.abspath(model_directory))
             )
-            return None
+
+            # get the new fingerprint
+            new_fingerprint = resp.headers.get("ETag")
+            # return new tmp model directory and new fingerprint
+            return model_directory, new_fingerprint
+
+    except aiohttp.ClientError as e:
+        logger.debug(
+            "Tried to fetch model from server, but "
+            "couldn't reach server. We'll retry later... "
+            "Error: {}.".format(e)
+        )
+        return None
 
 
 async def _run_model_pulling_worker(
@@ -280,6 +281,16 @@ async def load_agent(
         raise
 
 
+def close_replaced_interpreter(
+    previous: Optional[NaturalLanguageInterpreter],
+    current: Optional[NaturalLanguageInterpreter],
+) -> None:
+    """Close an interpreter which was replaced, unless it's still in use."""
+
+    if previous is not None and previous is not current:
+        previous.close()
+
+
 class Agent:
     """The Agent class provides a convenient interface for the most important
      Rasa functionality.
@@ -339,7 +350,9 @@ class Agent:
         self.policy_ensemble = policy_ensemble
 
         if interpreter:
+            previous_interpreter = self.interpreter
             self.interpreter = NaturalLanguageInterpreter.create(interpreter)
+            close_replaced_interpreter(previous_interpreter, self.interpreter)
 
         self._set_fingerprint(fingerprint)
 
@@ -453,6 +466,21 @@ class Agent:
         message = UserMessage(message_data)
         return await processor._parse_message(message, tracker)
 
+    async def parse_messages_using_nlu_interpreter(
+        self, texts: List[Text]
+    ) -> List[Dict[Text, Any]]:
+        """Parses several messages at once.
+
+        Args:
+            texts: The received messages in text or intent payload format.
+
+        Returns:
+            The parsed messages in the order of `texts`.
+        """
+
+        processor = self.create_processor()
+        return await processor._parse_messages(texts)
+
     async def handle_message(
         self,
         message: UserMessage,
@@ -636,8 +664,14 @@ class Agent:
         use_story_concatenation: bool = True,
         debug_plots: bool = False,
         exclusion_percentage: int = None,
+        num_generation_workers: int = 1,
+        training_data_cache: Optional[TrainingDataCache] = None,
     ) -> List[DialogueStateTracker]:
-        """Load training data from a resource."""
+        """Load training data from a resource.
+
+        `num_generation_workers` processes are used to generate the training
+        trackers from the stories. If a `training_data_cache` is given, trackers
+        which were generated from the same stories before are loaded from it."""
 
         max_history = self._max_history()
 
@@ -669,6 +703,8 @@ class Agent:
             use_story_concatenation,
             debug_plots,
             exclusion_percentage=exclusion_percentage,
+            num_generation_workers=num_generation_workers,
+            training_data_cache=training_data_cache,
         )
 
     def train(
@@ -898,7 +934,7 @@ class Agent:
         else:
             tracker_store = InMemoryTrackerStore(domain)
 
-        return FailSafeTrackerStore(tracker_store)
+        return FailSafeTrackerStore(CachedTrackerStore.create_from_env(tracker_store))
 
     @staticmethod
     def _create_lock_store(store: Optional[LockStore]) -> LockStore:
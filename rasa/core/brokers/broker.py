@@ -1,6 +1,20 @@
+import asyncio
+import atexit
 import logging
-from typing import Any, Dict, Text, Optional, Union
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Text, Optional, Union
 
+from rasa.constants import (
+    DEFAULT_EVENT_BROKER_BATCH_SIZE,
+    DEFAULT_EVENT_BROKER_BUFFER_SIZE,
+    DEFAULT_EVENT_BROKER_FLUSH_INTERVAL_MS,
+    ENV_EVENT_BROKER_BATCH_SIZE,
+    ENV_EVENT_BROKER_BUFFER_SIZE,
+    ENV_EVENT_BROKER_FLUSH_INTERVAL_MS,
+)
 from rasa.utils import common
 from rasa.utils.endpoints import EndpointConfig
 
@@ -32,6 +46,222 @@ class EventBroker:
 
         raise NotImplementedError("Event broker must implement the `publish` method.")
 
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        """Publishes several json-formatted Rasa Core events at once.
+
+        Event brokers which can publish several events with a single operation
+        should override this."""
+
+        for event in events:
+            self.publish(event)
+
+    def close(self) -> None:
+        """Publish all events which are still waiting and release resources."""
+
+        pass
+
+
+class EventBrokerMetrics:
+    """Keeps track of the events published by a buffering event broker."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.published = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.max_buffer_depth = 0
+        self.total_publish_time = 0.0
+
+    def events_buffered(self, buffer_depth: int) -> None:
+        with self._lock:
+            self.max_buffer_depth = max(self.max_buffer_depth, buffer_depth)
+
+    def events_dropped(self, number_of_events: int) -> None:
+        with self._lock:
+            self.dropped += number_of_events
+
+    def batch_published(self, number_of_events: int, publish_time: float) -> None:
+        with self._lock:
+            self.published += number_of_events
+            self.batches += 1
+            self.total_publish_time += publish_time
+
+    def batch_failed(self, number_of_events: int) -> None:
+        with self._lock:
+            self.failed += number_of_events
+
+    def as_dict(self) -> Dict[Text, Any]:
+        batches = max(self.batches, 1)
+        return {
+            "published": self.published,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "avg_batch_size": self.published / batches,
+            "max_buffer_depth": self.max_buffer_depth,
+            "avg_publish_time": self.total_publish_time / batches,
+        }
+
+
+class BufferedEventBroker(EventBroker):
+    """Wraps an event broker and publishes its events in batches in the background.
+
+    Published events are added to a bounded buffer. A background thread passes
+    them to `publish_batch` of the wrapped broker as soon as `batch_size` events
+    are waiting or the first waiting event waited for `flush_interval` seconds.
+    If the buffer is full, publishing blocks for up to `block_timeout` seconds
+    before the remaining events are dropped. Events which are published from a
+    running event loop are dropped right away instead, as blocking would stall
+    every other task of the loop. Waiting events are published when the broker
+    is closed, at the latest when the process exits.
+    """
+
+    def __init__(
+        self,
+        event_broker: EventBroker,
+        max_buffer_size: int = 10000,
+        batch_size: int = DEFAULT_EVENT_BROKER_BATCH_SIZE,
+        flush_interval: float = DEFAULT_EVENT_BROKER_FLUSH_INTERVAL_MS / 1000,
+        block_timeout: float = 5.0,
+    ) -> None:
+        self._event_broker = event_broker
+        self.max_buffer_size = max(max_buffer_size, 1)
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.metrics = EventBrokerMetrics()
+
+        self._buffer: Deque[Dict[Text, Any]] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="event-broker-flusher", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def create_from_env(cls, event_broker: EventBroker) -> EventBroker:
+        """Wrap `event_broker` in a buffer if the `EVENT_BROKER_BUFFER_SIZE`
+        environment variable is set to a positive number of events.
+
+        The batch size and the maximum time events wait in the buffer can be set
+        with the `EVENT_BROKER_BATCH_SIZE` and `EVENT_BROKER_FLUSH_INTERVAL_MS`
+        environment variables."""
+
+        max_buffer_size = int(
+            os.environ.get(
+                ENV_EVENT_BROKER_BUFFER_SIZE, DEFAULT_EVENT_BROKER_BUFFER_SIZE
+            )
+        )
+        if max_buffer_size <= 0 or isinstance(event_broker, BufferedEventBroker):
+            return event_broker
+
+        batch_size = int(
+            os.environ.get(ENV_EVENT_BROKER_BATCH_SIZE, DEFAULT_EVENT_BROKER_BATCH_SIZE)
+        )
+        flush_interval_in_ms = float(
+            os.environ.get(
+                ENV_EVENT_BROKER_FLUSH_INTERVAL_MS,
+                DEFAULT_EVENT_BROKER_FLUSH_INTERVAL_MS,
+            )
+        )
+        logger.debug(
+            f"Buffering up to {max_buffer_size} events of "
+            f"'{event_broker.__class__.__name__}'."
+        )
+        return cls(
+            event_broker, max_buffer_size, batch_size, flush_interval_in_ms / 1000
+        )
+
+    @property
+    def buffer_depth(self) -> int:
+        """Number of events waiting to be published."""
+
+        return len(self._buffer)
+
+    def publish(self, event: Dict[Text, Any]) -> None:
+        self.publish_batch([event])
+
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        # `asyncio.get_running_loop` is only available from Python 3.7 on
+        if asyncio._get_running_loop() is not None:
+            block_timeout = 0.0
+        else:
+            block_timeout = self.block_timeout
+
+        with self._condition:
+            deadline = time.monotonic() + block_timeout
+            for index, event in enumerate(events):
+                has_space = self._condition.wait_for(
+                    lambda: len(self._buffer) < self.max_buffer_size or self._closed,
+                    max(deadline - time.monotonic(), 0),
+                )
+                if self._closed:
+                    # nobody is left to flush the buffer
+                    self._event_broker.publish_batch(events[index:])
+                    break
+
+                if not has_space:
+                    logger.warning(
+                        f"Buffer of {self.max_buffer_size} events is full. Dropping "
+                        f"event for conversation '{event.get('sender_id')}'."
+                    )
+                    self.metrics.events_dropped(1)
+                    continue
+
+                self._buffer.append(event)
+
+            self.metrics.events_buffered(len(self._buffer))
+            self._condition.notify_all()
+
+    def _run_flusher(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._buffer or self._closed)
+                if not self._buffer:
+                    # closed and everything was published
+                    return
+
+                self._condition.wait_for(
+                    lambda: len(self._buffer) >= self.batch_size or self._closed,
+                    self.flush_interval,
+                )
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                # publishers might wait for space in the buffer
+                self._condition.notify_all()
+
+            self._publish(batch)
+
+    def _publish(self, batch: List[Dict[Text, Any]]) -> None:
+        started_at = time.perf_counter()
+        try:
+            self._event_broker.publish_batch(batch)
+        except Exception as e:
+            logger.error(f"Failed to publish {len(batch)} events. Error: {e}")
+            self.metrics.batch_failed(len(batch))
+        else:
+            self.metrics.batch_published(len(batch), time.perf_counter() - started_at)
+
+    def close(self) -> None:
+        """Publish all events which are still waiting and close the wrapped
+        event broker."""
+
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        self._flusher.join()
+        self._event_broker.close()
+        logger.debug(f"Closed buffered event broker: {self.metrics.as_dict()}.")
+
 
 def _create_from_endpoint_config(
     endpoint_config: Optional[EndpointConfig],
@@ -62,6 +292,7 @@ def _create_from_endpoint_config(
 
     if broker:
         logger.debug(f"Instantiated event broker to '{broker.__class__.__name__}'.")
+        broker = BufferedEventBroker.create_from_env(broker)
     return broker
 
 
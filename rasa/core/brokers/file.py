@@ -1,7 +1,7 @@
 import json
 import logging
 import typing
-from typing import Optional, Text, Dict
+from typing import Dict, List, Optional, Text
 
 from rasa.core.brokers.broker import EventBroker
 
@@ -51,5 +51,13 @@ class FileEventBroker(EventBroker):
     def publish(self, event: Dict) -> None:
         """Write event to file."""
 
-        self.event_logger.info(json.dumps(event))
+        self.publish_batch([event])
+
+    def publish_batch(self, events: List[Dict]) -> None:
+        """Write all `events` to file with a single write."""
+
+        if not events:
+            return
+
+        self.event_logger.info("\n".join(json.dumps(event) for event in events))
         self.event_logger.handlers[0].flush()
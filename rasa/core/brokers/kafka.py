@@ -46,9 +46,25 @@ class KafkaEventBroker(EventBroker):
         return cls(broker_config.url, **broker_config.kwargs)
 
     def publish(self, event) -> None:
-        self._create_producer()
-        self._publish(event)
-        self._close()
+        self.publish_batch([event])
+
+    def publish_batch(self, events) -> None:
+        """Send all `events` asynchronously and wait until they were delivered.
+
+        The producer is kept open, so that its connection and batching can be
+        reused by later calls."""
+
+        if self.producer is None:
+            self._create_producer()
+
+        for event in events:
+            self._publish(event)
+        self.producer.flush()
+
+    def close(self) -> None:
+        if self.producer is not None:
+            self._close()
+            self.producer = None
 
     def _create_producer(self) -> None:
         import kafka
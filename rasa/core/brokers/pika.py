@@ -1,31 +1,39 @@
+import asyncio
+import concurrent.futures
 import json
 import logging
 import os
-import time
 import typing
+from asyncio import AbstractEventLoop
 from collections import deque
-from threading import Thread
-from typing import Callable, Deque, Dict, Optional, Text, Union
+from typing import Any, Callable, Deque, Dict, List, Optional, Text, Union
 
 from rasa.constants import (
     DEFAULT_LOG_LEVEL_LIBRARIES,
     ENV_LOG_LEVEL_LIBRARIES,
     DOCS_URL_EVENT_BROKERS,
 )
-from rasa.core.brokers.broker import EventBroker
+from rasa.core.brokers.broker import EventBroker, EventBrokerMetrics
 from rasa.utils.common import raise_warning
 from rasa.utils.endpoints import EndpointConfig
 from rasa.utils.io import DEFAULT_ENCODING
 
 if typing.TYPE_CHECKING:
+    from asyncio import Future, Task
+    from pika.adapters.asyncio_connection import AsyncioConnection
     from pika.adapters.blocking_connection import BlockingChannel
     from pika import SelectConnection, BlockingConnection, BasicProperties
     from pika.channel import Channel
+    from pika.frame import Method
     import pika
     from pika.connection import Parameters, Connection
 
 logger = logging.getLogger(__name__)
 
+BUFFER_POLICY_BLOCK = "block"
+BUFFER_POLICY_DROP = "drop"
+BUFFER_POLICIES = [BUFFER_POLICY_BLOCK, BUFFER_POLICY_DROP]
+
 
 def initialise_pika_connection(
     host: Text,
@@ -132,6 +140,43 @@ def initialise_pika_select_connection(
     )
 
 
+def initialise_pika_asyncio_connection(
+    parameters: "Parameters",
+    on_open_callback: Callable[["AsyncioConnection"], None],
+    on_open_error_callback: Callable[["AsyncioConnection", Text], None],
+    on_close_callback: Callable[["AsyncioConnection", Text], None],
+    loop: AbstractEventLoop,
+) -> "AsyncioConnection":
+    """Create a non-blocking Pika `AsyncioConnection`.
+
+    Args:
+        parameters: Parameters which should be used to connect.
+        on_open_callback: Callback which is called when the connection was established.
+        on_open_error_callback: Callback which is called when connecting to the broker
+            failed.
+        on_close_callback: Callback which is called when the connection was closed.
+        loop: Event loop which runs the connection.
+
+    Returns:
+        A callback based connection to the RabbitMQ event broker.
+    """
+
+    from pika.adapters.asyncio_connection import AsyncioConnection
+
+    return AsyncioConnection(
+        parameters,
+        on_open_callback=on_open_callback,
+        on_open_error_callback=on_open_error_callback,
+        on_close_callback=on_close_callback,
+        custom_ioloop=loop,
+    )
+
+
+def _get_running_loop() -> Optional[AbstractEventLoop]:
+    # `asyncio.get_running_loop` is only available from Python 3.7 on
+    return asyncio._get_running_loop()
+
+
 def initialise_pika_channel(
     host: Text,
     queue: Text,
@@ -200,6 +245,15 @@ def close_pika_connection(connection: "Connection") -> None:
 
 
 class PikaEventBroker(EventBroker):
+    """RabbitMQ event producer which publishes from the asyncio event loop.
+
+    Events are added to a bounded buffer and published in batches by a task
+    running on the event loop. Every batch waits for the publisher confirms of
+    RabbitMQ, so a slow broker shows up as publish latency in `metrics` instead of
+    as a growing buffer. Events which were not confirmed when the connection was
+    lost are published again after reconnecting.
+    """
+
     def __init__(
         self,
         host: Text,
@@ -210,6 +264,13 @@ class PikaEventBroker(EventBroker):
         loglevel: Union[Text, int] = os.environ.get(
             ENV_LOG_LEVEL_LIBRARIES, DEFAULT_LOG_LEVEL_LIBRARIES
         ),
+        max_buffer_size: int = 10000,
+        batch_size: int = 100,
+        buffer_policy: Text = BUFFER_POLICY_BLOCK,
+        block_timeout_in_seconds: float = 5,
+        confirm_timeout_in_seconds: float = 30,
+        retry_delay_in_seconds: float = 5,
+        loop: Optional[AbstractEventLoop] = None,
     ):
         """RabbitMQ event producer.
 
@@ -220,30 +281,68 @@ class PikaEventBroker(EventBroker):
             port: port of the Pika host.
             queue: Pika queue to declare.
             loglevel: Logging level.
+            max_buffer_size: Maximum number of events waiting to be published.
+            batch_size: Maximum number of events which are published before
+                waiting for their confirmation.
+            buffer_policy: What to do with events if the buffer is full. `block`
+                waits up to `block_timeout_in_seconds` for space if events are
+                published from another thread than the event loop, `drop` drops
+                them right away. Events published from the event loop itself are
+                always dropped, since waiting would block the publishing.
+            block_timeout_in_seconds: Maximum time to wait for space in the
+                buffer.
+            confirm_timeout_in_seconds: Maximum time to wait for RabbitMQ to
+                confirm a batch of events.
+            retry_delay_in_seconds: Delay in seconds between connection attempts.
+            loop: Event loop to publish from. Defaults to the running event loop
+                when the first event is published.
 
         """
         logging.getLogger("pika").setLevel(loglevel)
 
+        if buffer_policy not in BUFFER_POLICIES:
+            raise ValueError(
+                f"Unknown buffer policy '{buffer_policy}'. Valid policies are "
+                f"{', '.join(BUFFER_POLICIES)}."
+            )
+
         self.queue = queue
         self.host = host
         self.username = username
         self.password = password
         self.port = port
-        self.channel: Optional["Channel"] = None
+        self.max_buffer_size = max(max_buffer_size, 1)
+        self.batch_size = max(batch_size, 1)
+        self.buffer_policy = buffer_policy
+        self.block_timeout_in_seconds = block_timeout_in_seconds
+        self.confirm_timeout_in_seconds = confirm_timeout_in_seconds
+        self.retry_delay_in_seconds = retry_delay_in_seconds
+        self.metrics = EventBrokerMetrics()
 
-        # List to store unpublished messages which hopefully will be published later
-        self._unpublished_messages: Deque[Text] = deque()
-        self._run_pika()
-
-    def __del__(self) -> None:
-        if self.channel:
-            close_pika_channel(self.channel)
-            close_pika_connection(self.channel.connection)
+        self.channel: Optional["Channel"] = None
+        self._pika_connection: Optional["AsyncioConnection"] = None
+        self._buffer: Deque[Text] = deque()
+        # confirmations of published messages by their delivery tag
+        self._unconfirmed: Dict[int, "Future[bool]"] = {}
+        self._delivery_tag = 0
+        self._state_changed: Optional["Future[None]"] = None
+        self._publisher: Optional["Task[None]"] = None
+        self._closing = False
+
+        self._loop = loop or _get_running_loop()
+        if self._loop:
+            self._start_publisher()
 
     @property
     def rasa_environment(self) -> Optional[Text]:
         return os.environ.get("RASA_ENVIRONMENT")
 
+    @property
+    def buffer_depth(self) -> int:
+        """Number of events waiting to be published."""
+
+        return len(self._buffer)
+
     @classmethod
     def from_endpoint_config(
         cls, broker_config: Optional["EndpointConfig"]
@@ -253,75 +352,216 @@ class PikaEventBroker(EventBroker):
 
         return cls(broker_config.url, **broker_config.kwargs)
 
-    def _run_pika(self) -> None:
+    def _start_publisher(self) -> None:
+        if self._publisher is not None:
+            return
+
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+
+        self._publisher = self._loop.create_task(self._run_publisher())
+
+    def _connect(self) -> None:
+        if self._closing:
+            return
+
         parameters = _get_pika_parameters(
-            self.host, self.username, self.password, self.port
+            self.host,
+            self.username,
+            self.password,
+            self.port,
+            # reconnecting is done by the event broker
+            connection_attempts=1,
+            retry_delay_in_seconds=self.retry_delay_in_seconds,
         )
-        self._pika_connection = initialise_pika_select_connection(
-            parameters, self._on_open_connection, self._on_open_connection_error
+        self._pika_connection = initialise_pika_asyncio_connection(
+            parameters,
+            self._on_open_connection,
+            self._on_open_connection_error,
+            self._on_connection_closed,
+            self._loop,
         )
-        # Run Pika io loop in extra thread so it's not blocking
-        self._run_pika_io_loop_in_thread()
 
-    def _on_open_connection(self, connection: "SelectConnection") -> None:
+    def _reconnect_later(self) -> None:
+        if not self._closing:
+            self._loop.call_later(self.retry_delay_in_seconds, self._connect)
+
+    def _on_open_connection(self, connection: "AsyncioConnection") -> None:
         logger.debug(f"RabbitMQ connection to '{self.host}' was established.")
         connection.channel(on_open_callback=self._on_channel_open)
 
-    def _on_open_connection_error(self, _, error: Text) -> None:
+    def _on_open_connection_error(
+        self, _: "AsyncioConnection", error: Union[Text, Exception]
+    ) -> None:
         logger.warning(
-            f"Connecting to '{self.host}' failed with error '{error}'. Trying again."
+            f"Connecting to '{self.host}' failed with error '{error}'. Trying again "
+            f"in {self.retry_delay_in_seconds} seconds."
         )
+        self._reconnect_later()
+
+    def _on_connection_closed(
+        self, _: "AsyncioConnection", reason: Union[Text, Exception]
+    ) -> None:
+        self.channel = None
+        self._fail_unconfirmed(reason)
+
+        if self._closing:
+            logger.debug(f"RabbitMQ connection to '{self.host}' was closed.")
+        else:
+            logger.warning(
+                f"RabbitMQ connection to '{self.host}' was closed with error "
+                f"'{reason}'. Reconnecting in {self.retry_delay_in_seconds} "
+                f"seconds."
+            )
+            self._reconnect_later()
 
     def _on_channel_open(self, channel: "Channel") -> None:
         logger.debug("RabbitMQ channel was opened.")
-        channel.queue_declare(self.queue, durable=True)
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.queue_declare(
+            self.queue,
+            durable=True,
+            callback=lambda _: channel.confirm_delivery(
+                self._on_delivery_confirmation,
+                callback=lambda _: self._on_channel_ready(channel),
+            ),
+        )
 
+    def _on_channel_ready(self, channel: "Channel") -> None:
+        logger.debug(f"RabbitMQ channel is ready to publish to queue '{self.queue}'.")
         self.channel = channel
+        self._delivery_tag = 0
+        self._notify_state_changed()
 
-        while self._unpublished_messages:
-            # Send unpublished messages
-            message = self._unpublished_messages.popleft()
-            self._publish(message)
-            logger.debug(
-                f"Published message from queue of unpublished messages. "
-                f"Remaining unpublished messages: {len(self._unpublished_messages)}."
-            )
+    def _on_channel_closed(self, _: "Channel", reason: Union[Text, Exception]) -> None:
+        self.channel = None
+        self._fail_unconfirmed(reason)
 
-    def _run_pika_io_loop_in_thread(self) -> None:
-        thread = Thread(target=self._run_pika_io_loop, daemon=True)
-        thread.start()
+        # the connection is closed as well so that it is re-established
+        if self._pika_connection and self._pika_connection.is_open:
+            if not self._closing:
+                logger.warning(f"RabbitMQ channel was closed with error '{reason}'.")
+            self._pika_connection.close()
 
-    def _run_pika_io_loop(self) -> None:
-        self._pika_connection.ioloop.start()
+    def _on_delivery_confirmation(self, method_frame: "Method") -> None:
+        from pika.spec import Basic
 
-    def publish(
-        self, event: Dict, retries: int = 60, retry_delay_in_seconds: int = 5
-    ) -> None:
-        """Publish `event` into Pika queue.
+        confirmation = method_frame.method
+        acknowledged = isinstance(confirmation, Basic.Ack)
 
-        Perform `retries` publish attempts with `retry_delay_in_seconds` between them.
-        """
+        if confirmation.multiple:
+            delivery_tags = [
+                tag for tag in self._unconfirmed if tag <= confirmation.delivery_tag
+            ]
+        else:
+            delivery_tags = [confirmation.delivery_tag]
+
+        for tag in delivery_tags:
+            future = self._unconfirmed.pop(tag, None)
+            if future is not None and not future.done():
+                future.set_result(acknowledged)
+
+    def _fail_unconfirmed(self, reason: Union[Text, Exception]) -> None:
+        for future in self._unconfirmed.values():
+            if not future.done():
+                future.set_exception(
+                    ConnectionError(f"RabbitMQ channel was closed: {reason}")
+                )
+        self._unconfirmed.clear()
+
+    def _notify_state_changed(self) -> None:
+        """Wake up the publisher and everyone waiting for space in the buffer."""
+
+        if self._state_changed is not None and not self._state_changed.done():
+            self._state_changed.set_result(None)
+
+    async def _wait_for_state_change(self, timeout: Optional[float] = None) -> None:
+        if self._state_changed is None or self._state_changed.done():
+            self._state_changed = self._loop.create_future()
+
+        await asyncio.wait([self._state_changed], timeout=timeout)
+
+    def _is_channel_ready(self) -> bool:
+        return self.channel is not None and self.channel.is_open
+
+    async def _run_publisher(self) -> None:
+        self._connect()
+
+        while not (self._closing and not self._buffer):
+            if not self._buffer or not self._is_channel_ready():
+                await self._wait_for_state_change()
+                continue
+
+            batch = [
+                self._buffer.popleft()
+                for _ in range(min(self.batch_size, len(self._buffer)))
+            ]
+            # producers might wait for space in the buffer
+            self._notify_state_changed()
+
+            await self._publish_batch(batch)
+
+    async def _publish_batch(self, batch: List[Text]) -> None:
+        started_at = self._loop.time()
+        confirmations = [self._publish(body) for body in batch]
+        await asyncio.wait(confirmations, timeout=self.confirm_timeout_in_seconds)
+
+        unconfirmed = []
+        failed = 0
+        for body, confirmation in zip(batch, confirmations):
+            if not confirmation.done():
+                # a late confirmation is ignored
+                confirmation.cancel()
+                failed += 1
+            elif confirmation.exception() is not None:
+                unconfirmed.append(body)
+            elif not confirmation.result():
+                failed += 1
+
+        if unconfirmed:
+            logger.debug(
+                f"Connection was lost before {len(unconfirmed)} events were "
+                f"confirmed. Publishing them again after reconnecting."
+            )
+            self._buffer.extendleft(reversed(unconfirmed))
 
-        body = json.dumps(event)
+        if failed:
+            logger.error(
+                f"RabbitMQ did not confirm {failed} events published to queue "
+                f"'{self.queue}' on host '{self.host}'."
+            )
+            self.metrics.batch_failed(failed)
 
-        while retries:
-            try:
-                self._publish(body)
-                return
-            except Exception as e:
-                logger.error(
-                    "Could not open Pika channel at host '{}'. Failed with error: "
-                    "{}".format(self.host, e)
-                )
-                self.channel = None
+        published = len(batch) - len(unconfirmed) - failed
+        if published:
+            self.metrics.batch_published(published, self._loop.time() - started_at)
+            logger.debug(
+                f"Published {published} Pika events to queue '{self.queue}' on "
+                f"host '{self.host}'."
+            )
 
-            retries -= 1
-            time.sleep(retry_delay_in_seconds)
+    def _publish(self, body: Text) -> "Future[bool]":
+        confirmation = self._loop.create_future()
 
-        logger.error(
-            "Failed to publish Pika event to queue '{}' on host "
-            "'{}':\n{}".format(self.queue, self.host, body)
-        )
+        try:
+            self.channel.basic_publish(
+                "",
+                self.queue,
+                body.encode(DEFAULT_ENCODING),
+                properties=self._message_properties,
+            )
+        except Exception as e:
+            if self._is_channel_ready():
+                logger.error(f"Failed to publish Pika event. Error: {e}")
+                confirmation.set_result(False)
+            else:
+                # the connection was lost, the event is published after reconnecting
+                confirmation.set_exception(e)
+            return confirmation
+
+        self._delivery_tag += 1
+        self._unconfirmed[self._delivery_tag] = confirmation
+        return confirmation
 
     @property
     def _message_properties(self) -> "BasicProperties":
@@ -339,30 +579,119 @@ class PikaEventBroker(EventBroker):
 
         return BasicProperties(**kwargs)
 
-    def _publish(self, body: Text) -> None:
-        if self._pika_connection.is_closed:
-            # Try to reset connection
-            self._run_pika()
-        elif not self.channel:
-            logger.warning(
-                f"RabbitMQ channel has not been assigned. Adding message to "
-                f"list of unpublished messages and trying to publish them "
-                f"later. Current number of unpublished messages is "
-                f"{len(self._unpublished_messages)}."
+    def publish(self, event: Dict[Text, Any]) -> None:
+        """Publish `event` into Pika queue."""
+
+        self.publish_batch([event])
+
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        """Add `events` to the buffer of events which are published to the Pika queue.
+
+        Events which don't fit into the buffer are dropped, see `buffer_policy`.
+        """
+
+        messages = [json.dumps(event) for event in events]
+
+        if self._closing:
+            self._drop(messages)
+            return
+
+        self._start_publisher()
+
+        if _get_running_loop() is self._loop or not self._loop.is_running():
+            # waiting for space would block the publisher
+            remaining = self._enqueue(messages)
+        elif self.buffer_policy == BUFFER_POLICY_BLOCK:
+            enqueued = asyncio.run_coroutine_threadsafe(
+                self._enqueue_when_possible(messages), self._loop
             )
-            self._unpublished_messages.append(body)
+            try:
+                remaining = enqueued.result(self.block_timeout_in_seconds + 1)
+            except concurrent.futures.TimeoutError:
+                enqueued.cancel()
+                remaining = messages
         else:
-            self.channel.basic_publish(
-                "",
-                self.queue,
-                body.encode(DEFAULT_ENCODING),
-                properties=self._message_properties,
-            )
+            self._loop.call_soon_threadsafe(self._enqueue_or_drop, messages)
+            return
 
-            logger.debug(
-                f"Published Pika events to queue '{self.queue}' on host "
-                f"'{self.host}':\n{body}"
-            )
+        self._drop(remaining)
+
+    def _enqueue(self, messages: List[Text]) -> List[Text]:
+        """Add as many `messages` to the buffer as there is space for.
+
+        Returns:
+            The messages which didn't fit into the buffer.
+        """
+
+        space = max(self.max_buffer_size - len(self._buffer), 0)
+        self._buffer.extend(messages[:space])
+        self.metrics.events_buffered(len(self._buffer))
+        self._notify_state_changed()
+
+        return messages[space:]
+
+    def _enqueue_or_drop(self, messages: List[Text]) -> None:
+        self._drop(self._enqueue(messages))
+
+    async def _enqueue_when_possible(self, messages: List[Text]) -> List[Text]:
+        deadline = self._loop.time() + self.block_timeout_in_seconds
+        remaining = self._enqueue(messages)
+
+        while remaining and not self._closing:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+
+            await self._wait_for_state_change(timeout)
+            remaining = self._enqueue(remaining)
+
+        return remaining
+
+    def _drop(self, messages: List[Text]) -> None:
+        if not messages:
+            return
+
+        logger.warning(
+            f"Buffer of {self.max_buffer_size} events is full or the event broker "
+            f"was closed. Dropping {len(messages)} events for queue '{self.queue}'."
+        )
+        self.metrics.events_dropped(len(messages))
+
+    def close(self, timeout_in_seconds: float = 10) -> None:
+        """Publish the buffered events and close the connection.
+
+        Events which were not published within `timeout_in_seconds` are dropped.
+        """
+
+        if self._closing or self._publisher is None or self._loop.is_closed():
+            self._closing = True
+            return
+
+        closed = self._close(timeout_in_seconds)
+        if _get_running_loop() is self._loop:
+            self._loop.create_task(closed)
+        elif self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(closed, self._loop).result()
+        else:
+            self._loop.run_until_complete(closed)
+
+    async def _close(self, timeout_in_seconds: float) -> None:
+        self._closing = True
+        self._notify_state_changed()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(self._publisher), timeout_in_seconds)
+        except asyncio.TimeoutError:
+            self._publisher.cancel()
+            self._drop(list(self._buffer))
+            self._buffer.clear()
+
+        if self._pika_connection and not (
+            self._pika_connection.is_closing or self._pika_connection.is_closed
+        ):
+            close_pika_connection(self._pika_connection)
+
+        logger.debug(f"Closed Pika event broker: {self.metrics.as_dict()}.")
 
 
 def create_rabbitmq_ssl_options(
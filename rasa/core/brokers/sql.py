@@ -1,7 +1,7 @@
 import contextlib
 import json
 import logging
-from typing import Any, Dict, Optional, Text
+from typing import Any, Dict, List, Optional, Text
 
 from rasa.constants import DOCS_URL_EVENT_BROKERS
 from rasa.core.brokers.broker import EventBroker
@@ -67,11 +67,17 @@ class SQLEventBroker(EventBroker):
 
     def publish(self, event: Dict[Text, Any]) -> None:
         """Publishes a json-formatted Rasa Core event into an event queue."""
+        self.publish_batch([event])
+
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        """Inserts all `events` with a single bulk insert."""
         with self.session_scope() as session:
-            session.add(
-                self.SQLBrokerEvent(
-                    sender_id=event.get("sender_id"), data=json.dumps(event)
-                )
+            session.bulk_insert_mappings(
+                self.SQLBrokerEvent,
+                [
+                    {"sender_id": event.get("sender_id"), "data": json.dumps(event)}
+                    for event in events
+                ],
             )
             session.commit()
 
@@ -14,6 +14,11 @@ DEFAULT_REQUEST_TIMEOUT = 60 * 5  # 5 minutes
 
 DEFAULT_LOCK_LIFETIME = 60  # in seconds
 
+DEFAULT_TRACKER_SNAPSHOT_INTERVAL = 20  # in events
+
+# threads per tracker / lock store which run blocking calls of thread-safe clients
+DEFAULT_STORE_IO_THREADS = 8
+
 REQUESTED_SLOT = "requested_slot"
 
 # slots for knowledge base
@@ -0,0 +1,394 @@
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Text, Tuple
+
+from rasa.constants import (
+    DEFAULT_INFERENCE_EXECUTOR,
+    DEFAULT_NLU_MAX_BATCH_SIZE,
+    DEFAULT_NLU_MAX_BATCH_WAIT_MS,
+    ENV_INFERENCE_EXECUTOR,
+    ENV_INFERENCE_EXECUTOR_WORKERS,
+    ENV_NLU_MAX_BATCH_SIZE,
+    ENV_NLU_MAX_BATCH_WAIT_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_TYPE_INLINE = "inline"
+EXECUTOR_TYPE_THREAD = "thread"
+EXECUTOR_TYPE_PROCESS = "process"
+
+EXECUTOR_TYPES = [EXECUTOR_TYPE_INLINE, EXECUTOR_TYPE_THREAD, EXECUTOR_TYPE_PROCESS]
+
+__inference_executor = None
+
+
+def _timed_call(func: Callable[..., Any], *args: Any) -> Tuple[float, float, Any]:
+    """Run `func` and return the wall clock time it started and finished at.
+
+    Has to be a module level function so it can be pickled and sent to the
+    workers of a process pool."""
+
+    started_at = time.time()
+    result = func(*args)
+    return started_at, time.time(), result
+
+
+class ExecutorMetrics:
+    """Keeps track of queue depth and wait / run times of an `InferenceExecutor`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.total_run_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of tasks which were submitted but didn't finish yet."""
+        return self.submitted - self.completed - self.failed
+
+    def task_submitted(self) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def task_finished(self, wait_time: float, run_time: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+            self.total_run_time += run_time
+
+    def task_failed(self) -> None:
+        with self._lock:
+            self.failed += 1
+
+    def as_dict(self) -> Dict[Text, Any]:
+        finished = max(self.completed, 1)
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_wait_time": self.total_wait_time / finished,
+            "max_wait_time": self.max_wait_time,
+            "avg_run_time": self.total_run_time / finished,
+        }
+
+
+class InferenceExecutor:
+    """Runs CPU bound inference (NLU parsing, Core prediction) off the event loop.
+
+    Depending on `executor_type` tasks are either run inline on the event loop
+    (the default), in a pool of threads or in a pool of processes. Process pools
+    can use an `initializer` to load a copy of a model into each worker.
+    """
+
+    def __init__(
+        self,
+        executor_type: Text = EXECUTOR_TYPE_INLINE,
+        max_workers: Optional[int] = None,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple = (),
+    ) -> None:
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"Invalid executor type '{executor_type}'. Valid types are "
+                f"{', '.join(EXECUTOR_TYPES)}."
+            )
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.metrics = ExecutorMetrics()
+
+        if executor_type == EXECUTOR_TYPE_THREAD:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="rasa-inference"
+            )
+        elif executor_type == EXECUTOR_TYPE_PROCESS:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, initializer=initializer, initargs=initargs
+            )
+        else:
+            self._pool = None
+
+    @classmethod
+    def create_from_env(cls, **kwargs: Any) -> "InferenceExecutor":
+        """Create an executor configured by the `INFERENCE_EXECUTOR` and
+        `INFERENCE_EXECUTOR_WORKERS` environment variables."""
+
+        return cls(
+            configured_executor_type(), max_workers=configured_max_workers(), **kwargs
+        )
+
+    @property
+    def is_inline(self) -> bool:
+        return self._pool is None
+
+    def warm_up(self) -> None:
+        """Start all workers of a process pool so that their initializers run.
+
+        This has to be done while the files the initializers depend on (e.g. an
+        unpacked model) still exist."""
+
+        if self.executor_type != EXECUTOR_TYPE_PROCESS:
+            return
+
+        number_of_workers = self.max_workers or os.cpu_count() or 1
+        futures = [self._pool.submit(time.time) for _ in range(number_of_workers)]
+        concurrent.futures.wait(futures)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run `func` with `args` and return its result.
+
+        When running in a process pool, `func` and `args` have to be picklable."""
+
+        self.metrics.task_submitted()
+        submitted_at = time.time()
+
+        try:
+            if self.is_inline:
+                started_at, finished_at, result = _timed_call(func, *args)
+            else:
+                loop = asyncio.get_event_loop()
+                started_at, finished_at, result = await loop.run_in_executor(
+                    self._pool, _timed_call, func, *args
+                )
+        except Exception:
+            self.metrics.task_failed()
+            raise
+
+        wait_time = max(started_at - submitted_at, 0.0)
+        self.metrics.task_finished(wait_time, finished_at - started_at)
+        logger.debug(
+            f"Inference task '{getattr(func, '__name__', func)}' waited "
+            f"{wait_time * 1000:.1f} ms in the '{self.executor_type}' executor "
+            f"(queue depth {self.metrics.queue_depth})."
+        )
+
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+
+class BlockingIOExecutor:
+    """Runs blocking calls of storage clients (e.g. of tracker or lock stores) in
+    a pool of threads, so that they don't block the event loop.
+
+    Calls are run inline if `max_workers` is `0`, which is meant for stores
+    without any I/O. Clients which can't be used by several threads at once need
+    a single worker. The pool is only created on the first call, so that it's
+    not shared by forked Sanic workers.
+    """
+
+    def __init__(
+        self, max_workers: int = 1, thread_name_prefix: Text = "rasa-io"
+    ) -> None:
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @property
+    def is_inline(self) -> bool:
+        return self.max_workers <= 0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `func` with `args` and `kwargs` and return its result."""
+
+        if self.is_inline:
+            return func(*args, **kwargs)
+
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.thread_name_prefix,
+            )
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+class MicroBatcher:
+    """Gathers concurrently submitted items into batches.
+
+    Items are collected until either `max_batch_size` items are waiting or the
+    first waiting item waited for `max_wait_time` seconds. The whole batch is
+    then passed to `process_batch` (run in `executor`) which has to return one
+    result per item, in the same order.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        executor: InferenceExecutor,
+        max_batch_size: int = DEFAULT_NLU_MAX_BATCH_SIZE,
+        max_wait_time: float = DEFAULT_NLU_MAX_BATCH_WAIT_MS / 1000,
+    ) -> None:
+        self.process_batch = process_batch
+        self.executor = executor
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait_time = max_wait_time
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Add `item` to the next batch and return its result once the batch was
+        processed."""
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_time, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        logger.debug(f"Processing batch of {len(batch)} items.")
+
+        try:
+            results = await self.executor.run(
+                self.process_batch, [item for item, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def configured_executor_type() -> Text:
+    """Executor type set by the `INFERENCE_EXECUTOR` environment variable."""
+
+    return os.environ.get(ENV_INFERENCE_EXECUTOR, DEFAULT_INFERENCE_EXECUTOR).lower()
+
+
+def configured_max_workers() -> Optional[int]:
+    """Number of workers set by the `INFERENCE_EXECUTOR_WORKERS` environment
+    variable. `None` lets the pool choose its default."""
+
+    max_workers = os.environ.get(ENV_INFERENCE_EXECUTOR_WORKERS)
+    try:
+        return int(max_workers) if max_workers else None
+    except ValueError:
+        logger.error(
+            f"Cannot convert environment variable `{ENV_INFERENCE_EXECUTOR_WORKERS}` "
+            f"to int ('{max_workers}'). Using the default number of workers."
+        )
+        return None
+
+
+def int_from_env(name: Text, default: int) -> int:
+    """Integer set by the environment variable `name`. `default` is used if the
+    variable isn't set or can't be converted."""
+
+    value = os.environ.get(name)
+    if not value:
+        return default
+
+    try:
+        return int(value)
+    except ValueError:
+        logger.error(
+            f"Cannot convert environment variable `{name}` to int ('{value}'). "
+            f"Using the default value {default}."
+        )
+        return default
+
+
+def configured_batch_size() -> int:
+    """Maximum NLU batch size set by the `NLU_MAX_BATCH_SIZE` environment
+    variable. Batching is disabled for a size of 1."""
+
+    return int_from_env(ENV_NLU_MAX_BATCH_SIZE, DEFAULT_NLU_MAX_BATCH_SIZE)
+
+
+def configured_batch_wait_time() -> float:
+    """Maximum time in seconds a request waits for its NLU batch to fill up, set in
+    milliseconds by the `NLU_MAX_BATCH_WAIT_MS` environment variable."""
+
+    try:
+        wait_time_in_ms = float(
+            os.environ.get(ENV_NLU_MAX_BATCH_WAIT_MS, DEFAULT_NLU_MAX_BATCH_WAIT_MS)
+        )
+    except ValueError:
+        logger.error(
+            f"Cannot convert environment variable `{ENV_NLU_MAX_BATCH_WAIT_MS}` "
+            f"to float ('{os.environ[ENV_NLU_MAX_BATCH_WAIT_MS]}')."
+        )
+        wait_time_in_ms = DEFAULT_NLU_MAX_BATCH_WAIT_MS
+
+    return wait_time_in_ms / 1000
+
+
+def inference_executor() -> InferenceExecutor:
+    """Process global executor for inference tasks which need the objects of
+    this process (e.g. the policy ensemble).
+
+    If no executor exists yet, this will create one from the environment. As
+    these tasks can't be sent to other processes, a thread pool is used if a
+    process pool is configured. NLU models get their own process pool instead
+    (see `RasaNLUInterpreter`)."""
+
+    global __inference_executor
+
+    if not __inference_executor:
+        executor_type = configured_executor_type()
+        if executor_type == EXECUTOR_TYPE_PROCESS:
+            executor_type = EXECUTOR_TYPE_THREAD
+
+        __inference_executor = InferenceExecutor(
+            executor_type, max_workers=configured_max_workers()
+        )
+        logger.debug(f"Created '{executor_type}' inference executor.")
+
+    return __inference_executor
+
+
+def kill_inference_executor() -> None:
+    """Shut down the inference executor if it was created.
+
+    Another call to `inference_executor` will create a new executor."""
+
+    global __inference_executor
+
+    if __inference_executor:
+        __inference_executor.shutdown()
+        __inference_executor = None
@@ -1,10 +1,15 @@
+import functools
 import io
+import itertools
 import jsonpickle
 import logging
 import numpy as np
 import os
+import scipy.sparse
+import threading
+import time
 from tqdm import tqdm
-from typing import Tuple, List, Optional, Dict, Text, Any
+from typing import Tuple, List, Optional, Dict, Text, Any, Callable, Iterable
 
 import rasa.utils.io
 from rasa.core import utils
@@ -18,6 +23,69 @@ from rasa.utils.common import is_logging_disabled
 logger = logging.getLogger(__name__)
 
 
+class _FeaturizationTimer(threading.local):
+    """Time the current thread spent featurizing trackers for prediction."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.depth = 0
+
+
+_featurization_timer = _FeaturizationTimer()
+
+
+def featurization_time() -> float:
+    """Return the total time in seconds the current thread spent in
+    `prediction_states` and `create_X` of tracker featurizers.
+
+    Take the difference of two calls to measure the featurization time of a
+    single prediction."""
+
+    return _featurization_timer.total
+
+
+def _measure_featurization_time(func: Callable) -> Callable:
+    """Add the run time of `func` to the featurization time. Nested calls are only
+    counted once."""
+
+    @functools.wraps(func)
+    def measured(*args: Any, **kwargs: Any) -> Any:
+        if _featurization_timer.depth:
+            return func(*args, **kwargs)
+
+        _featurization_timer.depth += 1
+        started_at = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _featurization_timer.total += time.perf_counter() - started_at
+            _featurization_timer.depth -= 1
+
+    return measured
+
+
+def is_sparse_features(X: np.ndarray) -> bool:
+    """Check whether `X` holds one sparse matrix per example, as created by tracker
+    featurizers with `use_sparse_features`."""
+
+    return X.dtype == object and len(X) > 0 and scipy.sparse.issparse(X[0])
+
+
+def sparse_features_to_dense(X: np.ndarray) -> np.ndarray:
+    """Convert sparse features of tracker featurizers to a dense array.
+
+    Padding states are marked by a `-1` in the first column of sparse features
+    (see `SingleStateFeaturizer.encode_sparse`). They are set to `-1` as in the
+    dense features. States without any features stay `0`."""
+
+    if not is_sparse_features(X):
+        return X
+
+    dense = np.stack([x.toarray() for x in X]).astype(np.float32)
+    dense[(dense < 0).any(axis=-1)] = -1
+    return dense
+
+
 class SingleStateFeaturizer:
     """Base class for mechanisms to transform the conversations state into ML formats.
 
@@ -40,6 +108,25 @@ class SingleStateFeaturizer:
             "encode states to a feature vector"
         )
 
+    def encode_sparse(
+        self, states: List[Optional[Dict[Text, float]]]
+    ) -> scipy.sparse.coo_matrix:
+        """Encode a list of states as a sparse matrix with one row per state.
+
+        Padding states are marked by a `-1` in their first column, so that they
+        can be told apart from states without any features. Features of other
+        states are never negative."""
+
+        rows = []
+        for state in states:
+            encoded = self.encode(state)
+            if state is None or None in state:
+                encoded = np.zeros_like(encoded)
+                encoded[0] = -1
+            rows.append(encoded)
+
+        return scipy.sparse.coo_matrix(np.array(rows, dtype=np.float32))
+
     @staticmethod
     def action_as_one_hot(action: Text, domain: Domain) -> np.ndarray:
         """Encode system action as one-hot vector."""
@@ -127,6 +214,47 @@ class BinarySingleStateFeaturizer(SingleStateFeaturizer):
         else:
             return used_features
 
+    def encode_sparse(
+        self, states: List[Optional[Dict[Text, float]]]
+    ) -> scipy.sparse.coo_matrix:
+        """Returns a sparse matrix indicating which features are active per state.
+
+        The states are mapped through the `input_state_map` of the domain
+        without creating a dense vector for each state. Padding states
+        are marked by a `-1` in their first column.
+        """
+
+        if not self.num_features:
+            raise Exception(
+                "BinarySingleStateFeaturizer was not prepared before encoding."
+            )
+
+        rows, columns, values = [], [], []
+        for row, state in enumerate(states):
+            if state is None or None in state:
+                rows.append(row)
+                columns.append(0)
+                values.append(-1)
+                continue
+
+            for state_name, prob in state.items():
+                idx = self.input_state_map.get(state_name)
+                if idx is not None:
+                    rows.append(row)
+                    columns.append(idx)
+                    values.append(prob)
+                else:
+                    logger.debug(
+                        "Feature '{}' (value: '{}') could not be found in "
+                        "feature map. Make sure you added all intents and "
+                        "entities to the domain".format(state_name, prob)
+                    )
+
+        return scipy.sparse.coo_matrix(
+            (np.array(values, dtype=np.float32), (rows, columns)),
+            shape=(len(states), self.num_features),
+        )
+
     def create_encoded_all_actions(self, domain: Domain) -> np.ndarray:
         """Create matrix with all actions from domain encoded in rows as bag of words"""
 
@@ -260,31 +388,55 @@ class LabelTokenizerSingleStateFeaturizer(SingleStateFeaturizer):
 
 
 class TrackerFeaturizer:
-    """Base class for actual tracker featurizers."""
+    """Base class for actual tracker featurizers.
+
+    If `use_sparse_features` is set, `X` of the training data holds one sparse
+    matrix per example instead of a dense array, so that its memory scales with
+    the number of active features instead of the size of the domain.
+    """
+
+    # featurizers persisted before sparse features existed
+    use_sparse_features = False
 
     def __init__(
         self,
         state_featurizer: Optional[SingleStateFeaturizer] = None,
         use_intent_probabilities: bool = False,
+        use_sparse_features: bool = False,
     ) -> None:
 
         self.state_featurizer = state_featurizer
         self.use_intent_probabilities = use_intent_probabilities
+        self.use_sparse_features = use_sparse_features
 
     def _create_states(
         self,
         tracker: DialogueStateTracker,
         domain: Domain,
         is_binary_training: bool = False,
+        max_history: Optional[int] = None,
     ) -> List[Dict[Text, float]]:
         """Create states: a list of dictionaries.
 
         If use_intent_probabilities is False (default behaviour),
         pick the most probable intent out of all provided ones and
         set its probability to 1.0, while all the others to 0.0.
+
+        If `max_history` is given, only the states of the last `max_history`
+        turns are created.
         """
 
         states = tracker.past_states(domain)
+        if max_history is not None:
+            states = itertools.islice(states, max(0, len(states) - max_history), None)
+
+        return self._states_as_dicts(states, is_binary_training)
+
+    def _states_as_dicts(
+        self, states: Iterable[frozenset], is_binary_training: bool = False
+    ) -> List[Dict[Text, float]]:
+        """Convert the frozen states of a tracker history to dictionaries (see
+        `_create_states`)."""
 
         # during training we encounter only 1 or 0
         if not self.use_intent_probabilities and not is_binary_training:
@@ -339,15 +491,25 @@ class TrackerFeaturizer:
             if len(trackers_as_states) > 1:
                 tracker_states = self._pad_states(tracker_states)
 
-            story_features = [
-                self.state_featurizer.encode(state) for state in tracker_states
-            ]
+            if self.use_sparse_features:
+                story_features = self.state_featurizer.encode_sparse(tracker_states)
+            else:
+                story_features = [
+                    self.state_featurizer.encode(state) for state in tracker_states
+                ]
 
             features.append(story_features)
             true_lengths.append(dialogue_len)
 
-        # noinspection PyPep8Naming
-        X = np.array(features)
+        if self.use_sparse_features:
+            # assign one by one, numpy would try to unpack the sparse matrices
+            # noinspection PyPep8Naming
+            X = np.empty(len(features), dtype=object)
+            for idx, story_features in enumerate(features):
+                X[idx] = story_features
+        else:
+            # noinspection PyPep8Naming
+            X = np.array(features)
 
         return X, true_lengths
 
@@ -418,6 +580,7 @@ class TrackerFeaturizer:
         )
 
     # noinspection PyPep8Naming
+    @_measure_featurization_time
     def create_X(
         self, trackers: List[DialogueStateTracker], domain: Domain
     ) -> np.ndarray:
@@ -460,9 +623,12 @@ class FullDialogueTrackerFeaturizer(TrackerFeaturizer):
         self,
         state_featurizer: SingleStateFeaturizer,
         use_intent_probabilities: bool = False,
+        use_sparse_features: bool = False,
     ) -> None:
 
-        super().__init__(state_featurizer, use_intent_probabilities)
+        super().__init__(
+            state_featurizer, use_intent_probabilities, use_sparse_features
+        )
         self.max_len = None
 
     @staticmethod
@@ -533,6 +699,7 @@ class FullDialogueTrackerFeaturizer(TrackerFeaturizer):
 
         return trackers_as_states, trackers_as_actions
 
+    @_measure_featurization_time
     def prediction_states(
         self, trackers: List[DialogueStateTracker], domain: Domain
     ) -> List[List[Dict[Text, float]]]:
@@ -560,9 +727,12 @@ class MaxHistoryTrackerFeaturizer(TrackerFeaturizer):
         max_history: Optional[int] = None,
         remove_duplicates: bool = True,
         use_intent_probabilities: bool = False,
+        use_sparse_features: bool = False,
     ) -> None:
 
-        super().__init__(state_featurizer, use_intent_probabilities)
+        super().__init__(
+            state_featurizer, use_intent_probabilities, use_sparse_features
+        )
         self.max_history = max_history or self.MAX_HISTORY_DEFAULT
         self.remove_duplicates = remove_duplicates
 
@@ -649,13 +819,16 @@ class MaxHistoryTrackerFeaturizer(TrackerFeaturizer):
 
         return trackers_as_states, trackers_as_actions
 
+    @_measure_featurization_time
     def prediction_states(
         self, trackers: List[DialogueStateTracker], domain: Domain
     ) -> List[List[Dict[Text, float]]]:
         """Transforms list of trackers to lists of states for prediction."""
 
+        # states before the `max_history` are cut off anyway
         trackers_as_states = [
-            self._create_states(tracker, domain) for tracker in trackers
+            self._create_states(tracker, domain, max_history=self.max_history)
+            for tracker in trackers
         ]
         trackers_as_states = [
             self.slice_state_history(states, self.max_history)
@@ -1,19 +1,32 @@
-import aiohttp
-
+import functools
 import json
 import logging
 import re
 
 import os
+import typing
 from typing import Text, List, Dict, Any, Union, Optional, Tuple
 
 from rasa.constants import DOCS_URL_STORIES
 from rasa.core import constants
 from rasa.core.trackers import DialogueStateTracker
 from rasa.core.constants import INTENT_MESSAGE_PREFIX
+from rasa.core.executor import (
+    EXECUTOR_TYPE_PROCESS,
+    InferenceExecutor,
+    MicroBatcher,
+    configured_batch_size,
+    configured_batch_wait_time,
+    configured_executor_type,
+    configured_max_workers,
+    inference_executor,
+)
 from rasa.utils.common import raise_warning, class_from_module_path
 from rasa.utils.endpoints import EndpointConfig
 
+if typing.TYPE_CHECKING:
+    from rasa.nlu.model import Interpreter
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +41,21 @@ class NaturalLanguageInterpreter:
             "Interpreter needs to be able to parse messages into structured output."
         )
 
+    async def parse_batch(self, texts: List[Text]) -> List[Dict[Text, Any]]:
+        """Parse several text messages, returns the results in the same order.
+
+        Interpreters which can parse several messages at once should overwrite
+        this method."""
+
+        return [await self.parse(text) for text in texts]
+
+    def close(self) -> None:
+        """Release the resources of the interpreter, e.g. its worker processes.
+
+        Called when the interpreter is replaced by another one."""
+
+        pass
+
     @staticmethod
     def create(
         obj: Union["NaturalLanguageInterpreter", EndpointConfig, Text, None],
@@ -243,17 +271,17 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
 
         # noinspection PyBroadException
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=params) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    else:
-                        response_text = await resp.text()
-                        logger.error(
-                            f"Failed to parse text '{text}' using rasa NLU over "
-                            f"http. Error: {response_text}"
-                        )
-                        return None
+            session = self.endpoint_config.pooled_session()
+            async with session.post(url, json=params) as resp:
+                if resp.status == 200:
+                    return await resp.json()
+                else:
+                    response_text = await resp.text()
+                    logger.error(
+                        f"Failed to parse text '{text}' using rasa NLU over "
+                        f"http. Error: {response_text}"
+                    )
+                    return None
         except Exception:
             logger.exception(f"Failed to parse text '{text}' using rasa NLU over http.")
             return None
@@ -269,6 +297,8 @@ class RasaNLUInterpreter(NaturalLanguageInterpreter):
         self.model_directory = model_directory
         self.lazy_init = lazy_init
         self.config_file = config_file
+        self.worker_pool = None
+        self.batcher = None
 
         if not lazy_init:
             self._load_interpreter()
@@ -287,15 +317,110 @@ class RasaNLUInterpreter(NaturalLanguageInterpreter):
 
         if self.lazy_init and self.interpreter is None:
             self._load_interpreter()
-        result = self.interpreter.parse(text, message_id)
+
+        if self.batcher is not None:
+            return await self.batcher.submit((text, message_id))
+
+        if self.worker_pool is not None:
+            return await self.worker_pool.run(_parse_in_worker, text, message_id)
+
+        result = await inference_executor().run(
+            self.interpreter.parse, text, message_id
+        )
 
         return result
 
+    async def parse_batch(self, texts: List[Text]) -> List[Dict[Text, Any]]:
+        """Parse several text messages in a single run through the pipeline."""
+
+        if self.lazy_init and self.interpreter is None:
+            self._load_interpreter()
+
+        if self.worker_pool is not None:
+            return await self.worker_pool.run(_parse_batch_in_worker, texts)
+
+        return await inference_executor().run(self.interpreter.parse_batch, texts)
+
+    def close(self) -> None:
+        """Shut down the worker processes of the interpreter.
+
+        Messages which are already being parsed by them are still finished.
+        Later messages are parsed in this process."""
+
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown(wait=False)
+            self.worker_pool = None
+            self.batcher = None
+
     def _load_interpreter(self) -> None:
         from rasa.nlu.model import Interpreter
 
         self.interpreter = Interpreter.load(self.model_directory)
 
+        if configured_executor_type() == EXECUTOR_TYPE_PROCESS:
+            # every worker process holds its own copy of the model; the workers
+            # have to be started while the model directory still exists
+            self.worker_pool = InferenceExecutor(
+                EXECUTOR_TYPE_PROCESS,
+                max_workers=configured_max_workers(),
+                initializer=_load_interpreter_in_worker,
+                initargs=(self.model_directory,),
+            )
+            self.worker_pool.warm_up()
+
+        max_batch_size = configured_batch_size()
+        if max_batch_size > 1:
+            # concurrent messages are gathered and run through the pipeline at once
+            if self.worker_pool is not None:
+                process_batch, executor = _parse_messages_in_worker, self.worker_pool
+            else:
+                process_batch = functools.partial(_parse_messages, self.interpreter)
+                executor = inference_executor()
+
+            self.batcher = MicroBatcher(
+                process_batch,
+                executor,
+                max_batch_size=max_batch_size,
+                max_wait_time=configured_batch_wait_time(),
+            )
+
+
+# interpreter of an inference worker process, see `RasaNLUInterpreter`
+_worker_interpreter = None
+
+
+def _load_interpreter_in_worker(model_directory: Text) -> None:
+    from rasa.nlu.model import Interpreter
+
+    global _worker_interpreter
+    _worker_interpreter = Interpreter.load(model_directory)
+
+
+def _parse_in_worker(text: Text, message_id: Optional[Text] = None) -> Dict[Text, Any]:
+    return _worker_interpreter.parse(text, message_id)
+
+
+def _parse_batch_in_worker(texts: List[Text]) -> List[Dict[Text, Any]]:
+    return _worker_interpreter.parse_batch(texts)
+
+
+def _parse_messages_in_worker(
+    messages: List[Tuple[Text, Optional[Text]]]
+) -> List[Dict[Text, Any]]:
+    return _parse_messages(_worker_interpreter, messages)
+
+
+def _parse_messages(
+    interpreter: "Interpreter", messages: List[Tuple[Text, Optional[Text]]]
+) -> List[Dict[Text, Any]]:
+    """Parse the `(text, message_id)` pairs gathered by the `MicroBatcher`.
+
+    The message ids are passed on like in `RasaNLUInterpreter.parse`."""
+
+    texts = [text for text, _ in messages]
+    message_ids = [message_id for _, message_id in messages]
+    return interpreter.parse_batch(texts, times=message_ids)
+
 
 def _create_from_endpoint_config(
     endpoint_config: Optional[EndpointConfig],
@@ -2,13 +2,15 @@ import asyncio
 import json
 import logging
 import os
+import time
 
 from async_generator import asynccontextmanager
-from typing import Text, Union, Optional, AsyncGenerator
+from typing import Dict, Text, Union, Optional, AsyncGenerator
 
-from rasa.core.constants import DEFAULT_LOCK_LIFETIME
+from rasa.core.constants import DEFAULT_LOCK_LIFETIME, DEFAULT_STORE_IO_THREADS
+from rasa.core.executor import BlockingIOExecutor
 from rasa.utils import common
-from rasa.core.lock import TicketLock
+from rasa.core.lock import NO_TICKET_ISSUED, TicketLock
 from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
@@ -28,6 +30,33 @@ class LockError(Exception):
 
 
 class LockStore:
+    """Base class for stores of ticket locks.
+
+    `lock` runs the blocking methods which access the storage in
+    `blocking_io_workers` threads of the lock store, so that they don't block
+    the event loop. Lock stores can override the `*_async` methods with a native
+    asynchronous implementation instead."""
+
+    # lock stores whose client can be used by several threads at once can use
+    # more threads, `0` runs blocking calls on the event loop
+    blocking_io_workers = 1
+
+    # events which are set once the lock of a conversation changed; like the
+    # executor they are created lazily, as lock stores don't have to call
+    # `super().__init__()`
+    _lock_changed_events: Optional[Dict[Text, asyncio.Event]] = None
+    _blocking_io_executor: Optional[BlockingIOExecutor] = None
+
+    @property
+    def _io_executor(self) -> BlockingIOExecutor:
+        """Executor which runs the blocking methods of the lock store."""
+
+        if self._blocking_io_executor is None:
+            self._blocking_io_executor = BlockingIOExecutor(
+                self.blocking_io_workers, thread_name_prefix="rasa-lock-store"
+            )
+        return self._blocking_io_executor
+
     @staticmethod
     def create(obj: Union["LockStore", EndpointConfig, None]) -> "LockStore":
         """Factory to create a lock store."""
@@ -58,6 +87,11 @@ class LockStore:
 
         raise NotImplementedError
 
+    async def get_lock_async(self, conversation_id: Text) -> Optional[TicketLock]:
+        """Fetch lock for `conversation_id` without blocking the event loop."""
+
+        return await self._io_executor.run(self.get_lock, conversation_id)
+
     def issue_ticket(
         self, conversation_id: Text, lock_lifetime: float = LOCK_LIFETIME
     ) -> int:
@@ -73,6 +107,16 @@ class LockStore:
 
         return ticket
 
+    async def issue_ticket_async(
+        self, conversation_id: Text, lock_lifetime: float = LOCK_LIFETIME
+    ) -> int:
+        """Issue new ticket for `conversation_id` without blocking the event loop,
+        see `issue_ticket`."""
+
+        return await self._io_executor.run(
+            self.issue_ticket, conversation_id, lock_lifetime
+        )
+
     @asynccontextmanager
     async def lock(
         self,
@@ -82,11 +126,11 @@ class LockStore:
     ) -> AsyncGenerator[TicketLock, None]:
         """Acquire lock with lifetime `lock_lifetime`for `conversation_id`.
 
-        Try acquiring lock with a wait time of `wait_time_in_seconds` seconds
-        between attempts. Raise a `LockError` if lock has expired.
+        Try acquiring lock whenever it was released, but at least every
+        `wait_time_in_seconds` seconds. Raise a `LockError` if lock has expired.
         """
 
-        ticket = self.issue_ticket(conversation_id, lock_lifetime)
+        ticket = await self.issue_ticket_async(conversation_id, lock_lifetime)
 
         try:
             yield await self._acquire_lock(
@@ -94,15 +138,19 @@ class LockStore:
             )
 
         finally:
-            self.cleanup(conversation_id, ticket)
+            await self.cleanup_async(conversation_id, ticket)
 
     async def _acquire_lock(
         self, conversation_id: Text, ticket: int, wait_time_in_seconds: float,
     ) -> TicketLock:
 
         while True:
+            # listen for changes before fetching the lock, so that changes made
+            # in the meantime aren't missed
+            lock_changed = self._lock_changed_event(conversation_id)
+
             # fetch lock in every iteration because lock might no longer exist
-            lock = self.get_lock(conversation_id)
+            lock = await self.get_lock_async(conversation_id)
 
             # exit loop if lock does not exist anymore (expired)
             if not lock:
@@ -114,17 +162,47 @@ class LockStore:
 
             logger.debug(
                 f"Failed to acquire lock for conversation ID '{conversation_id}'. "
-                f"Retrying..."
+                f"Waiting for it to be released..."
             )
 
-            # sleep and update lock
-            await asyncio.sleep(wait_time_in_seconds)
-            self.update_lock(conversation_id)
+            # wait until the lock changed or tickets might have expired
+            await self._wait_for(lock_changed, wait_time_in_seconds)
+            await self.update_lock_async(conversation_id)
 
         raise LockError(
             f"Could not acquire lock for conversation_id '{conversation_id}'."
         )
 
+    def _lock_changed_event(self, conversation_id: Text) -> asyncio.Event:
+        """Event which is set the next time the lock for `conversation_id` is
+        released by this lock store."""
+
+        if self._lock_changed_events is None:
+            self._lock_changed_events = {}
+
+        event = self._lock_changed_events.get(conversation_id)
+        if event is None:
+            event = self._lock_changed_events[conversation_id] = asyncio.Event()
+
+        return event
+
+    def _notify_waiters(self, conversation_id: Text) -> None:
+        """Wake everyone waiting for the lock for `conversation_id`."""
+
+        if self._lock_changed_events is None:
+            return
+
+        event = self._lock_changed_events.pop(conversation_id, None)
+        if event is not None:
+            event.set()
+
+    @staticmethod
+    async def _wait_for(event: asyncio.Event, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
     def update_lock(self, conversation_id: Text) -> None:
         """Fetch lock for `conversation_id`, remove expired tickets and save lock."""
 
@@ -133,6 +211,12 @@ class LockStore:
             lock.remove_expired_tickets()
             self.save_lock(lock)
 
+    async def update_lock_async(self, conversation_id: Text) -> None:
+        """Remove expired tickets of the lock for `conversation_id` without
+        blocking the event loop."""
+
+        await self._io_executor.run(self.update_lock, conversation_id)
+
     def get_or_create_lock(self, conversation_id: Text) -> TicketLock:
         """Fetch existing lock for `conversation_id` or create a new one if
         it doesn't exist."""
@@ -168,6 +252,21 @@ class LockStore:
     def cleanup(self, conversation_id: Text, ticket_number: int) -> None:
         """Remove lock for `conversation_id` if no one is waiting."""
 
+        self.release(conversation_id, ticket_number)
+        self._notify_waiters(conversation_id)
+
+    async def cleanup_async(self, conversation_id: Text, ticket_number: int) -> None:
+        """Remove lock for `conversation_id` if no one is waiting, without blocking
+        the event loop."""
+
+        await self._io_executor.run(self.release, conversation_id, ticket_number)
+        # waiters have to be woken on the event loop
+        self._notify_waiters(conversation_id)
+
+    def release(self, conversation_id: Text, ticket_number: int) -> None:
+        """Finish serving ticket with `ticket_number` for `conversation_id` and
+        delete the lock if no one is waiting."""
+
         self.finish_serving(conversation_id, ticket_number)
         if not self.is_someone_waiting(conversation_id):
             self.delete_lock(conversation_id)
@@ -180,8 +279,70 @@ class LockStore:
             logger.debug(f"Could not delete lock for conversation '{conversation_id}'.")
 
 
+# Issues a new ticket for the lock stored at KEYS[1] after removing expired tickets.
+# ARGV: conversation ID, current time, lifetime of the ticket
+ISSUE_TICKET_SCRIPT = """
+local tickets, last_issued = {}, -1
+local serialised_lock = redis.call('GET', KEYS[1])
+if serialised_lock then
+    for _, serialised_ticket in ipairs(cjson.decode(serialised_lock)['tickets']) do
+        local ticket = cjson.decode(serialised_ticket)
+        if ticket['expires'] >= tonumber(ARGV[2]) then
+            table.insert(tickets, serialised_ticket)
+            last_issued = ticket['number']
+        end
+    end
+end
+local number = last_issued + 1
+local expires = tonumber(ARGV[2]) + tonumber(ARGV[3])
+table.insert(tickets, cjson.encode({number = number, expires = expires}))
+local lock = {conversation_id = ARGV[1], tickets = tickets}
+redis.call('SET', KEYS[1], cjson.encode(lock))
+return number
+"""
+
+# Removes the ticket with number ARGV[3] and expired tickets from the lock stored
+# at KEYS[1]. If no tickets are left, the lock is deleted if ARGV[4] is `1`.
+# Everyone waiting for the lock is notified on the channel KEYS[2] if ARGV[5]
+# is `1`. Returns `1` if the lock was deleted.
+# ARGV: conversation ID, current time, ticket number, delete, notify
+REMOVE_TICKETS_SCRIPT = """
+local serialised_lock = redis.call('GET', KEYS[1])
+if not serialised_lock then
+    return 0
+end
+local deleted = 0
+local tickets = {}
+for _, serialised_ticket in ipairs(cjson.decode(serialised_lock)['tickets']) do
+    local ticket = cjson.decode(serialised_ticket)
+    if ticket['expires'] >= tonumber(ARGV[2])
+            and ticket['number'] ~= tonumber(ARGV[3]) then
+        table.insert(tickets, serialised_ticket)
+    end
+end
+if #tickets == 0 and ARGV[4] == '1' then
+    redis.call('DEL', KEYS[1])
+    deleted = 1
+else
+    local lock = {conversation_id = ARGV[1], tickets = tickets}
+    redis.call('SET', KEYS[1], cjson.encode(lock))
+end
+if ARGV[5] == '1' then
+    redis.call('PUBLISH', KEYS[2], ARGV[1])
+end
+return deleted
+"""
+
+
 class RedisLockStore(LockStore):
-    """Redis store for ticket locks."""
+    """Redis store for ticket locks.
+
+    Tickets are issued and removed atomically by Lua scripts. When a lock is
+    released, the ID of its conversation is published, so that everyone waiting
+    for it (in any process) tries to acquire it right away.
+    """
+
+    blocking_io_workers = DEFAULT_STORE_IO_THREADS
 
     def __init__(
         self,
@@ -196,6 +357,13 @@ class RedisLockStore(LockStore):
         self.red = redis.StrictRedis(
             host=host, port=int(port), db=int(db), password=password, ssl=use_ssl
         )
+        # channels are shared by all databases
+        self.lock_released_channel = f"lock_released:{db}"
+
+        self._issue_ticket = self.red.register_script(ISSUE_TICKET_SCRIPT)
+        self._remove_tickets = self.red.register_script(REMOVE_TICKETS_SCRIPT)
+        self._subscriber_thread = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         super().__init__()
 
     def get_lock(self, conversation_id: Text) -> Optional[TicketLock]:
@@ -210,10 +378,64 @@ class RedisLockStore(LockStore):
     def save_lock(self, lock: TicketLock) -> None:
         self.red.set(lock.conversation_id, lock.dumps())
 
+    def issue_ticket(
+        self, conversation_id: Text, lock_lifetime: float = LOCK_LIFETIME
+    ) -> int:
+        return self._issue_ticket(
+            keys=[conversation_id], args=[conversation_id, time.time(), lock_lifetime]
+        )
+
+    def update_lock(self, conversation_id: Text) -> None:
+        self._remove_tickets(
+            keys=[conversation_id, self.lock_released_channel],
+            args=[conversation_id, time.time(), NO_TICKET_ISSUED, 0, 0],
+        )
+
+    def finish_serving(self, conversation_id: Text, ticket_number: int) -> None:
+        self._remove_tickets(
+            keys=[conversation_id, self.lock_released_channel],
+            args=[conversation_id, time.time(), ticket_number, 0, 1],
+        )
+
+    def release(self, conversation_id: Text, ticket_number: int) -> None:
+        deleted = self._remove_tickets(
+            keys=[conversation_id, self.lock_released_channel],
+            args=[conversation_id, time.time(), ticket_number, 1, 1],
+        )
+        if deleted:
+            self._log_deletion(conversation_id, deletion_successful=True)
+
+    def _lock_changed_event(self, conversation_id: Text) -> asyncio.Event:
+        self._loop = asyncio.get_event_loop()
+        if self._subscriber_thread is None:
+            self._subscribe_to_released_locks()
+
+        return super()._lock_changed_event(conversation_id)
+
+    def _subscribe_to_released_locks(self) -> None:
+        """Wake up waiters whenever a lock is released by any lock store using
+        the same Redis database."""
+
+        pubsub = self.red.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.lock_released_channel: self._on_lock_released})
+        self._subscriber_thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def _on_lock_released(self, message: Dict) -> None:
+        """Called by the subscriber thread for every released lock."""
+
+        conversation_id = message["data"].decode()
+        try:
+            self._loop.call_soon_threadsafe(self._notify_waiters, conversation_id)
+        except RuntimeError:
+            # event loop was closed
+            pass
+
 
 class InMemoryLockStore(LockStore):
     """In-memory store for ticket locks."""
 
+    blocking_io_workers = 0
+
     def __init__(self) -> None:
         self.conversation_locks = {}
         super().__init__()
@@ -5,7 +5,7 @@ import os
 import pickle
 
 import numpy as np
-from typing import Any, List, Optional, Text, Dict, Tuple
+from typing import Any, List, Optional, Text, Dict, Tuple, Union
 
 import rasa.utils.io
 from rasa.core.domain import Domain
@@ -14,6 +14,7 @@ from rasa.core.featurizers import (
     FullDialogueTrackerFeaturizer,
     LabelTokenizerSingleStateFeaturizer,
     MaxHistoryTrackerFeaturizer,
+    sparse_features_to_dense,
 )
 from rasa.core.policies.policy import Policy
 from rasa.core.constants import DEFAULT_POLICY_PRIORITY
@@ -334,10 +335,40 @@ class EmbeddingPolicy(Policy):
 
         return dial_embed, mask
 
-    def _build_tf_train_graph(self) -> Tuple["tf.Tensor", "tf.Tensor"]:
+    @staticmethod
+    def _dialogue_features_as_dense(
+        a_in: Union["tf.Tensor", "tf.SparseTensor"], num_features: int
+    ) -> "tf.Tensor":
+        """Convert sparse dialogue features to a dense tensor.
+
+        Padding states of sparse features hold a `-1` in their first column,
+        all their features are set to `-1` as in dense features.
+        """
+
+        if not isinstance(a_in, tf.SparseTensor):
+            return a_in
+
+        a_in = tf.sparse.to_dense(a_in)
+        a_in.set_shape([None, None, num_features])
+
+        is_padding = tf.cast(
+            tf.less(tf.reduce_min(a_in, -1, keepdims=True), 0), tf.float32
+        )
+        return a_in * (1 - is_padding) - is_padding
+
+    def _build_tf_train_graph(
+        self, session_data: "train_utils.SessionDataType"
+    ) -> Tuple["tf.Tensor", "tf.Tensor"]:
         """Bulid train graph using iterator."""
         # iterator returns a_in, b_in, action_ids
-        self.a_in, self.b_in, _ = self._iterator.get_next()
+        batch_data, _ = train_utils.batch_to_session_data(
+            self._iterator.get_next(), session_data
+        )
+        self.a_in = self._dialogue_features_as_dense(
+            batch_data["dialogue_features"][0],
+            session_data["dialogue_features"][0][0].shape[-1],
+        )
+        self.b_in = batch_data["bot_features"][0]
 
         if isinstance(self.featurizer, MaxHistoryTrackerFeaturizer):
             # add time dimension if max history featurizer is used
@@ -377,7 +408,11 @@ class EmbeddingPolicy(Policy):
         dialogue_len = None  # use dynamic time
         self.a_in = tf.placeholder(
             dtype=tf.float32,
-            shape=(None, dialogue_len, session_data["dialogue_features"][0].shape[-1]),
+            shape=(
+                None,
+                dialogue_len,
+                session_data["dialogue_features"][0][0].shape[-1],
+            ),
             name="a",
         )
         self.b_in = tf.placeholder(
@@ -477,13 +512,15 @@ class EmbeddingPolicy(Policy):
 
             self._is_training = tf.placeholder_with_default(False, shape=())
 
-            loss, acc = self._build_tf_train_graph()
+            loss, acc = self._build_tf_train_graph(session_data)
 
             # define which optimizer to use
             self._train_op = tf.train.AdamOptimizer().minimize(loss)
 
             # train tensorflow graph
-            self.session = tf.Session(config=self._tf_config)
+            self.session = tf.Session(
+                config=train_utils.tf_config_for_training(self._tf_config)
+            )
             train_utils.train_tf_dataset(
                 train_init_op,
                 eval_init_op,
@@ -548,7 +585,7 @@ class EmbeddingPolicy(Policy):
         """Create feed dictionary for tf session."""
 
         # noinspection PyPep8Naming
-        data_X = self.featurizer.create_X([tracker], domain)
+        data_X = sparse_features_to_dense(self.featurizer.create_X([tracker], domain))
         session_data = self._create_session_data(data_X)
 
         return {self.a_in: session_data["dialogue_features"][0]}
@@ -1,9 +1,14 @@
 import importlib
 import json
 import logging
+import multiprocessing
 import os
+import pickle
 import sys
+import tempfile
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Text, Optional, Any, List, Dict, Tuple, Set
 
@@ -21,13 +26,19 @@ from rasa.core.actions.action import (
 from rasa.core.domain import Domain
 from rasa.core.events import SlotSet, ActionExecuted, ActionExecutionRejected, Event
 from rasa.core.exceptions import UnsupportedDialogueModelError
-from rasa.core.featurizers import MaxHistoryTrackerFeaturizer
+from rasa.core.featurizers import MaxHistoryTrackerFeaturizer, featurization_time
 from rasa.core.policies.policy import Policy
 from rasa.core.policies.fallback import FallbackPolicy
 from rasa.core.policies.memoization import MemoizationPolicy, AugmentedMemoizationPolicy
 from rasa.core.trackers import DialogueStateTracker
 from rasa.core import registry
-from rasa.utils.common import class_from_module_path, raise_warning
+from rasa.utils.common import (
+    can_be_sent_to_processes,
+    class_from_module_path,
+    init_training_job_process,
+    raise_warning,
+    threads_per_training_job,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +52,8 @@ class PolicyEnsemble:
         self.policies = policies
         self.training_trackers = None
         self.date_trained = None
+        # indices of the policies which were already trained by a previous training
+        self.reused_policies = set()
 
         if action_fingerprints:
             self.action_fingerprints = action_fingerprints
@@ -118,16 +131,121 @@ class PolicyEnsemble:
         self,
         training_trackers: List[DialogueStateTracker],
         domain: Domain,
+        training_jobs: int = 1,
+        threads_per_job: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
+        """Trains the policies of the ensemble.
+
+        Args:
+            training_trackers: The trackers to train on.
+            domain: The domain of the trackers.
+            training_jobs: How many policies are trained at the same time, each
+                in its own process.
+            threads_per_job: How many threads each of these processes uses.
+                Defaults to an equal share of the CPUs.
+            **kwargs: Additional arguments passed on to the policies.
+        """
+
         if training_trackers:
-            for policy in self.policies:
-                policy.train(training_trackers, domain, **kwargs)
+            for i in sorted(self.reused_policies):
+                logger.info(
+                    f"Reusing trained {type(self.policies[i]).__name__} of the "
+                    f"previous model, as neither its configuration nor its "
+                    f"training data changed."
+                )
+
+            policy_indices = [
+                i for i in range(len(self.policies)) if i not in self.reused_policies
+            ]
+            if (
+                training_jobs > 1
+                and len(policy_indices) > 1
+                and can_be_sent_to_processes(
+                    [self.policies[i] for i in policy_indices], kwargs
+                )
+            ):
+                training_times = self._train_policies_in_processes(
+                    policy_indices,
+                    training_trackers,
+                    domain,
+                    training_jobs,
+                    threads_per_job,
+                    kwargs,
+                )
+            else:
+                training_times = {}
+                for i in policy_indices:
+                    start = time.time()
+                    self.policies[i].train(training_trackers, domain, **kwargs)
+                    training_times[i] = time.time() - start
+
+            for i, training_time in sorted(training_times.items()):
+                logger.info(
+                    f"Trained {type(self.policies[i]).__name__} in "
+                    f"{training_time:.2f}s."
+                )
         else:
             logger.info("Skipped training, because there are no training samples.")
         self.training_trackers = training_trackers
         self.date_trained = datetime.now().strftime("%Y%m%d-%H%M%S")
 
+    def _train_policies_in_processes(
+        self,
+        policy_indices: List[int],
+        training_trackers: List[DialogueStateTracker],
+        domain: Domain,
+        training_jobs: int,
+        threads_per_job: Optional[int],
+        kwargs: Dict[Text, Any],
+    ) -> Dict[int, float]:
+        """Trains policies in a pool of processes and returns how long the
+        training of each policy took.
+
+        Trained policies can't be sent back from the processes (e.g. because of
+        their TensorFlow sessions), so each process persists the policy it
+        trained and the policy is loaded again. The training data is pickled to
+        a file once instead of being sent to every process."""
+
+        num_processes = min(training_jobs, len(policy_indices))
+        threads_per_job = threads_per_job or threads_per_training_job(num_processes)
+        logger.info(
+            f"Training {len(policy_indices)} policies in {num_processes} processes "
+            f"with {threads_per_job} threads each."
+        )
+
+        training_times = {}
+        with tempfile.TemporaryDirectory() as directory:
+            training_data_file = os.path.join(directory, "training_data.pkl")
+            with open(training_data_file, "wb") as f:
+                pickle.dump(
+                    (training_trackers, domain, kwargs),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+
+            with ProcessPoolExecutor(
+                max_workers=num_processes,
+                # TensorFlow doesn't support to continue in forked processes
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_policy_training_process,
+                initargs=(threads_per_job, training_data_file),
+            ) as executor:
+                futures = {
+                    i: executor.submit(
+                        _train_policy, self.policies[i], os.path.join(directory, str(i))
+                    )
+                    for i in policy_indices
+                }
+                for i, future in futures.items():
+                    training_times[i] = future.result()
+                    policy_cls = type(self.policies[i])
+                    policy = policy_cls.load(os.path.join(directory, str(i)))
+                    self._ensure_loaded_policy(policy, policy_cls, policy_cls.__name__)
+                    self.policies[i] = policy
+
+        return training_times
+
     def probabilities_using_best_policy(
         self, tracker: DialogueStateTracker, domain: Domain
     ) -> Tuple[Optional[List[float]], Optional[Text]]:
@@ -272,6 +390,29 @@ class PolicyEnsemble:
         ensemble = ensemble_cls(policies, fingerprints)
         return ensemble
 
+    def reuse_trained_policies(
+        self, path: Text, policy_indices: Dict[int, int]
+    ) -> None:
+        """Replaces policies with the trained policies of a persisted ensemble.
+
+        The replaced policies are not trained again when the ensemble is trained.
+
+        Args:
+            path: Path of the persisted ensemble.
+            policy_indices: Maps the index of a policy of this ensemble to the
+                index of the trained policy in the persisted ensemble.
+        """
+
+        metadata = self.load_metadata(path)
+        for i, persisted_index in policy_indices.items():
+            policy_name = metadata["policy_names"][persisted_index]
+            policy_cls = registry.policy_from_module_path(policy_name)
+            dir_name = f"policy_{persisted_index}_{policy_cls.__name__}"
+            policy = policy_cls.load(os.path.join(path, dir_name))
+            self._ensure_loaded_policy(policy, policy_cls, policy_name)
+            self.policies[i] = policy
+            self.reused_policies.add(i)
+
     @classmethod
     def from_dict(cls, policy_configuration: Dict[Text, Any]) -> List[Policy]:
         import copy
@@ -365,6 +506,31 @@ class PolicyEnsemble:
             p.continue_training(self.training_trackers, domain, **kwargs)
 
 
+# the training data of the policies which are trained by a process of the pool
+_training_trackers: Optional[List[DialogueStateTracker]] = None
+_domain: Optional[Domain] = None
+_training_kwargs: Dict[Text, Any] = {}
+
+
+def _init_policy_training_process(num_threads: int, training_data_file: Text) -> None:
+    global _training_trackers, _domain, _training_kwargs
+
+    init_training_job_process(num_threads)
+    with open(training_data_file, "rb") as f:
+        _training_trackers, _domain, _training_kwargs = pickle.load(f)
+
+
+def _train_policy(policy: Policy, path: Text) -> float:
+    """Trains `policy` on the training data of the process and persists it to
+    `path`. Returns how long the training took."""
+
+    start = time.time()
+    policy.train(_training_trackers, _domain, **_training_kwargs)
+    training_time = time.time() - start
+    policy.persist(path)
+    return training_time
+
+
 class SimplePolicyEnsemble(PolicyEnsemble):
     @staticmethod
     def is_not_memo_policy(best_policy_name) -> bool:
@@ -384,9 +550,21 @@ class SimplePolicyEnsemble(PolicyEnsemble):
         best_policy_name = None
         best_policy_priority = -1
 
+        timings = []
+
         for i, p in enumerate(self.policies):
+            started_at = time.perf_counter()
+            featurization_started_at = featurization_time()
+
             probabilities = p.predict_action_probabilities(tracker, domain)
 
+            featurization = featurization_time() - featurization_started_at
+            total = time.perf_counter() - started_at
+            timings.append(
+                f"{type(p).__name__}: {featurization * 1000:.1f} ms featurization, "
+                f"{(total - featurization) * 1000:.1f} ms inference"
+            )
+
             if len(tracker.events) > 0 and isinstance(
                 tracker.events[-1], ActionExecutionRejected
             ):
@@ -436,6 +614,7 @@ class SimplePolicyEnsemble(PolicyEnsemble):
                     fallback_idx, type(fallback_policy).__name__
                 )
 
+        logger.debug(f"Prediction times - {'; '.join(timings)}.")
         logger.debug(f"Predicted next action using {best_policy_name}")
         return result, best_policy_name
 
@@ -13,6 +13,8 @@ from rasa.core.domain import Domain
 from rasa.core.featurizers import (
     MaxHistoryTrackerFeaturizer,
     BinarySingleStateFeaturizer,
+    is_sparse_features,
+    sparse_features_to_dense,
 )
 from rasa.core.featurizers import TrackerFeaturizer
 from rasa.core.policies.policy import Policy
@@ -32,6 +34,23 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class _DenseBatches(tf.keras.utils.Sequence):
+    """Feeds sparse training data to keras, converting one batch at a time to a
+    dense array."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, batch_size: int) -> None:
+        self.X = X
+        self.y = y
+        self.batch_size = batch_size
+
+    def __len__(self) -> int:
+        return int(np.ceil(len(self.X) / self.batch_size))
+
+    def __getitem__(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        batch = slice(idx * self.batch_size, (idx + 1) * self.batch_size)
+        return sparse_features_to_dense(self.X[batch]), self.y[batch]
+
+
 class KerasPolicy(Policy):
     SUPPORTS_ONLINE_TRAINING = True
 
@@ -162,6 +181,7 @@ class KerasPolicy(Policy):
         domain: Domain,
         **kwargs: Any,
     ) -> None:
+        from rasa.utils.train_utils import tf_config_for_training
 
         # set numpy random seed
         np.random.seed(self.random_seed)
@@ -174,12 +194,18 @@ class KerasPolicy(Policy):
         with self.graph.as_default():
             # set random seed in tf
             tf.set_random_seed(self.random_seed)
-            self.session = tf.compat.v1.Session(config=self._tf_config)
+            self.session = tf.compat.v1.Session(
+                config=tf_config_for_training(self._tf_config)
+            )
 
             with self.session.as_default():
                 if self.model is None:
+                    if is_sparse_features(shuffled_X):
+                        input_shape = shuffled_X[0].shape
+                    else:
+                        input_shape = shuffled_X.shape[1:]
                     self.model = self.model_architecture(
-                        shuffled_X.shape[1:], shuffled_y.shape[1:]
+                        input_shape, shuffled_y.shape[1:]
                     )
 
                 logger.info(
@@ -188,20 +214,33 @@ class KerasPolicy(Policy):
                     "".format(training_data.num_examples(), self.validation_split)
                 )
 
-                # filter out kwargs that cannot be passed to fit
-                self._train_params = self._get_valid_params(
-                    self.model.fit, **self._train_params
-                )
+                if is_sparse_features(shuffled_X):
+                    # only densify one batch at a time
+                    train_params = self._get_valid_params(
+                        self.model.fit_generator, **self._train_params
+                    )
+                    self.model.fit_generator(
+                        _DenseBatches(shuffled_X, shuffled_y, self.batch_size),
+                        epochs=self.epochs,
+                        shuffle=False,
+                        verbose=obtain_verbosity(),
+                        **train_params,
+                    )
+                else:
+                    # filter out kwargs that cannot be passed to fit
+                    self._train_params = self._get_valid_params(
+                        self.model.fit, **self._train_params
+                    )
 
-                self.model.fit(
-                    shuffled_X,
-                    shuffled_y,
-                    epochs=self.epochs,
-                    batch_size=self.batch_size,
-                    shuffle=False,
-                    verbose=obtain_verbosity(),
-                    **self._train_params,
-                )
+                    self.model.fit(
+                        shuffled_X,
+                        shuffled_y,
+                        epochs=self.epochs,
+                        batch_size=self.batch_size,
+                        shuffle=False,
+                        verbose=obtain_verbosity(),
+                        **self._train_params,
+                    )
                 # the default parameter for epochs in keras fit is 1
                 self.current_epoch = self.defaults.get("epochs", 1)
                 logger.info("Done fitting keras policy model")
@@ -231,7 +270,7 @@ class KerasPolicy(Policy):
 
                 # fit to one extra example using updated trackers
                 self.model.fit(
-                    training_data.X,
+                    sparse_features_to_dense(training_data.X),
                     training_data.y,
                     epochs=self.current_epoch + 1,
                     batch_size=len(training_data.y),
@@ -246,7 +285,7 @@ class KerasPolicy(Policy):
     ) -> List[float]:
 
         # noinspection PyPep8Naming
-        X = self.featurizer.create_X([tracker], domain)
+        X = sparse_features_to_dense(self.featurizer.create_X([tracker], domain))
 
         with self.graph.as_default(), self.session.as_default():
             y_pred = self.model.predict(X, batch_size=1)
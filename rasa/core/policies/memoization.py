@@ -1,24 +1,48 @@
 import zlib
 
 import base64
+import bisect
 import json
 import logging
+import mmap
 import os
+import struct
+from collections.abc import Mapping
 from tqdm import tqdm
-from typing import Optional, Any, Dict, List, Text
+from typing import Optional, Any, Dict, Iterator, List, Set, Text, Tuple, Union
 
 import rasa.utils.io
 
 from rasa.core.domain import Domain
-from rasa.core.events import ActionExecuted
+from rasa.core.events import (
+    ActionExecuted,
+    AgentUttered,
+    AllSlotsReset,
+    BotUttered,
+    ConversationPaused,
+    ConversationResumed,
+    FollowupAction,
+    ReminderCancelled,
+    ReminderScheduled,
+    SlotSet,
+    UserUttered,
+)
 from rasa.core.featurizers import TrackerFeaturizer, MaxHistoryTrackerFeaturizer
 from rasa.core.policies.policy import Policy
-from rasa.core.trackers import DialogueStateTracker
+from rasa.core.trackers import AnySlotDict, DialogueStateTracker
 from rasa.utils.common import is_logging_disabled
 from rasa.core.constants import MEMOIZATION_POLICY_PRIORITY
 
 logger = logging.getLogger(__name__)
 
+# marks a padded (`None`) turn in a feature key
+PADDING_MARKER = 0xFFFF
+
+# header of each entry of a persisted lookup: key length, index of the value
+LOOKUP_ENTRY_HEADER = struct.Struct("<Ii")
+# offset of an entry of a persisted lookup, the number of entries is stored last
+LOOKUP_OFFSET = struct.Struct("<Q")
+
 
 class MemoizationPolicy(Policy):
     """The policy that remembers exact examples of
@@ -41,6 +65,7 @@ class MemoizationPolicy(Policy):
         training stories for this, use AugmentedMemoizationPolicy.
     """
 
+    # only used for lookups with string keys created by previous Rasa versions
     ENABLE_FEATURE_STRING_COMPRESSION = True
 
     SUPPORTS_ONLINE_TRAINING = True
@@ -76,6 +101,20 @@ class MemoizationPolicy(Policy):
         self.lookup = lookup if lookup is not None else {}
         self.is_enabled = True
 
+        # ids of the state names used in feature keys, `None` if the lookup
+        # still uses the string keys of previous versions
+        self._state_ids: Optional[Dict[Text, int]] = (
+            None if self._has_string_keys(self.lookup) else {}
+        )
+
+    @staticmethod
+    def _has_string_keys(lookup: Dict) -> bool:
+        # persisted lookups which are loaded from `memorized_turns.bin` only have
+        # byte keys, they don't have to be scanned
+        if isinstance(lookup, _PersistedLookup):
+            return False
+        return any(isinstance(key, str) for key in lookup)
+
     def toggle(self, activate: bool) -> None:
         self.is_enabled = activate
 
@@ -132,7 +171,80 @@ class MemoizationPolicy(Policy):
                     self.lookup[feature_key] = feature_item
             pbar.set_postfix({"# examples": "{:d}".format(len(self.lookup))})
 
-    def _create_feature_key(self, states: List[Dict]) -> Text:
+    def _create_feature_key(
+        self, states: List[Optional[Dict[Text, float]]]
+    ) -> Optional[Union[bytes, Text]]:
+        """Encode `states` as key of the lookup.
+
+        Every turn is packed as the number of its states followed by the ids of
+        the state names, sorted, whose lowest bit marks whether the value of the
+        state differs from `1.0`. Those values follow as doubles. Returns `None`
+        if a state name was never seen during training, since such states can't
+        be recalled anyway."""
+
+        if self._state_ids is None:
+            return self._create_legacy_feature_key(states)
+
+        key = []
+        for state in states:
+            turn = self._encode_turn(state)
+            if turn is None:
+                return None
+            key.append(turn)
+
+        return b"".join(key)
+
+    def _encode_turn(self, state: Optional[Dict[Text, float]]) -> Optional[bytes]:
+        """Encode the state of a single turn as part of a feature key."""
+
+        if state is None:
+            return struct.pack("<H", PADDING_MARKER)
+
+        state_ids = []
+        for name, value in state.items():
+            state_id = self._state_ids.get(name)
+            if state_id is None:
+                return None
+            state_ids.append((state_id, value))
+        state_ids.sort()
+
+        encoded_ids = []
+        values = []
+        for state_id, value in state_ids:
+            if value == 1.0:
+                encoded_ids.append(state_id << 1)
+            else:
+                encoded_ids.append(state_id << 1 | 1)
+                values.append(float(value))
+
+        return struct.pack(
+            f"<H{len(encoded_ids)}I{len(values)}d",
+            len(encoded_ids),
+            *encoded_ids,
+            *values,
+        )
+
+    @staticmethod
+    def _split_feature_key(key: bytes) -> List[bytes]:
+        """Split a key created by `_create_feature_key` into its turns."""
+
+        turns = []
+        offset = 0
+        while offset < len(key):
+            (number_of_states,) = struct.unpack_from("<H", key, offset)
+            length = 2
+            if number_of_states != PADDING_MARKER:
+                encoded_ids = struct.unpack_from(
+                    f"<{number_of_states}I", key, offset + 2
+                )
+                number_of_values = sum(state_id & 1 for state_id in encoded_ids)
+                length += 4 * number_of_states + 8 * number_of_values
+            turns.append(key[offset : offset + length])
+            offset += length
+
+        return turns
+
+    def _create_legacy_feature_key(self, states: List[Dict]) -> Text:
         from rasa.utils import io
 
         feature_str = json.dumps(states, sort_keys=True).replace('"', "")
@@ -142,6 +254,20 @@ class MemoizationPolicy(Policy):
         else:
             return feature_str
 
+    def _add_state_names(
+        self, trackers_as_states: List[List[Optional[Dict[Text, float]]]]
+    ) -> None:
+        """Assign ids to state names which don't have one yet."""
+
+        if self._state_ids is None:
+            return
+
+        for states in trackers_as_states:
+            for state in states:
+                for name in state or []:
+                    if name not in self._state_ids:
+                        self._state_ids[name] = len(self._state_ids)
+
     def train(
         self,
         training_trackers: List[DialogueStateTracker],
@@ -150,6 +276,7 @@ class MemoizationPolicy(Policy):
     ) -> None:
         """Trains the policy on given training trackers."""
         self.lookup = {}
+        self._state_ids = dict(domain.input_state_map)
         # only considers original trackers (no augmented ones)
         training_trackers = [
             t
@@ -160,6 +287,7 @@ class MemoizationPolicy(Policy):
             trackers_as_states,
             trackers_as_actions,
         ) = self.featurizer.training_states_and_actions(training_trackers, domain)
+        self._add_state_names(trackers_as_states)
         self._add_states_to_lookup(trackers_as_states, trackers_as_actions, domain)
         logger.debug("Memorized {} unique examples.".format(len(self.lookup)))
 
@@ -170,16 +298,24 @@ class MemoizationPolicy(Policy):
         **kwargs: Any,
     ) -> None:
 
+        if isinstance(self.lookup, _PersistedLookup):
+            self.lookup = dict(self.lookup)
+
         # add only the last tracker, because it is the only new one
         (
             trackers_as_states,
             trackers_as_actions,
         ) = self.featurizer.training_states_and_actions(training_trackers[-1:], domain)
+        self._add_state_names(trackers_as_states)
         self._add_states_to_lookup(trackers_as_states, trackers_as_actions, domain)
 
     def _recall_states(self, states: List[Dict[Text, float]]) -> Optional[int]:
 
-        return self.lookup.get(self._create_feature_key(states))
+        feature_key = self._create_feature_key(states)
+        if feature_key is None:
+            return None
+
+        return self.lookup.get(feature_key)
 
     def recall(
         self,
@@ -225,15 +361,44 @@ class MemoizationPolicy(Policy):
         return result
 
     def persist(self, path: Text) -> None:
+        """Persists the policy.
+
+        The lookup is stored in `memorized_turns.bin` as a sequence of entries
+        sorted by their keys, each consisting of the key length, the index of the
+        value in the list of values in `memorized_turns.json`, and the key itself.
+        The entries are followed by their offsets in the file and the number of
+        entries, so that the loaded policy can search them in place."""
 
         self.featurizer.persist(path)
 
         memorized_file = os.path.join(path, "memorized_turns.json")
-        data = {
-            "priority": self.priority,
-            "max_history": self.max_history,
-            "lookup": self.lookup,
-        }
+        data = {"priority": self.priority, "max_history": self.max_history}
+
+        if self._state_ids is None:
+            data["lookup"] = self.lookup
+        else:
+            values = sorted(set(self.lookup.values()), key=str)
+            value_indices = {value: idx for idx, value in enumerate(values)}
+
+            lookup_file = os.path.join(path, "memorized_turns.bin")
+            rasa.utils.io.create_directory_for_file(lookup_file)
+            with open(lookup_file, "wb") as f:
+                offsets = []
+                for key in sorted(self.lookup):
+                    offsets.append(f.tell())
+                    f.write(
+                        LOOKUP_ENTRY_HEADER.pack(
+                            len(key), value_indices[self.lookup[key]]
+                        )
+                    )
+                    f.write(key)
+                for offset in offsets:
+                    f.write(LOOKUP_OFFSET.pack(offset))
+                f.write(LOOKUP_OFFSET.pack(len(offsets)))
+
+            data["state_names"] = sorted(self._state_ids, key=self._state_ids.get)
+            data["values"] = values
+
         rasa.utils.io.create_directory_for_file(memorized_file)
         rasa.utils.io.dump_obj_as_json_to_file(memorized_file, data)
 
@@ -244,9 +409,25 @@ class MemoizationPolicy(Policy):
         memorized_file = os.path.join(path, "memorized_turns.json")
         if os.path.isfile(memorized_file):
             data = json.loads(rasa.utils.io.read_file(memorized_file))
-            return cls(
-                featurizer=featurizer, priority=data["priority"], lookup=data["lookup"]
+
+            if "lookup" in data:
+                # lookup with string keys created by previous Rasa versions
+                return cls(
+                    featurizer=featurizer,
+                    priority=data["priority"],
+                    lookup=data["lookup"],
+                )
+
+            lookup = _PersistedLookup(
+                os.path.join(path, "memorized_turns.bin"), data["values"]
+            )
+            policy = cls(
+                featurizer=featurizer, priority=data["priority"], lookup=lookup
             )
+            policy._state_ids = {
+                name: state_id for state_id, name in enumerate(data["state_names"])
+            }
+            return policy
         else:
             logger.info(
                 "Couldn't load memoization for policy. "
@@ -256,6 +437,155 @@ class MemoizationPolicy(Policy):
             return cls()
 
 
+class _PersistedLookup(Mapping):
+    """Read-only lookup stored by `MemoizationPolicy.persist`.
+
+    The file is memory mapped and keys are found by a binary search over the
+    sorted entries, so that loading a policy doesn't create a dict of all its
+    keys."""
+
+    def __init__(self, lookup_file: Text, values: List[Any]) -> None:
+        with open(lookup_file, "rb") as f:
+            self._memorized = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._values = values
+
+        end = len(self._memorized) - LOOKUP_OFFSET.size
+        (self._length,) = LOOKUP_OFFSET.unpack_from(self._memorized, end)
+        self._offsets_start = end - self._length * LOOKUP_OFFSET.size
+
+    def _entry(self, index: int) -> Tuple[bytes, int]:
+        """Return key and value index of the entry at position `index`."""
+
+        (offset,) = LOOKUP_OFFSET.unpack_from(
+            self._memorized, self._offsets_start + index * LOOKUP_OFFSET.size
+        )
+        key_length, value_index = LOOKUP_ENTRY_HEADER.unpack_from(
+            self._memorized, offset
+        )
+        key_start = offset + LOOKUP_ENTRY_HEADER.size
+        return self._memorized[key_start : key_start + key_length], value_index
+
+    def __getitem__(self, key: bytes) -> Any:
+        low, high = 0, self._length
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, value_index = self._entry(middle)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return self._values[value_index]
+
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for index in range(self._length):
+            yield self._entry(index)[0]
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class _ForgetfulHistory:
+    """Creates the states of a tracker as if all events before one of its actions
+    were forgotten.
+
+    The result is the same as replaying the events starting with that action on a
+    fresh copy of the tracker (see
+    `AugmentedMemoizationPolicy._back_to_the_future_again`). Instead of replaying
+    them, the state of a turn is created from the latest events before it which
+    set the slots, the latest message and the latest action. This is only
+    possible for trackers with `SUPPORTED_EVENTS`, as e.g. forms also change
+    which turns are featurized."""
+
+    SUPPORTED_EVENTS = (
+        UserUttered,
+        BotUttered,
+        ActionExecuted,
+        SlotSet,
+        AllSlotsReset,
+        ReminderScheduled,
+        ReminderCancelled,
+        FollowupAction,
+        ConversationPaused,
+        ConversationResumed,
+        AgentUttered,
+    )
+
+    def __init__(self, tracker: DialogueStateTracker, domain: Domain) -> None:
+        self.domain = domain
+        self.events = tracker.applied_events()
+
+        # the state of the turn which is featurized is set on this tracker
+        self._state_tracker = tracker.init_copy()
+        self._no_message = self._state_tracker.latest_message
+
+        self.action_positions = []
+        self.message_positions = []
+        self.slot_positions = {name: [] for name in self._state_tracker.slots}
+        for position, event in enumerate(self.events):
+            if isinstance(event, ActionExecuted):
+                self.action_positions.append(position)
+            elif isinstance(event, UserUttered):
+                self.message_positions.append(position)
+            elif isinstance(event, SlotSet):
+                if event.key in self.slot_positions:
+                    self.slot_positions[event.key].append(position)
+            elif isinstance(event, AllSlotsReset):
+                for positions in self.slot_positions.values():
+                    positions.append(position)
+
+    @classmethod
+    def is_supported(cls, tracker: DialogueStateTracker) -> bool:
+        return not isinstance(tracker.slots, AnySlotDict) and all(
+            type(event) in cls.SUPPORTED_EVENTS
+            for event in tracker._get_applied_events()
+        )
+
+    def last_turns(self, first_action: int, max_turns: int) -> List[int]:
+        """Positions of the last `max_turns` turns of the history starting with
+        the `first_action`-th action. The final turn has the position
+        `len(self.events)`."""
+
+        first_turn = max(first_action, len(self.action_positions) - max_turns + 1)
+        return self.action_positions[first_turn:] + [len(self.events)]
+
+    @staticmethod
+    def _latest(positions: List[int], start: int, end: int) -> Optional[int]:
+        """Latest of the sorted `positions` in [`start`, `end`)."""
+
+        index = bisect.bisect_left(positions, end) - 1
+        if index >= 0 and positions[index] >= start:
+            return positions[index]
+        return None
+
+    def state(self, start: int, turn: int) -> frozenset:
+        """State of the history starting at position `start` before the event at
+        position `turn`."""
+
+        tracker = self._state_tracker
+
+        position = self._latest(self.message_positions, start, turn)
+        tracker.latest_message = (
+            self._no_message if position is None else self.events[position]
+        )
+
+        position = self._latest(self.action_positions, start, turn)
+        tracker.latest_action_name = (
+            None if position is None else self.events[position].action_name
+        )
+
+        for name, positions in self.slot_positions.items():
+            position = self._latest(positions, start, turn)
+            if position is None or isinstance(self.events[position], AllSlotsReset):
+                tracker.slots[name].reset()
+            else:
+                tracker.slots[name].value = self.events[position].value
+
+        return frozenset(self.domain.get_active_states(tracker).items())
+
+
 class AugmentedMemoizationPolicy(MemoizationPolicy):
     """The policy that remembers examples from training stories
         for `max_history` turns.
@@ -273,6 +603,32 @@ class AugmentedMemoizationPolicy(MemoizationPolicy):
         for current dialogue.
     """
 
+    def __init__(
+        self,
+        featurizer: Optional[TrackerFeaturizer] = None,
+        priority: int = MEMOIZATION_POLICY_PRIORITY,
+        max_history: Optional[int] = None,
+        lookup: Optional[Dict] = None,
+    ) -> None:
+
+        super().__init__(featurizer, priority, max_history, lookup)
+
+        # encoded last turns of all memorized examples, created on demand
+        self._last_turns: Optional[Set[bytes]] = None
+
+    def _add_states_to_lookup(
+        self, trackers_as_states, trackers_as_actions, domain, online=False
+    ) -> None:
+        self._last_turns = None
+        super()._add_states_to_lookup(
+            trackers_as_states, trackers_as_actions, domain, online
+        )
+
+    def _memorized_last_turns(self) -> Set[bytes]:
+        if self._last_turns is None:
+            self._last_turns = {self._split_feature_key(k)[-1] for k in self.lookup}
+        return self._last_turns
+
     @staticmethod
     def _back_to_the_future_again(tracker) -> Optional[DialogueStateTracker]:
         """Send Marty to the past to get
@@ -331,6 +687,52 @@ class AugmentedMemoizationPolicy(MemoizationPolicy):
         logger.debug(f"Current tracker state {old_states}")
         return None
 
+    def _recall_with_forgotten_history(
+        self, old_states, tracker, domain
+    ) -> Optional[int]:
+        """Recall the same states as `_recall_using_delorean` without replaying
+        the tracker for every action.
+
+        Histories whose last turn isn't the last turn of any memorized example
+        are skipped before their other turns are created."""
+
+        logger.debug("Recall with forgotten history...")
+        history = _ForgetfulHistory(tracker, domain)
+        memorized_last_turns = self._memorized_last_turns()
+
+        for first_action in range(1, len(history.action_positions)):
+            start = history.action_positions[first_action]
+            turns = history.last_turns(first_action, self.max_history)
+
+            last_state = self.featurizer._states_as_dicts(
+                [history.state(start, turns[-1])]
+            )[0]
+            if self._encode_turn(last_state) not in memorized_last_turns:
+                continue
+
+            states = self.featurizer._states_as_dicts(
+                history.state(start, turn) for turn in turns[:-1]
+            )
+            states = self.featurizer.slice_state_history(
+                states + [last_state], self.max_history
+            )
+
+            memorised = self._recall_states(states)
+            if memorised is not None:
+                logger.debug(f"Current tracker state {states}")
+                return memorised
+
+        # No match found
+        logger.debug(f"Current tracker state {old_states}")
+        return None
+
+    def _can_recall_with_forgotten_history(self, tracker) -> bool:
+        return (
+            self._state_ids is not None
+            and isinstance(self.featurizer, MaxHistoryTrackerFeaturizer)
+            and _ForgetfulHistory.is_supported(tracker)
+        )
+
     def recall(
         self,
         states: List[Dict[Text, float]],
@@ -341,6 +743,8 @@ class AugmentedMemoizationPolicy(MemoizationPolicy):
         recalled = self._recall_states(states)
         if recalled is None:
             # let's try a different method to recall that tracker
+            if self._can_recall_with_forgotten_history(tracker):
+                return self._recall_with_forgotten_history(states, tracker, domain)
             return self._recall_using_delorean(states, tracker, domain)
         else:
             return recalled
@@ -63,9 +63,21 @@ class Policy:
     ) -> DialogueTrainingData:
         """Transform training trackers into a vector representation.
         The trackers, consisting of multiple turns, will be transformed
-        into a float vector which can be used by a ML model."""
+        into a float vector which can be used by a ML model.
 
-        training_data = self.featurizer.featurize_trackers(training_trackers, domain)
+        If a `training_data_cache` is passed, the vector representation is
+        loaded from the cache if the trackers were featurized the same way
+        before."""
+
+        training_data_cache = kwargs.get("training_data_cache")
+        if training_data_cache is not None:
+            training_data = training_data_cache.featurize_trackers(
+                self.featurizer, training_trackers, domain
+            )
+        else:
+            training_data = self.featurizer.featurize_trackers(
+                training_trackers, domain
+            )
 
         max_training_samples = kwargs.get("max_training_samples")
         if max_training_samples is not None:
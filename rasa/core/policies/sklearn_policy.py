@@ -3,13 +3,18 @@ import logging
 import os
 import pickle
 import typing
-from typing import Any, Callable, Dict, List, Optional, Text, Tuple
+from typing import Any, Callable, Dict, List, Optional, Text, Tuple, Union
 
 import numpy as np
 import rasa.utils.io
+import scipy.sparse
 from rasa.core.constants import DEFAULT_POLICY_PRIORITY
 from rasa.core.domain import Domain
-from rasa.core.featurizers import MaxHistoryTrackerFeaturizer, TrackerFeaturizer
+from rasa.core.featurizers import (
+    MaxHistoryTrackerFeaturizer,
+    TrackerFeaturizer,
+    is_sparse_features,
+)
 from rasa.core.policies.policy import Policy
 from rasa.core.trackers import DialogueStateTracker
 from rasa.core.training.data import DialogueTrainingData
@@ -103,7 +108,20 @@ class SklearnPolicy(Policy):
             X, y = sklearn_shuffle(X, y)
         return X, y
 
-    def _preprocess_data(self, X) -> np.ndarray:
+    def _preprocess_data(self, X) -> Union[np.ndarray, scipy.sparse.csr_matrix]:
+        if is_sparse_features(X):
+            # sklearn estimators accept sparse input. Padding states only hold a
+            # `-1` in their first column, they are filled with `-1` as in the
+            # dense features (see `sparse_features_to_dense`)
+            states = scipy.sparse.vstack(list(X)).tocsr()
+            is_padding = states[:, 0].toarray().ravel() < 0
+            padding = scipy.sparse.kron(
+                scipy.sparse.csr_matrix(is_padding[:, np.newaxis], dtype=np.float32),
+                -np.ones((1, states.shape[1]), dtype=np.float32),
+            )
+            states = scipy.sparse.diags((~is_padding).astype(np.float32)) @ states
+            states = (states + padding).tocsr()
+            return states.reshape(X.shape[0], -1).tocsr()
         return X.reshape(X.shape[0], -1)
 
     def _search_and_score(self, model, X, y, param_grid) -> Tuple[Any, Any]:
@@ -27,6 +27,7 @@ from rasa.core.constants import (
     UTTER_PREFIX,
 )
 from rasa.core.domain import Domain
+from rasa.core.executor import inference_executor
 from rasa.core.events import (
     ActionExecuted,
     ActionExecutionRejected,
@@ -96,7 +97,7 @@ class MessageProcessor:
 
         if not self.policy_ensemble or not self.domain:
             # save tracker state to continue conversation from this state
-            self._save_tracker(tracker)
+            await self._save_tracker(tracker)
             raise_warning(
                 "No policy ensemble or domain set. Skipping action prediction "
                 "and execution.",
@@ -107,7 +108,7 @@ class MessageProcessor:
         await self._predict_and_execute_next_action(message.output_channel, tracker)
 
         # save tracker state to continue conversation from this state
-        self._save_tracker(tracker)
+        await self._save_tracker(tracker)
 
         if isinstance(message.output_channel, CollectingOutputChannel):
             return message.output_channel.messages
@@ -134,9 +135,11 @@ class MessageProcessor:
             )
             return None
 
-        probabilities, policy = self._get_next_action_probabilities(tracker)
+        probabilities, policy = await inference_executor().run(
+            self._get_next_action_probabilities, tracker
+        )
         # save tracker state to continue conversation from this state
-        self._save_tracker(tracker)
+        await self._save_tracker(tracker)
         scores = [
             {"action": a, "score": p}
             for a, p in zip(self.domain.action_names, probabilities)
@@ -174,7 +177,7 @@ class MessageProcessor:
                 nlg=self.nlg,
             )
 
-            self.tracker_store.save(tracker)
+            await self._save_tracker(tracker)
 
     async def get_tracker_with_session_start(
         self, sender_id: Text, output_channel: Optional[OutputChannel] = None,
@@ -191,7 +194,7 @@ class MessageProcessor:
               Tracker for `sender_id` if available, `None` otherwise.
         """
 
-        tracker = self._get_tracker(sender_id)
+        tracker = await self._get_tracker(sender_id)
         if not tracker:
             return None
 
@@ -223,7 +226,7 @@ class MessageProcessor:
 
             if should_save_tracker:
                 # save tracker state to continue conversation from this state
-                self._save_tracker(tracker)
+                await self._save_tracker(tracker)
         else:
             logger.warning(
                 f"Failed to retrieve or create tracker for conversation ID "
@@ -251,7 +254,7 @@ class MessageProcessor:
             )
 
             # save tracker state to continue conversation from this state
-            self._save_tracker(tracker)
+            await self._save_tracker(tracker)
         else:
             logger.warning(
                 f"Failed to retrieve or create tracker for conversation ID "
@@ -376,7 +379,7 @@ class MessageProcessor:
         tracker.update(UserUttered.create_external(intent_name, entity_list))
         await self._predict_and_execute_next_action(output_channel, tracker)
         # save tracker state to continue conversation from this state
-        self._save_tracker(tracker)
+        await self._save_tracker(tracker)
 
     @staticmethod
     def _log_slots(tracker) -> None:
@@ -444,6 +447,28 @@ class MessageProcessor:
 
         return parse_data
 
+    async def _parse_messages(self, texts: List[Text]) -> List[Dict[Text, Any]]:
+        """Parse several messages at once, see `_parse_message`."""
+
+        regex_interpreter = RegexInterpreter()
+        nlu_results = iter(
+            await self.interpreter.parse_batch(
+                [text for text in texts if not text.startswith(INTENT_MESSAGE_PREFIX)]
+            )
+        )
+
+        results = []
+        for text in texts:
+            if text.startswith(INTENT_MESSAGE_PREFIX):
+                parse_data = await regex_interpreter.parse(text)
+            else:
+                parse_data = next(nlu_results)
+
+            self._log_unseen_features(parse_data)
+            results.append(parse_data)
+
+        return results
+
     async def _handle_message_with_tracker(
         self, message: UserMessage, tracker: DialogueStateTracker
     ) -> None:
@@ -502,7 +527,9 @@ class MessageProcessor:
             and num_predicted_actions < self.max_number_of_predictions
         ):
             # this actually just calls the policy's method by the same name
-            action, policy, confidence = self.predict_next_action(tracker)
+            action, policy, confidence = await inference_executor().run(
+                self.predict_next_action, tracker
+            )
 
             should_predict_another_action = await self._run_action(
                 action, tracker, output_channel, self.nlg, policy, confidence
@@ -715,14 +742,14 @@ class MessageProcessor:
 
         return has_expired
 
-    def _get_tracker(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+    async def _get_tracker(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         sender_id = sender_id or UserMessage.DEFAULT_SENDER_ID
-        return self.tracker_store.get_or_create_tracker(
+        return await self.tracker_store.get_or_create_tracker_async(
             sender_id, append_action_listen=False
         )
 
-    def _save_tracker(self, tracker: DialogueStateTracker) -> None:
-        self.tracker_store.save(tracker)
+    async def _save_tracker(self, tracker: DialogueStateTracker) -> None:
+        await self.tracker_store.save_async(tracker)
 
     def _prob_array_for_action(
         self, action_name: Text
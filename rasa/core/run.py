@@ -5,9 +5,12 @@ import shutil
 from functools import partial
 from typing import Any, List, Optional, Text, Union
 
+import rasa.core.executor
+import rasa.core.sharding
 import rasa.core.utils
 import rasa.utils
 import rasa.utils.common
+import rasa.utils.endpoints
 import rasa.utils.io
 from rasa import model, server
 from rasa.constants import ENV_SANIC_BACKLOG
@@ -119,6 +122,12 @@ def configure_app(
 
     app.add_task(configure_async_logging)
 
+    # noinspection PyUnusedLocal
+    async def close_pooled_sessions(_app: Sanic, _loop: Text) -> None:
+        await rasa.utils.endpoints.close_pooled_sessions()
+
+    app.register_listener(close_pooled_sessions, "after_server_stop")
+
     if "cmdline" in {c.name() for c in input_channels}:
 
         async def run_cmdline_io(running_app: Sanic):
@@ -195,16 +204,47 @@ def serve_application(
 
     app.register_listener(clear_model_files, "after_server_stop")
 
+    # noinspection PyUnusedLocal
+    async def shutdown_inference_executor(_app: Sanic, _loop: Text) -> None:
+        rasa.core.executor.kill_inference_executor()
+        interpreter = getattr(_app.agent, "interpreter", None)
+        if interpreter is not None:
+            interpreter.close()
+
+    app.register_listener(shutdown_inference_executor, "after_server_stop")
+
+    # noinspection PyUnusedLocal
+    async def close_event_broker(_app: Sanic, _loop: Text) -> None:
+        tracker_store = getattr(_app.agent, "tracker_store", None)
+        event_broker = getattr(tracker_store, "event_broker", None)
+        if event_broker:
+            # closing blocks until the buffered events were published
+            await asyncio.get_event_loop().run_in_executor(None, event_broker.close)
+
+    app.register_listener(close_event_broker, "after_server_stop")
+
     rasa.utils.common.update_sanic_log_level(log_file)
 
+    backlog = int(os.environ.get(ENV_SANIC_BACKLOG, "100"))
+    lock_store = endpoints.lock_store if endpoints else None
+
+    # the command line channel can't be shared by several workers
+    if rasa.core.sharding.is_sharded_routing_enabled() and channel != "cmdline":
+        number_of_workers = rasa.core.utils.number_of_sanic_workers(
+            lock_store, sharded=True
+        )
+        if number_of_workers > 1:
+            rasa.core.sharding.run_sharded(
+                app, port, number_of_workers, ssl=ssl_context, backlog=backlog
+            )
+            return
+
     app.run(
         host="0.0.0.0",
         port=port,
         ssl=ssl_context,
-        backlog=int(os.environ.get(ENV_SANIC_BACKLOG, "100")),
-        workers=rasa.core.utils.number_of_sanic_workers(
-            endpoints.lock_store if endpoints else None
-        ),
+        backlog=backlog,
+        workers=rasa.core.utils.number_of_sanic_workers(lock_store),
     )
 
 
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import socket
+import zlib
+from ssl import SSLContext
+from typing import Any, List, Optional, Text
+from urllib.parse import unquote
+
+import aiohttp
+from sanic import Sanic, response
+from sanic.request import Request
+from sanic.response import HTTPResponse
+
+from rasa.constants import (
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SANIC_WORKER_ROUTING,
+    ENV_SANIC_WORKER_ROUTING,
+)
+
+logger = logging.getLogger(__name__)
+
+SANIC_WORKER_ROUTING_SHARDED = "sharded"
+
+# conversation ID in the paths of the HTTP API
+CONVERSATION_PATH_PATTERN = re.compile(r"^/conversations/([^/]+)")
+
+# headers which only apply to a single connection and can't be forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "content-length",
+    "host",
+    "keep-alive",
+    "transfer-encoding",
+}
+
+HTTP_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+
+# requests which change the model of a worker have to be sent to every worker
+BROADCAST_REQUESTS = {("PUT", "/model"), ("DELETE", "/model")}
+
+
+def is_sharded_routing_enabled() -> bool:
+    """Whether messages are routed to the Sanic workers by their sender ID, as set
+    by the `SANIC_WORKER_ROUTING` environment variable."""
+
+    routing = os.environ.get(ENV_SANIC_WORKER_ROUTING, DEFAULT_SANIC_WORKER_ROUTING)
+    return routing.lower() == SANIC_WORKER_ROUTING_SHARDED
+
+
+def worker_for_sender(sender_id: Text, number_of_workers: int) -> int:
+    """Index of the worker which handles all requests of `sender_id`.
+
+    Uses a hash which is stable across processes (in contrast to `hash`)."""
+
+    return zlib.crc32(sender_id.encode("utf-8")) % number_of_workers
+
+
+def sender_id_of_request(request: Request) -> Optional[Text]:
+    """Find the sender ID of a request to the Rasa server.
+
+    Understands the conversation paths of the HTTP API and channels which send
+    the sender ID as `sender` in a JSON body (e.g. the REST channel). Returns
+    `None` for all other requests."""
+
+    match = CONVERSATION_PATH_PATTERN.match(request.path)
+    if match:
+        return unquote(match.group(1))
+
+    if not request.body:
+        return None
+
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        return None
+
+    if isinstance(body, dict) and body.get("sender") is not None:
+        return str(body["sender"])
+
+    return None
+
+
+def is_broadcast_request(request: Request) -> bool:
+    """Whether `request` changes the model and has to be sent to every worker."""
+
+    return (request.method, request.path.rstrip("/")) in BROADCAST_REQUESTS
+
+
+def create_dispatcher_app(worker_urls: List[Text]) -> Sanic:
+    """Create an app which forwards every request to one of the workers.
+
+    Requests of the same sender are always forwarded to the same worker. Requests
+    without a sender ID are all forwarded to the first worker, so that
+    conversations of channels whose sender ID isn't understood are still handled
+    by a single worker. Requests which load or unload a model are forwarded to
+    all workers, so that they all serve the same model.
+    """
+
+    app = Sanic(__name__, configure_logging=False)
+
+    # noinspection PyUnusedLocal
+    async def create_session(_app: Sanic, _loop: Any) -> None:
+        _app.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT),
+            auto_decompress=False,
+        )
+
+    # noinspection PyUnusedLocal
+    async def close_session(_app: Sanic, _loop: Any) -> None:
+        await _app.session.close()
+
+    app.register_listener(create_session, "before_server_start")
+    app.register_listener(close_session, "after_server_stop")
+
+    # noinspection PyUnusedLocal
+    async def forward(request: Request, path: Text = "") -> HTTPResponse:
+        if is_broadcast_request(request):
+            responses = await asyncio.gather(
+                *[
+                    forward_to_worker(request, worker)
+                    for worker in range(len(worker_urls))
+                ]
+            )
+            # report the first failure, the workers otherwise respond the same
+            return next((r for r in responses if r.status >= 400), responses[0])
+
+        sender_id = sender_id_of_request(request)
+        if sender_id is None:
+            worker = 0
+        else:
+            worker = worker_for_sender(sender_id, len(worker_urls))
+
+        return await forward_to_worker(request, worker)
+
+    async def forward_to_worker(request: Request, worker: int) -> HTTPResponse:
+        url = worker_urls[worker] + request.path
+        if request.query_string:
+            url += "?" + request.query_string
+
+        headers = {
+            name: value
+            for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+
+        try:
+            async with app.session.request(
+                request.method,
+                url,
+                headers=headers,
+                data=request.body,
+                allow_redirects=False,
+            ) as resp:
+                body = await resp.read()
+                response_headers = {
+                    name: value
+                    for name, value in resp.headers.items()
+                    if name.lower() not in HOP_BY_HOP_HEADERS
+                    and name.lower() != "content-type"
+                }
+                return response.raw(
+                    body,
+                    status=resp.status,
+                    headers=response_headers,
+                    content_type=resp.headers.get(
+                        "Content-Type", "application/octet-stream"
+                    ),
+                )
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to forward request to worker {worker}: {e}")
+            return response.json(
+                {"status": "failure", "message": "Worker is not available."},
+                status=502,
+            )
+
+    app.add_route(forward, "/", methods=HTTP_METHODS)
+    app.add_route(forward, "/<path:path>", methods=HTTP_METHODS)
+
+    return app
+
+
+def _bind_worker_socket() -> socket.socket:
+    """Bind a socket for a worker to a free port on the loopback interface."""
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+def _run_worker(app: Sanic, sock: socket.socket, backlog: int) -> None:
+    app.run(sock=sock, backlog=backlog, workers=1)
+
+
+def run_sharded(
+    app: Sanic,
+    port: int,
+    number_of_workers: int,
+    ssl: Optional[SSLContext] = None,
+    backlog: int = 100,
+) -> None:
+    """Run `app` in `number_of_workers` processes behind a dispatcher.
+
+    The dispatcher listens on `port` and forwards the requests of each sender to
+    a fixed worker. Workers therefore never handle the same conversation
+    concurrently, and in-process lock and tracker stores can be used. The
+    workers are forked, so that they inherit the configured `app`.
+    """
+
+    sockets = [_bind_worker_socket() for _ in range(number_of_workers)]
+    worker_urls = [
+        "http://127.0.0.1:{}".format(sock.getsockname()[1]) for sock in sockets
+    ]
+
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_run_worker, args=(app, sock, backlog), daemon=True)
+        for sock in sockets
+    ]
+    for worker in workers:
+        worker.start()
+
+    logger.info(f"Routing messages to {number_of_workers} Sanic workers by sender ID.")
+
+    try:
+        dispatcher = create_dispatcher_app(worker_urls)
+        dispatcher.run(host="0.0.0.0", port=port, ssl=ssl, backlog=backlog)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+        for sock in sockets:
+            sock.close()
@@ -5,19 +5,43 @@ import logging
 import os
 import pickle
 import typing
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 
 # noinspection PyPep8Naming
 from time import sleep
-from typing import Callable, Dict, Iterable, Iterator, List, Optional, Text, Union
-
-from boto3.dynamodb.conditions import Key
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    Union,
+)
+
+from boto3.dynamodb.conditions import Attr, Key
+from rasa.constants import (
+    DEFAULT_TRACKER_CACHE_MAX_BYTES,
+    DEFAULT_TRACKER_CACHE_SIZE,
+    ENV_TRACKER_CACHE_MAX_BYTES,
+    ENV_TRACKER_CACHE_SIZE,
+)
 from rasa.core import utils
 from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.brokers.broker import EventBroker
+from rasa.core.constants import (
+    DEFAULT_STORE_IO_THREADS,
+    DEFAULT_TRACKER_SNAPSHOT_INTERVAL,
+)
 from rasa.core.conversation import Dialogue
 from rasa.core.domain import Domain
-from rasa.core.events import SessionStarted
+from rasa.core.events import Event, SessionStarted, deserialise_events
+from rasa.core.executor import BlockingIOExecutor, int_from_env
 from rasa.core.trackers import ActionExecuted, DialogueStateTracker, EventVerbosity
 from rasa.utils.common import class_from_module_path, raise_warning, arguments_of
 from rasa.utils.endpoints import EndpointConfig
@@ -32,7 +56,15 @@ logger = logging.getLogger(__name__)
 
 
 class TrackerStore:
-    """Class to hold all of the TrackerStore classes"""
+    """Class to hold all of the TrackerStore classes
+
+    The `*_async` methods are used from coroutines. Unless a tracker store
+    overrides them with a native asynchronous implementation, they run the
+    blocking methods in `blocking_io_workers` threads of the tracker store."""
+
+    # tracker stores whose client can be used by several threads at once can use
+    # more threads, `0` runs blocking calls on the event loop
+    blocking_io_workers = 1
 
     def __init__(
         self, domain: Optional[Domain], event_broker: Optional[EventBroker] = None
@@ -40,6 +72,12 @@ class TrackerStore:
         self.domain = domain
         self.event_broker = event_broker
         self.max_event_history = None
+        # tracker stores which support snapshots store the state of a tracker
+        # every `snapshot_interval` events, `0` disables snapshots
+        self.snapshot_interval = DEFAULT_TRACKER_SNAPSHOT_INTERVAL
+        self._io_executor = BlockingIOExecutor(
+            self.blocking_io_workers, thread_name_prefix="rasa-tracker-store"
+        )
 
     @staticmethod
     def create(
@@ -84,12 +122,40 @@ class TrackerStore:
             max_event_history: Value to update the tracker store's max event history to.
             append_action_listen: Whether or not to append an initial `action_listen`.
         """
-        tracker = self.retrieve(sender_id)
         self.max_event_history = max_event_history
+        tracker = self.retrieve(sender_id)
         if tracker is None:
             tracker = self.create_tracker(
                 sender_id, append_action_listen=append_action_listen
             )
+        else:
+            tracker.number_of_persisted_events = len(tracker.events)
+            tracker.number_of_published_events = None
+        return tracker
+
+    async def get_or_create_tracker_async(
+        self,
+        sender_id: Text,
+        max_event_history: Optional[int] = None,
+        append_action_listen: bool = True,
+    ) -> "DialogueStateTracker":
+        """Returns tracker or creates one if the retrieval returns None, without
+        blocking the event loop.
+
+        Args:
+            sender_id: Conversation ID associated with the requested tracker.
+            max_event_history: Value to update the tracker store's max event history to.
+            append_action_listen: Whether or not to append an initial `action_listen`.
+        """
+        self.max_event_history = max_event_history
+        tracker = await self.retrieve_async(sender_id)
+        if tracker is None:
+            tracker = await self.create_tracker_async(
+                sender_id, append_action_listen=append_action_listen
+            )
+        else:
+            tracker.number_of_persisted_events = len(tracker.events)
+            tracker.number_of_published_events = None
         return tracker
 
     def init_tracker(self, sender_id: Text) -> "DialogueStateTracker":
@@ -119,6 +185,9 @@ class TrackerStore:
         tracker = self.init_tracker(sender_id)
 
         if tracker:
+            # none of the events of a new tracker were stored yet
+            tracker.number_of_persisted_events = 0
+
             if append_action_listen:
                 tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
 
@@ -126,32 +195,198 @@ class TrackerStore:
 
         return tracker
 
+    async def create_tracker_async(
+        self, sender_id: Text, append_action_listen: bool = True
+    ) -> DialogueStateTracker:
+        """Creates and saves a new tracker for `sender_id` without blocking the
+        event loop, see `create_tracker`."""
+
+        tracker = self.init_tracker(sender_id)
+
+        if tracker:
+            # none of the events of a new tracker were stored yet
+            tracker.number_of_persisted_events = 0
+
+            if append_action_listen:
+                tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+
+            await self.save_async(tracker)
+
+        return tracker
+
     def save(self, tracker):
         """Save method that will be overridden by specific tracker"""
         raise NotImplementedError()
 
+    async def save_async(self, tracker: DialogueStateTracker) -> None:
+        """Saves `tracker` without blocking the event loop.
+
+        New events are streamed to the event broker from the event loop, as
+        event brokers buffer them (the `PikaEventBroker` even has to be used from
+        the event loop). `save` then only stores the tracker."""
+
+        if self.event_broker:
+            self.stream_events(tracker)
+
+        await self._io_executor.run(self.save, tracker)
+
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         """Retrieve method that will be overridden by specific tracker"""
         raise NotImplementedError()
 
+    async def retrieve_async(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        """Retrieves the tracker for `sender_id` without blocking the event loop."""
+
+        return await self._io_executor.run(self.retrieve, sender_id)
+
     def stream_events(self, tracker: DialogueStateTracker) -> None:
-        """Streams events to a message broker"""
-        offset = self.number_of_existing_events(tracker.sender_id)
+        """Streams events to a message broker.
+
+        Only events which weren't published or stored yet are published. Their
+        offset is tracked on the tracker, so the stored tracker is only retrieved
+        to count its events if the offset is unknown."""
+        offset = tracker.number_of_published_events
+        if offset is None:
+            offset = tracker.number_of_persisted_events
+        if offset is None:
+            offset = self.number_of_existing_events(tracker.sender_id)
+
         events = tracker.events
+        bodies = []
         for event in list(itertools.islice(events, offset, len(events))):
             body = {"sender_id": tracker.sender_id}
             body.update(event.as_dict())
-            self.event_broker.publish(body)
+            bodies.append(body)
+
+        if bodies:
+            self.event_broker.publish_batch(bodies)
+
+        tracker.number_of_published_events = len(events)
+
+    @staticmethod
+    def _additional_events(
+        tracker: DialogueStateTracker, event_count: int, session_start: int
+    ) -> Iterator:
+        """Return events from the tracker which aren't currently stored.
+
+        Args:
+            tracker: Tracker to inspect.
+            event_count: Number of stored events.
+            session_start: Index of the latest stored `SessionStarted` event.
+
+        Returns:
+            Events that aren't currently stored.
+
+        """
+
+        number_of_stored_events = tracker.number_of_persisted_events
+        if number_of_stored_events is None:
+            # the tracker holds the events since the latest session start
+            number_of_stored_events = event_count - session_start
+
+        return itertools.islice(
+            tracker.events, number_of_stored_events, len(tracker.events)
+        )
 
     def number_of_existing_events(self, sender_id: Text) -> int:
         """Return number of stored events for a given sender id."""
         old_tracker = self.retrieve(sender_id)
         return len(old_tracker.events) if old_tracker else 0
 
+    def stored_version(self, sender_id: Text) -> Optional[Any]:
+        """Return a token which changes whenever the stored conversation changes.
+
+        The token has to be cheap to compute compared to retrieving the tracker.
+        It's used by the `CachedTrackerStore` to check whether a cached tracker is
+        still up to date. Returns `None` if the tracker store can't provide such a
+        token or there is no stored conversation for `sender_id`."""
+        return None
+
+    @staticmethod
+    def _new_version() -> Text:
+        """Return a `stored_version` token for a write of a conversation.
+
+        Unlike a counter it can't repeat when the stored conversation expires or
+        is replaced."""
+        return uuid.uuid4().hex
+
+    async def stored_version_async(self, sender_id: Text) -> Optional[Any]:
+        """Returns the `stored_version` of `sender_id` without blocking the event
+        loop."""
+
+        return await self._io_executor.run(self.stored_version, sender_id)
+
     def keys(self) -> Iterable[Text]:
         """Returns the set of values for the tracker store's primary key"""
         raise NotImplementedError()
 
+    @staticmethod
+    def _index_of_latest_session_start(
+        events: Iterable[Dict[Text, Any]], offset: int, default: int
+    ) -> int:
+        """Return the index of the latest `SessionStarted` event in serialised
+        `events`, which are stored after `offset` other events, or `default` if
+        there is none."""
+
+        session_start = default
+        for idx, event in enumerate(events):
+            if event.get("event") == SessionStarted.type_name:
+                session_start = offset + idx
+
+        return session_start
+
+    def _should_take_snapshot(self, number_of_events_to_replay: int) -> bool:
+        """Check whether enough events would have to be replayed to recreate a
+        tracker to store a new snapshot of its state."""
+        return 0 < self.snapshot_interval <= number_of_events_to_replay
+
+    @staticmethod
+    def _serialise_snapshot(tracker: DialogueStateTracker) -> Text:
+        latest_event_time = tracker.events[-1].timestamp if tracker.events else None
+        return json.dumps(
+            {"latest_event_time": latest_event_time, "state": tracker.snapshot()}
+        )
+
+    def _recreate_tracker(
+        self,
+        sender_id: Text,
+        serialised_events: List[Dict[Text, Any]],
+        serialised_snapshot: Optional[Union[Text, bytes]] = None,
+        number_of_events_before_snapshot: int = 0,
+    ) -> DialogueStateTracker:
+        """Recreate a tracker from its serialised events.
+
+        If a snapshot is given, which was taken after the first
+        `number_of_events_before_snapshot` events, only the events after it are
+        replayed. The snapshot is ignored if it doesn't match the events."""
+
+        slots = self.domain.slots if self.domain else None
+
+        snapshot = json.loads(serialised_snapshot) if serialised_snapshot else None
+        if (
+            snapshot is None
+            or not 0 < number_of_events_before_snapshot <= len(serialised_events)
+            or serialised_events[number_of_events_before_snapshot - 1].get("timestamp")
+            != snapshot.get("latest_event_time")
+        ):
+            return DialogueStateTracker.from_dict(
+                sender_id, serialised_events, slots, self.max_event_history
+            )
+
+        logger.debug(
+            f"Recreating tracker for sender id '{sender_id}' from snapshot and "
+            f"{len(serialised_events) - number_of_events_before_snapshot} "
+            f"subsequent events."
+        )
+        return DialogueStateTracker.from_snapshot(
+            sender_id,
+            snapshot["state"],
+            deserialise_events(serialised_events[:number_of_events_before_snapshot]),
+            deserialise_events(serialised_events[number_of_events_before_snapshot:]),
+            slots,
+            self.max_event_history,
+        )
+
     @staticmethod
     def serialise_tracker(tracker: DialogueStateTracker) -> Text:
         """Serializes the tracker, returns representation of the tracker."""
@@ -196,10 +431,15 @@ class TrackerStore:
 class InMemoryTrackerStore(TrackerStore):
     """Stores conversation history in memory"""
 
+    blocking_io_workers = 0
+
     def __init__(
         self, domain: Domain, event_broker: Optional[EventBroker] = None
     ) -> None:
         self.store = {}
+        self.versions = {}
+        # sender id -> (number of events before the snapshot, serialised snapshot)
+        self.snapshots: Dict[Text, Tuple[int, Text]] = {}
         super().__init__(domain, event_broker)
 
     def save(self, tracker: DialogueStateTracker) -> None:
@@ -208,6 +448,22 @@ class InMemoryTrackerStore(TrackerStore):
             self.stream_events(tracker)
         serialised = InMemoryTrackerStore.serialise_tracker(tracker)
         self.store[tracker.sender_id] = serialised
+        self.versions[tracker.sender_id] = self.versions.get(tracker.sender_id, 0) + 1
+
+        number_of_events_at_snapshot, _ = self.snapshots.get(
+            tracker.sender_id, (0, None)
+        )
+        if self._should_take_snapshot(
+            len(tracker.events) - number_of_events_at_snapshot
+        ):
+            self.snapshots[tracker.sender_id] = (
+                len(tracker.events),
+                self._serialise_snapshot(tracker),
+            )
+
+    def stored_version(self, sender_id: Text) -> Optional[int]:
+        """Returns the number of times the tracker for `sender_id` was saved."""
+        return self.versions.get(sender_id)
 
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         """
@@ -217,7 +473,16 @@ class InMemoryTrackerStore(TrackerStore):
         Returns:
             DialogueStateTracker
         """
-        if sender_id in self.store:
+        if sender_id in self.store and sender_id in self.snapshots:
+            number_of_events_before_snapshot, snapshot = self.snapshots[sender_id]
+            dialogue = json.loads(self.store[sender_id])
+            return self._recreate_tracker(
+                sender_id,
+                dialogue["events"],
+                snapshot,
+                number_of_events_before_snapshot,
+            )
+        elif sender_id in self.store:
             logger.debug(f"Recreating tracker for id '{sender_id}'")
             return self.deserialise_tracker(sender_id, self.store[sender_id])
         else:
@@ -230,7 +495,17 @@ class InMemoryTrackerStore(TrackerStore):
 
 
 class RedisTrackerStore(TrackerStore):
-    """Stores conversation history in Redis"""
+    """Stores conversation history in Redis.
+
+    The events of a conversation are stored as a list with one entry per event,
+    so that saving a tracker only appends its new events. A small header hash
+    per conversation keeps the number of stored events, the index of the
+    latest `SessionStarted` event and a periodic snapshot of the tracker state,
+    so that only the events after the snapshot have to be replayed. Trackers
+    which were stored as a single serialised dialogue by previous Rasa versions
+    are migrated to this layout when they are retrieved or saved."""
+
+    blocking_io_workers = DEFAULT_STORE_IO_THREADS
 
     def __init__(
         self,
@@ -242,6 +517,8 @@ class RedisTrackerStore(TrackerStore):
         event_broker: Optional[EventBroker] = None,
         record_exp: Optional[float] = None,
         use_ssl: bool = False,
+        key_prefix: Text = "tracker:",
+        snapshot_interval: int = DEFAULT_TRACKER_SNAPSHOT_INTERVAL,
     ):
         import redis
 
@@ -249,18 +526,237 @@ class RedisTrackerStore(TrackerStore):
             host=host, port=port, db=db, password=password, ssl=use_ssl
         )
         self.record_exp = record_exp
+        self.key_prefix = key_prefix
         super().__init__(domain, event_broker)
+        self.snapshot_interval = snapshot_interval
+        self._legacy_trackers_migrated = False
+
+    def _header_key(self, sender_id: Text) -> Text:
+        return f"{self.key_prefix}header:{sender_id}"
+
+    def _legacy_migration_key(self) -> Text:
+        # set once all trackers of previous Rasa versions were migrated
+        return f"{self.key_prefix}legacy_trackers_migrated"
+
+    def _events_key(self, sender_id: Text) -> Text:
+        return f"{self.key_prefix}events:{sender_id}"
+
+    def _stored_header(self, sender_id: Text) -> Optional[Tuple[int, int, int]]:
+        """Return number of stored events, index of the latest session start and
+        number of events which were stored when the latest snapshot was taken."""
+
+        event_count, session_start, snapshot_index = self.red.hmget(
+            self._header_key(sender_id),
+            "event_count",
+            "session_start",
+            "snapshot_index",
+        )
+        if event_count is None:
+            return None
+
+        return int(event_count), int(session_start or 0), int(snapshot_index or 0)
+
+    def _append_events(
+        self,
+        sender_id: Text,
+        events: List[Dict[Text, Any]],
+        event_count: int,
+        session_start: int,
+        snapshot_index: int = 0,
+        tracker: Optional[DialogueStateTracker] = None,
+        timeout: Optional[float] = None,
+        replaced_key: Optional[Text] = None,
+        replace: bool = False,
+    ) -> None:
+        """Append serialised `events` to the stored events of `sender_id`.
+
+        If `tracker` is given and enough events were stored since the latest
+        snapshot, a new snapshot of its state is stored as well. If `replace` is
+        set, the stored events and header are deleted first. All writes are
+        sent as a single transactional pipeline."""
+
+        session_start = self._index_of_latest_session_start(
+            events, event_count, session_start
+        )
+        new_event_count = event_count + len(events)
+        header = {
+            "event_count": new_event_count,
+            "session_start": session_start,
+            "version": self._new_version(),
+        }
+
+        replay_start = max(snapshot_index, session_start)
+        if tracker is not None and self._should_take_snapshot(
+            new_event_count - replay_start
+        ):
+            header["snapshot_index"] = new_event_count
+            header["snapshot"] = self._serialise_snapshot(tracker)
+
+        pipe = self.red.pipeline()
+        if replace:
+            pipe.delete(self._events_key(sender_id), self._header_key(sender_id))
+        if events:
+            pipe.rpush(self._events_key(sender_id), *[json.dumps(e) for e in events])
+        pipe.hmset(self._header_key(sender_id), header)
+        if timeout:
+            pipe.expire(self._events_key(sender_id), int(timeout))
+            pipe.expire(self._header_key(sender_id), int(timeout))
+        if replaced_key:
+            pipe.delete(replaced_key)
+        pipe.execute()
+
+    def _migrate_legacy_tracker(
+        self, sender_id: Text
+    ) -> Optional[Tuple[int, int, int]]:
+        """Convert a tracker stored as single serialised dialogue under the key
+        `sender_id` to the list based layout.
+
+        Returns:
+            The header of the migrated tracker or `None` if there was nothing
+            to migrate.
+        """
+
+        dialogue = self._legacy_dialogue(sender_id)
+        if dialogue is None:
+            return None
+
+        tracker = self.init_tracker(sender_id)
+        if tracker is None:
+            return None
+        tracker.recreate_from_dialogue(dialogue)
+
+        logger.debug(f"Migrating tracker for conversation ID '{sender_id}'.")
+
+        # the tracker only keeps `max_event_history` events, all of them are stored
+        events = [e.as_dict() for e in dialogue.events]
+        ttl = self.red.ttl(sender_id)
+        self._append_events(
+            sender_id,
+            events,
+            event_count=0,
+            session_start=0,
+            tracker=tracker,
+            timeout=ttl if ttl and ttl > 0 else None,
+            replaced_key=sender_id,
+        )
+
+        return self._stored_header(sender_id)
+
+    def _legacy_dialogue(self, sender_id: Text) -> Optional[Dialogue]:
+        """Return the dialogue which a previous Rasa version stored under the key
+        `sender_id`.
+
+        Keys which hold anything else (e.g. the locks of the `RedisLockStore`,
+        which may share the database) are left alone.
+        """
+
+        if self._all_legacy_trackers_migrated():
+            return None
+
+        if self.red.type(sender_id) != b"string":
+            return None
+
+        stored = self.red.get(sender_id)
+        try:
+            parameters = json.loads(stored)
+        except UnicodeDecodeError:
+            try:
+                dialogue = self._deserialise_dialogue_from_pickle(sender_id, stored)
+            except Exception:
+                return None
+            if isinstance(dialogue, Dialogue) and dialogue.name == sender_id:
+                return dialogue
+            return None
+        except ValueError:
+            return None
+
+        if (
+            not isinstance(parameters, dict)
+            or parameters.get("name") != sender_id
+            or not isinstance(parameters.get("events"), list)
+        ):
+            return None
+
+        try:
+            return Dialogue.from_parameters(parameters)
+        except Exception:
+            return None
+
+    def _all_legacy_trackers_migrated(self) -> bool:
+        if not self._legacy_trackers_migrated:
+            self._legacy_trackers_migrated = bool(
+                self.red.exists(self._legacy_migration_key())
+            )
+        return self._legacy_trackers_migrated
+
+    def _migrate_legacy_trackers(self) -> None:
+        """Migrate all trackers which previous Rasa versions stored with their
+        sender id as key and mark the migration as done."""
+
+        for key in self.red.scan_iter():
+            try:
+                key = key.decode()
+            except UnicodeDecodeError:
+                continue
+
+            if not key.startswith(self.key_prefix):
+                self._migrate_legacy_tracker(key)
+
+        self.red.set(self._legacy_migration_key(), 1)
+        self._legacy_trackers_migrated = True
 
     def save(self, tracker, timeout=None):
         """Saves the current conversation state"""
         if self.event_broker:
             self.stream_events(tracker)
 
+        self._save(tracker, timeout)
+
+    async def save_async(self, tracker: DialogueStateTracker) -> None:
+        if self.event_broker:
+            self.stream_events(tracker)
+
+        await self._io_executor.run(self._save, tracker)
+
+    def _save(
+        self, tracker: DialogueStateTracker, timeout: Optional[float] = None
+    ) -> None:
         if not timeout and self.record_exp:
             timeout = self.record_exp
 
-        serialised_tracker = self.serialise_tracker(tracker)
-        self.red.set(tracker.sender_id, serialised_tracker, ex=timeout)
+        # trackers which weren't handed out by the tracker store (e.g. ones
+        # created from a list of events) replace the stored conversation
+        replace = tracker.number_of_persisted_events is None
+        if replace:
+            header = None
+        else:
+            header = self._stored_header(tracker.sender_id)
+            if header is None:
+                header = self._migrate_legacy_tracker(tracker.sender_id)
+
+        event_count, session_start, snapshot_index = header or (0, 0, 0)
+        new_events = [
+            e.as_dict()
+            for e in self._additional_events(tracker, event_count, session_start)
+        ]
+
+        if replace and self._legacy_dialogue(tracker.sender_id) is not None:
+            replaced_key = tracker.sender_id
+        else:
+            replaced_key = None
+
+        self._append_events(
+            tracker.sender_id,
+            new_events,
+            event_count,
+            session_start,
+            snapshot_index,
+            tracker,
+            timeout,
+            replaced_key=replaced_key,
+            replace=replace,
+        )
+        tracker.number_of_persisted_events = len(tracker.events)
 
     def retrieve(self, sender_id):
         """
@@ -270,19 +766,69 @@ class RedisTrackerStore(TrackerStore):
         Returns:
             DialogueStateTracker
         """
-        stored = self.red.get(sender_id)
-        if stored is not None:
-            return self.deserialise_tracker(sender_id, stored)
-        else:
+        header = self._stored_header(sender_id)
+        if header is None:
+            header = self._migrate_legacy_tracker(sender_id)
+        if header is None:
             return None
 
+        _, session_start, snapshot_index = header
+
+        pipe = self.red.pipeline()
+        pipe.lrange(self._events_key(sender_id), session_start, -1)
+        if snapshot_index > session_start:
+            pipe.hget(self._header_key(sender_id), "snapshot")
+        stored_events, *snapshot = pipe.execute()
+
+        events = [json.loads(event) for event in stored_events]
+        tracker = self._recreate_tracker(
+            sender_id,
+            events,
+            snapshot[0] if snapshot else None,
+            snapshot_index - session_start,
+        )
+        # the tracker only holds the events since the latest session start,
+        # saving it has to append to the stored events instead of replacing them
+        tracker.number_of_persisted_events = len(tracker.events)
+        return tracker
+
+    def stored_version(self, sender_id: Text) -> Optional[Text]:
+        """Returns the token of the latest write of the tracker for `sender_id`."""
+        version = self.red.hget(self._header_key(sender_id), "version")
+        return version.decode() if version is not None else None
+
     def keys(self) -> Iterable[Text]:
         """Returns keys of the Redis Tracker Store"""
-        return self.red.keys()
+        if not self._all_legacy_trackers_migrated():
+            self._migrate_legacy_trackers()
+
+        header_prefix = self._header_key("")
+        return [
+            key.decode()[len(header_prefix) :]
+            for key in self.red.scan_iter(match=header_prefix + "*")
+        ]
 
 
 class DynamoTrackerStore(TrackerStore):
-    """Stores conversation history in DynamoDB"""
+    """Stores conversation history in DynamoDB
+
+    Every event is stored as an item with the conversation ID as partition key
+    and the index of the event as sort key (`sequence`), so that long
+    conversations don't run into the maximum item size and saving a tracker
+    only writes its new events. A header item per conversation keeps the number
+    of stored events and the index of the latest `SessionStarted` event.
+
+    Tables which were created by previous Rasa versions (with `session_date` as
+    sort key) store the whole conversation as one item and keep being used that
+    way.
+    """
+
+    # boto3 resources must not be shared by several threads
+    blocking_io_workers = 1
+
+    # sort key of the header item of a conversation
+    HEADER_SEQUENCE = -1
+    LEGACY_SORT_KEY = "session_date"
 
     def __init__(
         self,
@@ -290,6 +836,7 @@ class DynamoTrackerStore(TrackerStore):
         table_name: Text = "states",
         region: Text = "us-east-1",
         event_broker: Optional[EndpointConfig] = None,
+        endpoint_url: Optional[Text] = None,
     ):
         """
         Args:
@@ -297,13 +844,27 @@ class DynamoTrackerStore(TrackerStore):
             table_name: The name of the DynamoDb table, does not
                 need to be present a priori.
             event_broker:
+            endpoint_url: URL of the DynamoDB endpoint, e.g. of a local DynamoDB.
+                The endpoint of `region` is used if it's not set.
         """
         import boto3
 
-        self.client = boto3.client("dynamodb", region_name=region)
+        self.client = boto3.client(
+            "dynamodb", region_name=region, endpoint_url=endpoint_url
+        )
         self.region = region
+        self.endpoint_url = endpoint_url
         self.table_name = table_name
         self.db = self.get_or_create_table(table_name)
+        self.is_legacy_table = any(
+            key["AttributeName"] == self.LEGACY_SORT_KEY for key in self.db.key_schema
+        )
+        if self.is_legacy_table:
+            logger.warning(
+                f"DynamoDB table '{table_name}' stores every conversation as a "
+                f"single item, which limits the length of conversations. Use a new "
+                f"table to store every event as a separate item."
+            )
         super().__init__(domain, event_broker)
 
     def get_or_create_table(
@@ -312,17 +873,19 @@ class DynamoTrackerStore(TrackerStore):
         """Returns table or creates one if the table name is not in the table list"""
         import boto3
 
-        dynamo = boto3.resource("dynamodb", region_name=self.region)
+        dynamo = boto3.resource(
+            "dynamodb", region_name=self.region, endpoint_url=self.endpoint_url
+        )
         if self.table_name not in self.client.list_tables()["TableNames"]:
             table = dynamo.create_table(
                 TableName=self.table_name,
                 KeySchema=[
                     {"AttributeName": "sender_id", "KeyType": "HASH"},
-                    {"AttributeName": "session_date", "KeyType": "RANGE"},
+                    {"AttributeName": "sequence", "KeyType": "RANGE"},
                 ],
                 AttributeDefinitions=[
                     {"AttributeName": "sender_id", "AttributeType": "S"},
-                    {"AttributeName": "session_date", "AttributeType": "N"},
+                    {"AttributeName": "sequence", "AttributeType": "N"},
                 ],
                 ProvisionedThroughput={"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
             )
@@ -335,7 +898,77 @@ class DynamoTrackerStore(TrackerStore):
         """Saves the current conversation state"""
         if self.event_broker:
             self.stream_events(tracker)
-        self.db.put_item(Item=self.serialise_tracker(tracker))
+
+        if self.is_legacy_table:
+            self.db.put_item(Item=self.serialise_tracker(tracker))
+            return
+
+        # trackers which weren't handed out by the tracker store (e.g. ones
+        # created from a list of events) replace the stored conversation
+        replace = tracker.number_of_persisted_events is None
+        if replace:
+            header = None
+        else:
+            header = self._stored_header(tracker.sender_id)
+
+        event_count, session_start = header or (0, 0)
+        new_events = [
+            e.as_dict()
+            for e in self._additional_events(tracker, event_count, session_start)
+        ]
+        if header is not None and not new_events:
+            tracker.number_of_persisted_events = len(tracker.events)
+            return
+
+        # `batch_writer` sends `BatchWriteItem` requests of up to 25 items and
+        # resends unprocessed items
+        with self.db.batch_writer() as batch:
+            for sequence, event in enumerate(new_events, start=event_count):
+                batch.put_item(
+                    Item={
+                        "sender_id": tracker.sender_id,
+                        "sequence": sequence,
+                        "event": json.dumps(event),
+                    }
+                )
+
+        # the header is written last, so that it never counts missing events
+        self.db.put_item(
+            Item={
+                "sender_id": tracker.sender_id,
+                "sequence": self.HEADER_SEQUENCE,
+                "event_count": event_count + len(new_events),
+                "session_start": self._index_of_latest_session_start(
+                    new_events, event_count, session_start
+                ),
+                "version": self._new_version(),
+            }
+        )
+
+        if replace:
+            # events of the replaced conversation are beyond the new event count,
+            # so they are already ignored when the conversation is retrieved
+            self._delete_events(tracker.sender_id, start=len(new_events))
+
+        tracker.number_of_persisted_events = len(tracker.events)
+
+    def _delete_events(self, sender_id: Text, start: int) -> None:
+        """Delete the stored events of `sender_id` from index `start` on."""
+
+        items = self._paginate(
+            self.db.query,
+            KeyConditionExpression=(
+                Key("sender_id").eq(sender_id) & Key("sequence").gte(start)
+            ),
+            ProjectionExpression="#sequence",
+            ExpressionAttributeNames={"#sequence": "sequence"},
+            ConsistentRead=True,
+        )
+        with self.db.batch_writer() as batch:
+            for item in items:
+                batch.delete_item(
+                    Key={"sender_id": sender_id, "sequence": item["sequence"]}
+                )
 
     def serialise_tracker(self, tracker: "DialogueStateTracker") -> Dict:
         """Serializes the tracker, returns object with decimal types"""
@@ -348,9 +981,78 @@ class DynamoTrackerStore(TrackerStore):
         )
         return utils.replace_floats_with_decimals(d)
 
+    def _stored_header(self, sender_id: Text) -> Optional[Tuple[int, int]]:
+        """Return number of stored events and index of the latest session start."""
+
+        header = self.db.get_item(
+            Key={"sender_id": sender_id, "sequence": self.HEADER_SEQUENCE},
+            ConsistentRead=True,
+        ).get("Item")
+        if header is None:
+            return None
+
+        return int(header["event_count"]), int(header["session_start"])
+
+    def stored_version(self, sender_id: Text) -> Optional[Text]:
+        """Returns the token of the latest write of the tracker for `sender_id`."""
+
+        if self.is_legacy_table:
+            return None
+
+        header = self.db.get_item(
+            Key={"sender_id": sender_id, "sequence": self.HEADER_SEQUENCE},
+            ProjectionExpression="#version",
+            ExpressionAttributeNames={"#version": "version"},
+            ConsistentRead=True,
+        ).get("Item")
+        return header.get("version") if header else None
+
+    def _paginate(self, operation: Callable[..., Dict], **kwargs: Any) -> Iterator:
+        """Yield the items of all result pages of a `query` or `scan`."""
+
+        while True:
+            response = operation(**kwargs)
+            yield from response["Items"]
+
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         """Create a tracker from all previously stored events."""
 
+        if self.is_legacy_table:
+            return self._retrieve_legacy_tracker(sender_id)
+
+        header = self._stored_header(sender_id)
+        if header is None:
+            return None
+
+        event_count, session_start = header
+        if event_count == session_start:
+            events = []
+        else:
+            # items beyond the event count belong to a conversation which is
+            # currently being replaced
+            items = self._paginate(
+                self.db.query,
+                KeyConditionExpression=(
+                    Key("sender_id").eq(sender_id)
+                    & Key("sequence").between(session_start, event_count - 1)
+                ),
+                ProjectionExpression="#event",
+                ExpressionAttributeNames={"#event": "event"},
+                ConsistentRead=True,
+            )
+            events = [json.loads(item["event"]) for item in items]
+
+        return DialogueStateTracker.from_dict(
+            sender_id, events, self.domain.slots, self.max_event_history
+        )
+
+    def _retrieve_legacy_tracker(
+        self, sender_id: Text
+    ) -> Optional[DialogueStateTracker]:
         # Retrieve dialogues for a sender_id in reverse chronological order based on
         # the session_date sort key
         dialogues = self.db.query(
@@ -360,27 +1062,53 @@ class DynamoTrackerStore(TrackerStore):
         )["Items"]
         if dialogues:
             return DialogueStateTracker.from_dict(
-                sender_id, dialogues[0].get("events"), self.domain.slots
+                sender_id,
+                dialogues[0].get("events"),
+                self.domain.slots,
+                self.max_event_history,
             )
         else:
             return None
 
     def keys(self) -> Iterable[Text]:
-        """Returns sender_ids of the DynamoTrackerStore"""
-        return [
-            i["sender_id"]
-            for i in self.db.scan(ProjectionExpression="sender_id")["Items"]
-        ]
+        """Returns sender_ids of the DynamoTrackerStore
+
+        The table is scanned one page at a time while the sender_ids are
+        consumed."""
+
+        if self.is_legacy_table:
+            seen = set()
+            for item in self._paginate(self.db.scan, ProjectionExpression="sender_id"):
+                if item["sender_id"] not in seen:
+                    seen.add(item["sender_id"])
+                    yield item["sender_id"]
+            return
+
+        for item in self._paginate(
+            self.db.scan,
+            ProjectionExpression="sender_id",
+            FilterExpression=Attr("sequence").eq(self.HEADER_SEQUENCE),
+        ):
+            yield item["sender_id"]
 
 
 class MongoTrackerStore(TrackerStore):
     """
     Stores conversation history in Mongo
 
+    Every conversation document keeps the number of stored events and the index
+    of the latest `SessionStarted` event, so that saving a tracker only has to
+    push its new events. The events are stored in the conversation document
+    itself or, if `events_collection` is set, in buckets of `events_per_bucket`
+    events in that collection. Conversations which were stored by previous Rasa
+    versions are migrated when they are retrieved or saved.
+
     Property methods:
         conversations: returns the current conversation
     """
 
+    blocking_io_workers = DEFAULT_STORE_IO_THREADS
+
     def __init__(
         self,
         domain: Domain,
@@ -391,6 +1119,8 @@ class MongoTrackerStore(TrackerStore):
         auth_source: Optional[Text] = "admin",
         collection: Optional[Text] = "conversations",
         event_broker: Optional[EventBroker] = None,
+        events_collection: Optional[Text] = None,
+        events_per_bucket: int = 100,
     ):
         from pymongo.database import Database
         from pymongo import MongoClient
@@ -406,6 +1136,8 @@ class MongoTrackerStore(TrackerStore):
 
         self.db = Database(self.client, db)
         self.collection = collection
+        self.events_collection = events_collection
+        self.events_per_bucket = events_per_bucket
         super().__init__(domain, event_broker)
 
         self._ensure_indices()
@@ -415,15 +1147,25 @@ class MongoTrackerStore(TrackerStore):
         """Returns the current conversation"""
         return self.db[self.collection]
 
+    @property
+    def event_buckets(self):
+        """Returns the collection which stores the events in buckets"""
+        return self.db[self.events_collection]
+
     def _ensure_indices(self):
         """Create an index on the sender_id"""
         self.conversations.create_index("sender_id")
 
+        if self.events_collection:
+            self.event_buckets.create_index(
+                [("sender_id", 1), ("bucket", 1)], unique=True
+            )
+
     @staticmethod
     def _current_tracker_state_without_events(tracker: DialogueStateTracker) -> Dict:
-        # get current tracker state and remove `events` key from state
-        # since events are pushed separately in the `update_one()` operation
-        state = tracker.current_state(EventVerbosity.ALL)
+        # get current tracker state without serialising its events, since events
+        # are pushed separately in the `update_one()` operation
+        state = tracker.current_state(EventVerbosity.NONE)
         state.pop("events", None)
 
         return state
@@ -433,59 +1175,124 @@ class MongoTrackerStore(TrackerStore):
         if self.event_broker:
             self.stream_events(tracker)
 
-        additional_events = self._additional_events(tracker)
+        event_count, session_start = self._stored_header(tracker.sender_id) or (0, 0)
+        additional_events = [
+            e.as_dict()
+            for e in self._additional_events(tracker, event_count, session_start)
+        ]
 
-        self.conversations.update_one(
-            {"sender_id": tracker.sender_id},
-            {
-                "$set": self._current_tracker_state_without_events(tracker),
-                "$push": {
-                    "events": {"$each": [e.as_dict() for e in additional_events]}
-                },
-            },
-            upsert=True,
+        state = self._current_tracker_state_without_events(tracker)
+        state["event_count"] = event_count + len(additional_events)
+        state["session_start"] = self._index_of_latest_session_start(
+            additional_events, event_count, session_start
         )
+        state["version"] = self._new_version()
 
-    def _additional_events(self, tracker: DialogueStateTracker) -> Iterator:
-        """Return events from the tracker which aren't currently stored.
+        if self.events_collection:
+            self._push_to_buckets(tracker.sender_id, additional_events, event_count)
+            update = {"$set": state}
+        else:
+            update = {
+                "$set": state,
+                "$push": {"events": {"$each": additional_events}},
+            }
 
-        Args:
-            tracker: Tracker to inspect.
+        self.conversations.update_one(
+            {"sender_id": tracker.sender_id}, update, upsert=True
+        )
+        tracker.number_of_persisted_events = len(tracker.events)
 
-        Returns:
-            List of serialised events that aren't currently stored.
+    def _stored_header(self, sender_id: Text) -> Optional[Tuple[int, int]]:
+        """Return number of stored events and index of the latest session start.
 
+        Only these fields of the conversation document are read. The header is
+        computed from the stored event types for conversations which were stored
+        without it, and events which are stored in the conversation document are
+        moved to buckets if `events_collection` is set.
         """
 
-        stored = self.conversations.find_one({"sender_id": tracker.sender_id}) or {}
-        number_events_since_last_session = len(
-            self._events_since_last_session_start(stored)
-        )
+        projection = {"event_count": True, "session_start": True}
+        if self.events_collection:
+            # `events` is only part of the result if the document has events
+            projection["events"] = {"$slice": 0}
 
-        return itertools.islice(
-            tracker.events, number_events_since_last_session, len(tracker.events)
-        )
+        stored = self.conversations.find_one({"sender_id": sender_id}, projection)
+        if stored is None:
+            return None
 
-    @staticmethod
-    def _events_since_last_session_start(serialised_tracker: Dict) -> List[Dict]:
-        """Retrieve events since and including the latest `SessionStart` event.
+        if self.events_collection and "events" in stored:
+            return self._move_events_to_buckets(sender_id)
 
-        Args:
-            serialised_tracker: Serialised tracker to inspect.
+        if "event_count" not in stored:
+            stored = self.conversations.find_one(
+                {"sender_id": sender_id}, {"events.event": True}
+            )
+            events = stored.get("events", [])
+            return len(events), self._index_of_latest_session_start(events, 0, 0)
 
-        Returns:
-            List of serialised events since and including the latest `SessionStarted`
-            event. Returns all events if no such event is found.
+        return stored["event_count"], stored.get("session_start", 0)
 
-        """
+    def _push_to_buckets(
+        self, sender_id: Text, events: List[Dict[Text, Any]], event_count: int
+    ) -> None:
+        """Append serialised `events` to the buckets of `sender_id` which already
+        hold `event_count` events."""
+
+        from pymongo import UpdateOne
+
+        requests = []
+        numbered_events = enumerate(events, start=event_count)
+        for bucket, bucket_events in itertools.groupby(
+            numbered_events, key=lambda e: e[0] // self.events_per_bucket
+        ):
+            requests.append(
+                UpdateOne(
+                    {"sender_id": sender_id, "bucket": bucket},
+                    {"$push": {"events": {"$each": [e for _, e in bucket_events]}}},
+                    upsert=True,
+                )
+            )
+
+        if requests:
+            self.event_buckets.bulk_write(requests)
+
+    def _events_from_buckets(
+        self, sender_id: Text, start: int
+    ) -> List[Dict[Text, Any]]:
+        """Retrieve the serialised events of `sender_id` from index `start` on."""
+
+        first_bucket = start // self.events_per_bucket
+        buckets = self.event_buckets.find(
+            {"sender_id": sender_id, "bucket": {"$gte": first_bucket}},
+            {"events": True},
+        ).sort("bucket", 1)
 
         events = []
-        for event in reversed(serialised_tracker.get("events", [])):
-            events.append(event)
-            if event["event"] == SessionStarted.type_name:
-                break
+        for bucket in buckets:
+            events.extend(bucket["events"])
+
+        return events[start - first_bucket * self.events_per_bucket :]
+
+    def _move_events_to_buckets(self, sender_id: Text) -> Tuple[int, int]:
+        """Move the events which are stored in the conversation document of
+        `sender_id` to the buckets in `events_collection`."""
+
+        logger.debug(f"Moving events of conversation ID '{sender_id}' to buckets.")
 
-        return list(reversed(events))
+        stored = self.conversations.find_one({"sender_id": sender_id}, {"events": True})
+        events = stored.get("events", [])
+        header = len(events), self._index_of_latest_session_start(events, 0, 0)
+
+        self._push_to_buckets(sender_id, events, 0)
+        self.conversations.update_one(
+            {"sender_id": sender_id},
+            {
+                "$set": {"event_count": header[0], "session_start": header[1]},
+                "$unset": {"events": ""},
+            },
+        )
+
+        return header
 
     def retrieve(self, sender_id):
         """
@@ -495,32 +1302,62 @@ class MongoTrackerStore(TrackerStore):
         Returns:
             `DialogueStateTracker`
         """
-        stored = self.conversations.find_one({"sender_id": sender_id})
+        header = self._stored_header(sender_id)
 
         # look for conversations which have used an `int` sender_id in the past
         # and update them.
-        if stored is None and sender_id.isdigit():
-            from pymongo import ReturnDocument
-
-            stored = self.conversations.find_one_and_update(
-                {"sender_id": int(sender_id)},
-                {"$set": {"sender_id": str(sender_id)}},
-                return_document=ReturnDocument.AFTER,
+        if header is None and sender_id.isdigit():
+            result = self.conversations.update_one(
+                {"sender_id": int(sender_id)}, {"$set": {"sender_id": str(sender_id)}}
             )
+            if result.matched_count:
+                header = self._stored_header(sender_id)
 
-        if stored is not None:
-            events = self._events_since_last_session_start(stored)
-            return DialogueStateTracker.from_dict(sender_id, events, self.domain.slots)
-        else:
+        if header is None:
             return None
 
+        event_count, session_start = header
+        if self.events_collection:
+            events = self._events_from_buckets(sender_id, session_start)
+        elif event_count > session_start:
+            stored = self.conversations.find_one(
+                {"sender_id": sender_id},
+                {"events": {"$slice": [session_start, event_count - session_start]}},
+            )
+            events = stored.get("events", [])
+        else:
+            events = []
+
+        return DialogueStateTracker.from_dict(
+            sender_id, events, self.domain.slots, self.max_event_history
+        )
+
+    def stored_version(self, sender_id: Text) -> Optional[Text]:
+        """Returns the token of the latest write of the tracker for `sender_id`."""
+        stored = self.conversations.find_one(
+            {"sender_id": sender_id}, {"version": True}
+        )
+        return stored.get("version") if stored else None
+
     def keys(self) -> Iterable[Text]:
         """Returns sender_ids of the Mongo Tracker Store"""
-        return [c["sender_id"] for c in self.conversations.find()]
+        return [
+            c["sender_id"] for c in self.conversations.find({}, {"sender_id": True})
+        ]
 
 
 class SQLTrackerStore(TrackerStore):
-    """Store which can save and retrieve trackers from an SQL database."""
+    """Store which can save and retrieve trackers from an SQL database.
+
+    Every event is stored as a row of the `events` table. A row per conversation
+    in the `conversations` table keeps the number of stored events and where the
+    latest session started, so that saving a tracker only has to insert its new
+    events and retrieving it only reads the events of the latest session.
+    Conversations which were stored by previous Rasa versions get this row when
+    they are saved the next time."""
+
+    # every call uses its own session, sessions share a pool of connections
+    blocking_io_workers = DEFAULT_STORE_IO_THREADS
 
     from sqlalchemy.ext.declarative import declarative_base
 
@@ -529,18 +1366,39 @@ class SQLTrackerStore(TrackerStore):
     class SQLEvent(Base):
         """Represents an event in the SQL Tracker Store"""
 
-        from sqlalchemy import Column, Integer, String, Float, Text
+        from sqlalchemy import Column, Index, Integer, String, Float, Text
 
         __tablename__ = "events"
+        __table_args__ = (
+            Index("ix_events_sender_id_timestamp", "sender_id", "timestamp"),
+            Index("ix_events_sender_id_type_name", "sender_id", "type_name"),
+        )
 
         id = Column(Integer, primary_key=True)
-        sender_id = Column(String(255), nullable=False, index=True)
+        sender_id = Column(String(255), nullable=False)
         type_name = Column(String(255), nullable=False)
         timestamp = Column(Float)
         intent_name = Column(String(255))
         action_name = Column(String(255))
         data = Column(Text)
 
+    class SQLConversation(Base):
+        """Represents the stored events of a conversation in the SQL Tracker
+        Store"""
+
+        from sqlalchemy import Column, Integer, String, Float
+
+        __tablename__ = "conversations"
+
+        sender_id = Column(String(255), primary_key=True)
+        # number of stored events
+        event_count = Column(Integer, nullable=False)
+        # number of events which were stored before the latest `SessionStarted`
+        session_start = Column(Integer, nullable=False)
+        session_start_timestamp = Column(Float)
+        # token of the latest write, see `stored_version`
+        version = Column(String(32))
+
     def __init__(
         self,
         domain: Optional[Domain] = None,
@@ -553,6 +1411,7 @@ class SQLTrackerStore(TrackerStore):
         event_broker: Optional[EventBroker] = None,
         login_db: Optional[Text] = None,
         query: Optional[Dict] = None,
+        retrieve_batch_size: int = 1000,
     ) -> None:
         from sqlalchemy.orm import sessionmaker
         from sqlalchemy import create_engine
@@ -586,6 +1445,7 @@ class SQLTrackerStore(TrackerStore):
 
                 try:
                     self.Base.metadata.create_all(self.engine)
+                    self._create_missing_indexes()
                 except (
                     sqlalchemy.exc.OperationalError,
                     sqlalchemy.exc.ProgrammingError,
@@ -607,6 +1467,9 @@ class SQLTrackerStore(TrackerStore):
 
         logger.debug(f"Connection to SQL database '{db}' successful.")
 
+        # number of rows which are fetched at once when retrieving a tracker
+        self.retrieve_batch_size = retrieve_batch_size
+
         super().__init__(domain, event_broker)
 
     @staticmethod
@@ -695,6 +1558,21 @@ class SQLTrackerStore(TrackerStore):
         cursor.close()
         conn.close()
 
+    def _create_missing_indexes(self) -> None:
+        """Create indexes of the `events` table which were added after the table
+        was created by a previous Rasa version."""
+
+        import sqlalchemy as sa
+
+        table = self.SQLEvent.__table__
+        existing = {
+            index["name"] for index in sa.inspect(self.engine).get_indexes(table.name)
+        }
+        for index in table.indexes:
+            if index.name not in existing:
+                logger.debug(f"Creating index '{index.name}' on '{table.name}'.")
+                index.create(self.engine)
+
     @contextlib.contextmanager
     def session_scope(self):
         """Provide a transactional scope around a series of operations."""
@@ -710,19 +1588,86 @@ class SQLTrackerStore(TrackerStore):
             sender_ids = session.query(self.SQLEvent.sender_id).distinct().all()
             return [sender_id for (sender_id,) in sender_ids]
 
-    def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
-        """Create a tracker from all previously stored events."""
+    def _conversation(
+        self, session: "Session", sender_id: Text
+    ) -> Optional["SQLTrackerStore.SQLConversation"]:
+        """Return the stored event counter of `sender_id`.
+
+        For conversations which were stored without counter it's computed from
+        the stored events. It's only persisted if the session is committed."""
+
+        import sqlalchemy as sa
+
+        conversation = session.query(self.SQLConversation).get(sender_id)
+        if conversation is not None:
+            return conversation
+
+        event_count = (
+            session.query(sa.func.count(self.SQLEvent.id))
+            .filter(self.SQLEvent.sender_id == sender_id)
+            .scalar()
+        )
+        if not event_count:
+            return None
+
+        session_start_timestamp = (
+            session.query(sa.func.max(self.SQLEvent.timestamp))
+            .filter(
+                self.SQLEvent.sender_id == sender_id,
+                self.SQLEvent.type_name == SessionStarted.type_name,
+            )
+            .scalar()
+        )
+        session_start = 0
+        if session_start_timestamp is not None:
+            session_start = (
+                session.query(sa.func.count(self.SQLEvent.id))
+                .filter(
+                    self.SQLEvent.sender_id == sender_id,
+                    self.SQLEvent.timestamp < session_start_timestamp,
+                )
+                .scalar()
+            )
+
+        # noinspection PyArgumentList
+        conversation = self.SQLConversation(
+            sender_id=sender_id,
+            event_count=event_count,
+            session_start=session_start,
+            session_start_timestamp=session_start_timestamp,
+        )
+        session.add(conversation)
+        return conversation
+
+    def stored_version(self, sender_id: Text) -> Optional[Text]:
+        """Returns the token of the latest write of the tracker for `sender_id`."""
 
         with self.session_scope() as session:
+            return (
+                session.query(self.SQLConversation.version)
+                .filter(self.SQLConversation.sender_id == sender_id)
+                .scalar()
+            )
 
-            serialised_events = self._event_query(session, sender_id).all()
+    def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        """Create a tracker from all previously stored events."""
 
-            events = [json.loads(event.data) for event in serialised_events]
+        with self.session_scope() as session:
+            conversation = self._conversation(session, sender_id)
+
+            events = []
+            if conversation is not None:
+                events = [
+                    json.loads(data)
+                    for (data,) in self._event_query(
+                        session, sender_id, conversation.session_start_timestamp
+                    )
+                ]
 
             if self.domain and len(events) > 0:
                 logger.debug(f"Recreating tracker from sender id '{sender_id}'")
                 return DialogueStateTracker.from_dict(
-                    sender_id, events, self.domain.slots
+                    sender_id, events, self.domain.slots, self.max_event_history
                 )
             else:
                 logger.debug(
@@ -732,40 +1677,35 @@ class SQLTrackerStore(TrackerStore):
                 )
                 return None
 
-    def _event_query(self, session: "Session", sender_id: Text) -> "Query":
+    def _event_query(
+        self,
+        session: "Session",
+        sender_id: Text,
+        session_start_timestamp: Optional[float] = None,
+    ) -> "Query":
         """Provide the query to retrieve the conversation events for a specific sender.
 
+        The serialised events are streamed from the database in batches of
+        `retrieve_batch_size` rows.
+
         Args:
             session: Current database session.
             sender_id: Sender id whose conversation events should be retrieved.
+            session_start_timestamp: Timestamp of the latest `SessionStarted` event.
+                All events are retrieved if it's `None`.
 
         Returns:
             Query to get the conversation events.
         """
-        import sqlalchemy as sa
 
-        # Subquery to find the timestamp of the latest `SessionStarted` event
-        session_start_sub_query = (
-            session.query(sa.func.max(self.SQLEvent.timestamp).label("session_start"))
-            .filter(
-                self.SQLEvent.sender_id == sender_id,
-                self.SQLEvent.type_name == SessionStarted.type_name,
-            )
-            .subquery()
+        query = session.query(self.SQLEvent.data).filter(
+            self.SQLEvent.sender_id == sender_id
         )
+        if session_start_timestamp is not None:
+            query = query.filter(self.SQLEvent.timestamp >= session_start_timestamp)
 
-        return (
-            session.query(self.SQLEvent)
-            .filter(
-                self.SQLEvent.sender_id == sender_id,
-                # Find events after the latest `SessionStarted` event or return all
-                # events
-                sa.or_(
-                    self.SQLEvent.timestamp >= session_start_sub_query.c.session_start,
-                    session_start_sub_query.c.session_start.is_(None),
-                ),
-            )
-            .order_by(self.SQLEvent.timestamp)
+        return query.order_by(self.SQLEvent.timestamp).yield_per(
+            self.retrieve_batch_size
         )
 
     def save(self, tracker: DialogueStateTracker) -> None:
@@ -775,41 +1715,49 @@ class SQLTrackerStore(TrackerStore):
             self.stream_events(tracker)
 
         with self.session_scope() as session:
-            # only store recent events
-            events = self._additional_events(session, tracker)
+            conversation = self._conversation(session, tracker.sender_id)
+            if conversation is None:
+                # noinspection PyArgumentList
+                conversation = self.SQLConversation(
+                    sender_id=tracker.sender_id, event_count=0, session_start=0
+                )
+                session.add(conversation)
 
-            for event in events:
+            rows = []
+            for event in self._additional_events(
+                tracker, conversation.event_count, conversation.session_start
+            ):
                 data = event.as_dict()
-                intent = data.get("parse_data", {}).get("intent", {}).get("name")
-                action = data.get("name")
                 timestamp = data.get("timestamp")
 
-                # noinspection PyArgumentList
-                session.add(
-                    self.SQLEvent(
-                        sender_id=tracker.sender_id,
-                        type_name=event.type_name,
-                        timestamp=timestamp,
-                        intent_name=intent,
-                        action_name=action,
-                        data=json.dumps(data),
-                    )
+                if event.type_name == SessionStarted.type_name:
+                    conversation.session_start = conversation.event_count + len(rows)
+                    conversation.session_start_timestamp = timestamp
+
+                rows.append(
+                    {
+                        "sender_id": tracker.sender_id,
+                        "type_name": event.type_name,
+                        "timestamp": timestamp,
+                        "intent_name": data.get("parse_data", {})
+                        .get("intent", {})
+                        .get("name"),
+                        "action_name": data.get("name"),
+                        "data": json.dumps(data),
+                    }
                 )
-            session.commit()
 
-        logger.debug(f"Tracker with sender_id '{tracker.sender_id}' stored to database")
+            if rows:
+                # one `executemany` instead of one statement per event; unlike a
+                # multi-row `INSERT` it doesn't hit limits on bound parameters
+                session.execute(self.SQLEvent.__table__.insert(), rows)
+                conversation.event_count += len(rows)
 
-    def _additional_events(
-        self, session: "Session", tracker: DialogueStateTracker
-    ) -> Iterator:
-        """Return events from the tracker which aren't currently stored."""
+            conversation.version = self._new_version()
+            session.commit()
 
-        number_of_events_since_last_session = self._event_query(
-            session, tracker.sender_id
-        ).count()
-        return itertools.islice(
-            tracker.events, number_of_events_since_last_session, len(tracker.events)
-        )
+        tracker.number_of_persisted_events = len(tracker.events)
+        logger.debug(f"Tracker with sender_id '{tracker.sender_id}' stored to database")
 
 
 class FailSafeTrackerStore(TrackerStore):
@@ -874,6 +1822,13 @@ class FailSafeTrackerStore(TrackerStore):
             self.on_tracker_store_error(e)
             return None
 
+    async def retrieve_async(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        try:
+            return await self._tracker_store.retrieve_async(sender_id)
+        except Exception as e:
+            self.on_tracker_store_error(e)
+            return None
+
     def keys(self) -> Iterable[Text]:
         try:
             return self._tracker_store.keys()
@@ -888,6 +1843,266 @@ class FailSafeTrackerStore(TrackerStore):
             self.on_tracker_store_error(e)
             self.fallback_tracker_store.save(tracker)
 
+    async def save_async(self, tracker: DialogueStateTracker) -> None:
+        try:
+            await self._tracker_store.save_async(tracker)
+        except Exception as e:
+            self.on_tracker_store_error(e)
+            await self.fallback_tracker_store.save_async(tracker)
+
+    def stored_version(self, sender_id: Text) -> Optional[Any]:
+        try:
+            return self._tracker_store.stored_version(sender_id)
+        except Exception as e:
+            self.on_tracker_store_error(e)
+            return None
+
+    async def stored_version_async(self, sender_id: Text) -> Optional[Any]:
+        try:
+            return await self._tracker_store.stored_version_async(sender_id)
+        except Exception as e:
+            self.on_tracker_store_error(e)
+            return None
+
+
+class _CacheEntry:
+    """A tracker cached by the `CachedTrackerStore`."""
+
+    def __init__(
+        self, tracker: Optional[DialogueStateTracker], version: Any, size: int
+    ) -> None:
+        self.tracker = tracker
+        self.version = version
+        self.size = size
+
+
+class CachedTrackerStore(TrackerStore):
+    """Wraps a tracker store and keeps recently used trackers in memory.
+
+    Retrieving a conversation which was saved recently then doesn't require
+    deserialising the stored tracker and replaying its events. A cached tracker is
+    only returned if its version still matches the `stored_version` of the wrapped
+    tracker store, so conversations which were changed by another process (e.g. a
+    different Sanic worker) are retrieved from the wrapped store again. Trackers of
+    tracker stores which can't provide a version are never cached.
+
+    A cached tracker is handed out once and only put back into the cache when it's
+    saved again, so changes which were never saved can't leak into later
+    retrievals. The cache is bounded by the number of trackers and their
+    approximate size in bytes.
+    """
+
+    # the cache is only used from the event loop, the wrapped tracker store runs
+    # its blocking calls in its own threads
+    blocking_io_workers = 0
+
+    def __init__(
+        self,
+        tracker_store: TrackerStore,
+        max_trackers: int = 1000,
+        max_size_in_bytes: int = DEFAULT_TRACKER_CACHE_MAX_BYTES,
+    ) -> None:
+        self._tracker_store = tracker_store
+        self.max_trackers = max_trackers
+        self.max_size_in_bytes = max_size_in_bytes
+
+        self._cache: "OrderedDict[Text, _CacheEntry]" = OrderedDict()
+        self._size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        super().__init__(tracker_store.domain, tracker_store.event_broker)
+
+    @classmethod
+    def create_from_env(cls, tracker_store: TrackerStore) -> TrackerStore:
+        """Wrap `tracker_store` in a cache if the `TRACKER_CACHE_SIZE` environment
+        variable is set to a positive number of trackers.
+
+        The size of the cache in bytes can be limited with the
+        `TRACKER_CACHE_MAX_BYTES` environment variable."""
+
+        max_trackers = int_from_env(ENV_TRACKER_CACHE_SIZE, DEFAULT_TRACKER_CACHE_SIZE)
+        if max_trackers <= 0 or cls._is_cached(tracker_store):
+            return tracker_store
+
+        max_size_in_bytes = int_from_env(
+            ENV_TRACKER_CACHE_MAX_BYTES, DEFAULT_TRACKER_CACHE_MAX_BYTES
+        )
+        logger.debug(
+            f"Caching up to {max_trackers} trackers of "
+            f"'{tracker_store.__class__.__name__}' in memory."
+        )
+        return cls(tracker_store, max_trackers, max_size_in_bytes)
+
+    @staticmethod
+    def _is_cached(tracker_store: TrackerStore) -> bool:
+        """Check if `tracker_store` or any tracker store it wraps is cached."""
+
+        while tracker_store is not None:
+            if isinstance(tracker_store, CachedTrackerStore):
+                return True
+            tracker_store = getattr(tracker_store, "_tracker_store", None)
+
+        return False
+
+    @property
+    def domain(self) -> Optional[Domain]:
+        return self._tracker_store.domain
+
+    @domain.setter
+    def domain(self, domain: Optional[Domain]) -> None:
+        self._tracker_store.domain = domain
+        # cached trackers still use the slots of the previous domain
+        self.clear()
+
+    @property
+    def max_event_history(self) -> Optional[int]:
+        return self._tracker_store.max_event_history
+
+    @max_event_history.setter
+    def max_event_history(self, max_event_history: Optional[int]) -> None:
+        self._tracker_store.max_event_history = max_event_history
+
+    def clear(self) -> None:
+        """Remove all trackers from the cache."""
+
+        self._cache.clear()
+        self._size_in_bytes = 0
+
+    def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        tracker, version = self._take_cached_tracker(sender_id)
+        if tracker is not None and self._is_up_to_date(
+            sender_id, version, self._tracker_store.stored_version(sender_id)
+        ):
+            return tracker
+
+        self.misses += 1
+        return self._tracker_store.retrieve(sender_id)
+
+    async def retrieve_async(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        tracker, version = self._take_cached_tracker(sender_id)
+        if tracker is not None and self._is_up_to_date(
+            sender_id,
+            version,
+            await self._tracker_store.stored_version_async(sender_id),
+        ):
+            return tracker
+
+        self.misses += 1
+        return await self._tracker_store.retrieve_async(sender_id)
+
+    def _take_cached_tracker(
+        self, sender_id: Text
+    ) -> Tuple[Optional[DialogueStateTracker], Any]:
+        """Hand out the cached tracker of `sender_id` and its version."""
+
+        entry = self._cache.get(sender_id)
+        if entry is None or entry.tracker is None:
+            return None, None
+
+        if entry.tracker.events.maxlen != self.max_event_history:
+            # the tracker keeps a different number of events than requested
+            return None, None
+
+        tracker, entry.tracker = entry.tracker, None
+        return tracker, entry.version
+
+    def _is_up_to_date(
+        self, sender_id: Text, version: Any, stored_version: Optional[Any]
+    ) -> bool:
+        if version == stored_version:
+            self.hits += 1
+            logger.debug(f"Using cached tracker for sender id '{sender_id}'.")
+            return True
+
+        logger.debug(
+            f"Cached tracker for sender id '{sender_id}' is outdated. Retrieving "
+            f"it from '{self._tracker_store.__class__.__name__}'."
+        )
+        return False
+
+    def save(self, tracker: DialogueStateTracker) -> None:
+        number_of_persisted_events = tracker.number_of_persisted_events
+
+        self._tracker_store.save(tracker)
+
+        self._cache_saved_tracker(
+            tracker,
+            number_of_persisted_events,
+            self._tracker_store.stored_version(tracker.sender_id),
+        )
+
+    async def save_async(self, tracker: DialogueStateTracker) -> None:
+        number_of_persisted_events = tracker.number_of_persisted_events
+
+        await self._tracker_store.save_async(tracker)
+
+        self._cache_saved_tracker(
+            tracker,
+            number_of_persisted_events,
+            await self._tracker_store.stored_version_async(tracker.sender_id),
+        )
+
+    def _cache_saved_tracker(
+        self,
+        tracker: DialogueStateTracker,
+        number_of_persisted_events: Optional[int],
+        version: Optional[Any],
+    ) -> None:
+        """Cache `tracker` which was saved with `version`.
+
+        `number_of_persisted_events` is the number of events which were persisted
+        before the tracker was saved."""
+
+        tracker.number_of_persisted_events = len(tracker.events)
+
+        entry = self._cache.pop(tracker.sender_id, None)
+        if entry is not None:
+            self._size_in_bytes -= entry.size
+
+        if version is None:
+            return
+
+        if entry is not None and number_of_persisted_events is not None:
+            # only measure the events which were added since the last save
+            new_events = itertools.islice(
+                tracker.events, number_of_persisted_events, len(tracker.events)
+            )
+            size = entry.size + self._approximate_size(new_events)
+        else:
+            size = self._approximate_size(tracker.events)
+
+        self._cache[tracker.sender_id] = _CacheEntry(tracker, version, size)
+        self._size_in_bytes += size
+        self._evict()
+
+    @staticmethod
+    def _approximate_size(events: Iterable[Event]) -> int:
+        return sum(len(json.dumps(event.as_dict())) for event in events)
+
+    def _evict(self) -> None:
+        """Remove the least recently saved trackers until the cache fits its
+        limits."""
+
+        while self._cache and (
+            len(self._cache) > self.max_trackers
+            or self._size_in_bytes > self.max_size_in_bytes
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._size_in_bytes -= entry.size
+
+    def keys(self) -> Iterable[Text]:
+        return self._tracker_store.keys()
+
+    def number_of_existing_events(self, sender_id: Text) -> int:
+        return self._tracker_store.number_of_existing_events(sender_id)
+
+    def stored_version(self, sender_id: Text) -> Optional[Any]:
+        return self._tracker_store.stored_version(sender_id)
+
+    async def stored_version_async(self, sender_id: Text) -> Optional[Any]:
+        return await self._tracker_store.stored_version_async(sender_id)
+
 
 def _create_from_endpoint_config(
     endpoint_config: Optional[EndpointConfig] = None,
@@ -104,6 +104,29 @@ class DialogueStateTracker:
             tracker.update(e)
         return tracker
 
+    @classmethod
+    def from_snapshot(
+        cls,
+        sender_id: Text,
+        snapshot: Dict[Text, Any],
+        events_before_snapshot: List[Event],
+        events_after_snapshot: List[Event],
+        slots: Optional[List[Slot]] = None,
+        max_event_history: Optional[int] = None,
+    ) -> "DialogueStateTracker":
+        """Create a tracker from a state snapshot and the events around it.
+
+        Instead of replaying all events, the state is restored from the snapshot
+        (see `snapshot`) and only the events which were logged after the
+        snapshot was taken are applied."""
+
+        tracker = cls(sender_id, slots, max_event_history)
+        tracker.events.extend(events_before_snapshot)
+        tracker._restore_snapshot(snapshot)
+        for e in events_after_snapshot:
+            tracker.update(e)
+        return tracker
+
     def __init__(
         self,
         sender_id: Text,
@@ -143,6 +166,22 @@ class DialogueStateTracker:
         self.latest_bot_utterance = None
         self._reset()
         self.active_form = {}
+        # number of `events` which are already stored in the tracker store,
+        # `None` if unknown (e.g. if the tracker was not handed out by a tracker
+        # store)
+        self.number_of_persisted_events: Optional[int] = None
+        # number of `events` which were published to the event broker. Events
+        # are published before they are stored, so this is tracked separately,
+        # `None` if they weren't published by this tracker
+        self.number_of_published_events: Optional[int] = None
+        # the applied events are maintained while the tracker is updated and
+        # only recomputed if `events` was changed in other ways. The version is
+        # increased whenever applied events were removed or recomputed, so that
+        # the cached `past_states` know when they have to start over
+        self._applied_events: Optional[List[Event]] = []
+        self._number_of_processed_events = 0
+        self._applied_events_version = 0
+        self._past_states_cache: Optional["_PastStatesCache"] = None
 
     ###
     # Public tracker interface
@@ -178,11 +217,42 @@ class DialogueStateTracker:
             "latest_action_name": self.latest_action_name,
         }
 
+    def snapshot(self) -> Dict[Text, Any]:
+        """Dump the state of the tracker without its events.
+
+        The snapshot is JSON serialisable and contains everything which is
+        otherwise recreated by replaying the events."""
+
+        return {
+            "slots": self.current_slot_values(),
+            "latest_message": self.latest_message.as_dict(),
+            "latest_bot_utterance": self.latest_bot_utterance.as_dict(),
+            "latest_action_name": self.latest_action_name,
+            "followup_action": self.followup_action,
+            "paused": self._paused,
+            "active_form": self.active_form,
+        }
+
     def past_states(self, domain) -> deque:
-        """Generate the past states of this tracker based on the history."""
+        """Generate the past states of this tracker based on the history.
+
+        The states before the latest applied event are cached and only the states
+        of new events are computed, unless applied events were removed (e.g. by
+        reverting an utterance) or `domain` changed."""
 
-        generated_states = domain.states_for_tracker_history(self)
-        return deque(frozenset(s.items()) for s in generated_states)
+        applied_events = self._get_applied_events()
+
+        cache = self._past_states_cache
+        if (
+            cache is None
+            or cache.domain is not domain
+            or cache.applied_events_version != self._applied_events_version
+        ):
+            cache = _PastStatesCache(self, domain)
+            self._past_states_cache = cache
+
+        cache.update(applied_events)
+        return deque(cache.states + cache.final_states())
 
     def change_form_to(self, form_name: Text) -> None:
         """Activate or deactivate a form"""
@@ -285,96 +355,69 @@ class DialogueStateTracker:
 
         The resulting array is representing the trackers before each action."""
 
-        tracker = self.init_copy()
+        prior_trackers = _PriorTrackerGenerator(self)
 
-        ignored_trackers = []
-        latest_message = tracker.latest_message
-
-        for i, event in enumerate(self.applied_events()):
-            if isinstance(event, UserUttered):
-                if tracker.active_form.get("name") is None:
-                    # store latest user message before the form
-                    latest_message = event
-
-            elif isinstance(event, Form):
-                # form got either activated or deactivated, so override
-                # tracker's latest message
-                tracker.latest_message = latest_message
-
-            elif isinstance(event, ActionExecuted):
-                # yields the intermediate state
-                if tracker.active_form.get("name") is None:
-                    yield tracker
-
-                elif tracker.active_form.get("rejected"):
-                    yield from ignored_trackers
-                    ignored_trackers = []
-
-                    if not tracker.active_form.get(
-                        "validate"
-                    ) or event.action_name != tracker.active_form.get("name"):
-                        # persist latest user message
-                        # that was rejected by the form
-                        latest_message = tracker.latest_message
-                    else:
-                        # form was called with validation, so
-                        # override tracker's latest message
-                        tracker.latest_message = latest_message
-
-                    yield tracker
-
-                elif event.action_name != tracker.active_form.get("name"):
-                    # it is not known whether the form will be
-                    # successfully executed, so store this tracker for later
-                    tr = tracker.copy()
-                    # form was called with validation, so
-                    # override tracker's latest message
-                    tr.latest_message = latest_message
-                    ignored_trackers.append(tr)
-
-                if event.action_name == tracker.active_form.get("name"):
-                    # the form was successfully executed, so
-                    # remove all stored trackers
-                    ignored_trackers = []
+        for event in self.applied_events():
+            yield from prior_trackers.process(event)
 
-            tracker.update(event)
-
-        # yields the final state
-        if tracker.active_form.get("name") is None:
-            yield tracker
-        elif tracker.active_form.get("rejected"):
-            yield from ignored_trackers
-            yield tracker
+        yield from prior_trackers.final_trackers()
 
     def applied_events(self) -> List[Event]:
         """Returns all actions that should be applied - w/o reverted events."""
+        return list(self._get_applied_events())
+
+    def _get_applied_events(self) -> List[Event]:
+        """Returns the maintained list of applied events, which must not be
+        modified by the caller."""
+
+        if not self._applied_events_are_up_to_date():
+            applied_events = []
+            for event in self.events:
+                self._add_to_applied_events(applied_events, event)
+
+            self._applied_events = applied_events
+            self._number_of_processed_events = len(self.events)
+            self._applied_events_version += 1
+
+        return self._applied_events
+
+    def _applied_events_are_up_to_date(self) -> bool:
+        return (
+            self._applied_events is not None
+            and self._number_of_processed_events == len(self.events)
+        )
+
+    @staticmethod
+    def _add_to_applied_events(applied_events: List[Event], event: Event) -> bool:
+        """Update `applied_events` with a new event.
+
+        Returns:
+            `True` if events were removed from `applied_events`.
+        """
 
         def undo_till_previous(event_type, done_events):
             """Removes events from `done_events` until the first
                occurrence `event_type` is found which is also removed."""
-            # list gets modified - hence we need to copy events!
-            for e in reversed(done_events[:]):
-                del done_events[-1]
-                if isinstance(e, event_type):
+            while done_events:
+                if isinstance(done_events.pop(), event_type):
                     break
 
-        applied_events = []
-        for event in self.events:
-            if isinstance(event, (Restarted, SessionStarted)):
-                applied_events = []
-            elif isinstance(event, ActionReverted):
-                undo_till_previous(ActionExecuted, applied_events)
-            elif isinstance(event, UserUtteranceReverted):
-                # Seeing a user uttered event automatically implies there was
-                # a listen event right before it, so we'll first rewind the
-                # user utterance, then get the action right before it (also removes
-                # the `action_listen` action right before it).
-                undo_till_previous(UserUttered, applied_events)
-                undo_till_previous(ActionExecuted, applied_events)
-            else:
-                applied_events.append(event)
+        if isinstance(event, (Restarted, SessionStarted)):
+            applied_events.clear()
+        elif isinstance(event, ActionReverted):
+            undo_till_previous(ActionExecuted, applied_events)
+        elif isinstance(event, UserUtteranceReverted):
+            # Seeing a user uttered event automatically implies there was
+            # a listen event right before it, so we'll first rewind the
+            # user utterance, then get the action right before it (also removes
+            # the `action_listen` action right before it).
+            undo_till_previous(UserUttered, applied_events)
+            undo_till_previous(ActionExecuted, applied_events)
+        else:
+            applied_events.append(event)
+            return False
 
-        return applied_events
+        return True
 
     def replay_events(self) -> None:
         """Update the tracker based on a list of events."""
@@ -434,7 +477,32 @@ class DialogueStateTracker:
         if not isinstance(event, Event):  # pragma: no cover
             raise ValueError("event to log must be an instance of a subclass of Event.")
 
+        history_is_full = (
+            self._max_event_history is not None
+            and len(self.events) >= self._max_event_history
+        )
+        can_update_applied_events = (
+            self._applied_events_are_up_to_date() and not history_is_full
+        )
+
         self.events.append(event)
+
+        if history_is_full:
+            # the oldest event was dropped, the counters are offsets in `events`
+            if self.number_of_persisted_events:
+                self.number_of_persisted_events -= 1
+            if self.number_of_published_events:
+                self.number_of_published_events -= 1
+
+        if can_update_applied_events:
+            if self._add_to_applied_events(self._applied_events, event):
+                self._applied_events_version += 1
+            self._number_of_processed_events += 1
+        else:
+            # appending dropped the oldest event or `events` were changed
+            # directly, so the applied events have to be recomputed
+            self._applied_events = None
+
         event.apply_to(self)
 
         if domain and isinstance(event, UserUttered):
@@ -524,6 +592,25 @@ class DialogueStateTracker:
         self.followup_action = ACTION_LISTEN_NAME
         self.active_form = {}
 
+    def _restore_snapshot(self, snapshot: Dict[Text, Any]) -> None:
+        """Set the state of the tracker to a state dumped by `snapshot`."""
+
+        self._reset()
+        for key, value in snapshot.get("slots", {}).items():
+            if key in self.slots:
+                self.slots[key].value = value
+
+        if snapshot.get("latest_message"):
+            self.latest_message = Event.from_parameters(snapshot["latest_message"])
+        if snapshot.get("latest_bot_utterance"):
+            self.latest_bot_utterance = Event.from_parameters(
+                snapshot["latest_bot_utterance"]
+            )
+        self.latest_action_name = snapshot.get("latest_action_name")
+        self.followup_action = snapshot.get("followup_action")
+        self._paused = snapshot.get("paused", False)
+        self.active_form = copy.deepcopy(snapshot.get("active_form", {}))
+
     def _reset_slots(self) -> None:
         """Set all the slots to their initial value."""
 
@@ -583,3 +670,112 @@ class DialogueStateTracker:
             if e["entity"] in self.slots.keys()
         ]
         return new_slots
+
+
+class _PriorTrackerGenerator:
+    """Walks through the applied events of a tracker and generates the trackers
+    before each action (see `DialogueStateTracker.generate_all_prior_trackers`).
+
+    The walk can be continued when new events were applied to the tracker. The
+    generated trackers are changed when the next event is processed, so they
+    have to be used before that."""
+
+    def __init__(self, tracker: DialogueStateTracker) -> None:
+        self.tracker = tracker.init_copy()
+        self.ignored_trackers = []
+        self.latest_message = self.tracker.latest_message
+
+    def process(self, event: Event) -> Iterator[DialogueStateTracker]:
+        """Apply `event` and generate the trackers which are final after it."""
+
+        tracker = self.tracker
+
+        if isinstance(event, UserUttered):
+            if tracker.active_form.get("name") is None:
+                # store latest user message before the form
+                self.latest_message = event
+
+        elif isinstance(event, Form):
+            # form got either activated or deactivated, so override
+            # tracker's latest message
+            tracker.latest_message = self.latest_message
+
+        elif isinstance(event, ActionExecuted):
+            # yields the intermediate state
+            if tracker.active_form.get("name") is None:
+                yield tracker
+
+            elif tracker.active_form.get("rejected"):
+                yield from self.ignored_trackers
+                self.ignored_trackers = []
+
+                if not tracker.active_form.get(
+                    "validate"
+                ) or event.action_name != tracker.active_form.get("name"):
+                    # persist latest user message
+                    # that was rejected by the form
+                    self.latest_message = tracker.latest_message
+                else:
+                    # form was called with validation, so
+                    # override tracker's latest message
+                    tracker.latest_message = self.latest_message
+
+                yield tracker
+
+            elif event.action_name != tracker.active_form.get("name"):
+                # it is not known whether the form will be
+                # successfully executed, so store this tracker for later
+                tr = tracker.copy()
+                # form was called with validation, so
+                # override tracker's latest message
+                tr.latest_message = self.latest_message
+                self.ignored_trackers.append(tr)
+
+            if event.action_name == tracker.active_form.get("name"):
+                # the form was successfully executed, so
+                # remove all stored trackers
+                self.ignored_trackers = []
+
+        tracker.update(event)
+
+    def final_trackers(self) -> Iterator[DialogueStateTracker]:
+        """Generate the trackers for the final state."""
+
+        if self.tracker.active_form.get("name") is None:
+            yield self.tracker
+        elif self.tracker.active_form.get("rejected"):
+            yield from self.ignored_trackers
+            yield self.tracker
+
+
+class _PastStatesCache:
+    """States of the prior trackers of a tracker for a certain domain."""
+
+    def __init__(self, tracker: DialogueStateTracker, domain: Domain) -> None:
+        self.domain = domain
+        self.applied_events_version = tracker._applied_events_version
+        self.prior_trackers = _PriorTrackerGenerator(tracker)
+        self.states: List[frozenset] = []
+        self.number_of_processed_events = 0
+        self._final_states: Optional[List[frozenset]] = None
+
+    def _states_of(self, trackers: Iterator[DialogueStateTracker]) -> List[frozenset]:
+        return [frozenset(self.domain.get_active_states(tr).items()) for tr in trackers]
+
+    def update(self, applied_events: List[Event]) -> None:
+        """Compute the states of the applied events which were added since the
+        last update."""
+
+        for event in applied_events[self.number_of_processed_events :]:
+            self.states.extend(self._states_of(self.prior_trackers.process(event)))
+            self._final_states = None
+        self.number_of_processed_events = len(applied_events)
+
+    def final_states(self) -> List[frozenset]:
+        """States of the trackers after the latest applied event. They are reused
+        until new events are applied, e.g. when several policies featurize the
+        same tracker."""
+
+        if self._final_states is None:
+            self._final_states = self._states_of(self.prior_trackers.final_trackers())
+        return self._final_states
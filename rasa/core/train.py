@@ -7,7 +7,11 @@ import typing
 from typing import Dict, Optional, Text, Union, List
 
 import rasa.utils.io
-from rasa.constants import NUMBER_OF_TRAINING_STORIES_FILE, PERCENTAGE_KEY
+from rasa.constants import (
+    DEFAULT_TRAINING_CACHE_DIRECTORY_NAME,
+    NUMBER_OF_TRAINING_STORIES_FILE,
+    PERCENTAGE_KEY,
+)
 from rasa.core.domain import Domain
 from rasa.importers.importer import TrainingDataImporter
 from rasa.utils.common import TempDirectoryPath
@@ -30,9 +34,12 @@ async def train(
     policy_config: Optional[Union[Text, Dict]] = None,
     exclusion_percentage: int = None,
     additional_arguments: Optional[Dict] = None,
+    previous_model: Optional[Text] = None,
+    reused_policies: Optional[Dict[int, int]] = None,
 ):
     from rasa.core.agent import Agent
     from rasa.core import config, utils
+    from rasa.core.training.cache import TrainingDataCache
     from rasa.core.utils import AvailableEndpoints
 
     if not endpoints:
@@ -51,6 +58,10 @@ async def train(
         policies=policies,
     )
 
+    if previous_model and reused_policies:
+        # policies which didn't change since the previous model aren't retrained
+        agent.policy_ensemble.reuse_trained_policies(previous_model, reused_policies)
+
     data_load_args, additional_arguments = utils.extract_args(
         additional_arguments,
         {
@@ -59,12 +70,24 @@ async def train(
             "augmentation_factor",
             "remove_duplicates",
             "debug_plots",
+            "num_generation_workers",
         },
     )
+
+    training_data_cache = None
+    training_cache_dir = additional_arguments.pop("training_cache_dir", None)
+    if training_cache_dir:
+        training_data_cache = TrainingDataCache(training_cache_dir)
+
     training_data = await agent.load_data(
-        training_resource, exclusion_percentage=exclusion_percentage, **data_load_args
+        training_resource,
+        exclusion_percentage=exclusion_percentage,
+        training_data_cache=training_data_cache,
+        **data_load_args,
+    )
+    agent.train(
+        training_data, training_data_cache=training_data_cache, **additional_arguments
     )
-    agent.train(training_data, **additional_arguments)
     agent.persist(output_path, dump_stories)
 
     return agent
@@ -87,6 +110,13 @@ async def train_comparison_models(
     exclusion_percentages = exclusion_percentages or []
     policy_configs = policy_configs or []
 
+    additional_arguments = dict(additional_arguments or {})
+    if additional_arguments.pop("use_training_cache", True):
+        # policies which are compared on the same stories share the training data
+        additional_arguments["training_cache_dir"] = os.path.join(
+            output_path, DEFAULT_TRAINING_CACHE_DIRECTORY_NAME
+        )
+
     for r in range(runs):
         logging.info("Starting run {}/{}".format(r + 1, runs))
 
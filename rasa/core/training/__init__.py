@@ -5,6 +5,7 @@ if typing.TYPE_CHECKING:
     from rasa.core.domain import Domain
     from rasa.core.interpreter import NaturalLanguageInterpreter
     from rasa.core.trackers import DialogueStateTracker
+    from rasa.core.training.cache import TrainingDataCache
     from rasa.core.training.structures import StoryGraph
     from rasa.importers.importer import TrainingDataImporter
 
@@ -42,6 +43,8 @@ async def load_data(
     use_story_concatenation: bool = True,
     debug_plots=False,
     exclusion_percentage: int = None,
+    num_generation_workers: int = 1,
+    training_data_cache: Optional["TrainingDataCache"] = None,
 ) -> List["DialogueStateTracker"]:
     from rasa.core.training.generator import TrainingDataGenerator
     from rasa.importers.importer import TrainingDataImporter
@@ -65,7 +68,12 @@ async def load_data(
             tracker_limit,
             use_story_concatenation,
             debug_plots,
+            num_generation_workers,
         )
+
+        if training_data_cache is not None:
+            return training_data_cache.load_or_generate_trackers(graph, g)
+
         return g.generate()
     else:
         return []
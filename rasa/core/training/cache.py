@@ -0,0 +1,327 @@
+import logging
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import typing
+from typing import List, Match, Optional, Text
+
+import jsonpickle
+import numpy as np
+import scipy.sparse
+
+import rasa
+import rasa.utils.io
+from rasa.core import utils
+from rasa.core.featurizers import is_sparse_features
+from rasa.core.training.data import DialogueTrainingData
+from rasa.core.training.structures import GENERATED_CHECKPOINT_PREFIX
+
+if typing.TYPE_CHECKING:
+    from rasa.core.domain import Domain
+    from rasa.core.featurizers import TrackerFeaturizer
+    from rasa.core.training.generator import (
+        TrackerWithCachedStates,
+        TrainingDataGenerator,
+    )
+    from rasa.core.training.structures import StoryGraph
+
+logger = logging.getLogger(__name__)
+
+TRACKERS_DIRECTORY_NAME = "trackers"
+TRAINING_DATA_DIRECTORY_NAME = "training_data"
+
+FEATURIZER_FILE_NAME = "featurizer.json"
+SPARSE_SHAPE_FILE_NAME = "X_shape.npy"
+
+# changes whenever the stored training data of the same featurizer changes
+TRAINING_DATA_FORMAT_VERSION = 2
+
+# number of cached tracker sets and of cached training data which are kept
+DEFAULT_MAX_CACHED_ENTRIES = 10
+
+
+class TrainingDataCache:
+    """Content addressed cache of generated training trackers and the training
+    data which featurizers created from them.
+
+    Trackers are keyed on the stories, the domain and the arguments of the
+    `TrainingDataGenerator`. The training data of a featurizer is keyed on the
+    trackers it was created from and the configuration of the featurizer. `X`
+    and `y` are stored as `.npy` files which are memory mapped when they are
+    loaded, so re-training a model or training different policies on the same
+    stories skips straight to fitting the model.
+
+    Only the `max_entries` most recently used tracker sets and training data are
+    kept, older ones are removed whenever a new entry is stored. The cache
+    directory can also be deleted at any time.
+    """
+
+    def __init__(
+        self, cache_dir: Text, max_entries: int = DEFAULT_MAX_CACHED_ENTRIES
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_entries = max(max_entries, 1)
+        # trackers handed out by `load_or_generate_trackers` and their key
+        self._trackers: Optional[List["TrackerWithCachedStates"]] = None
+        self._trackers_key: Optional[Text] = None
+
+    @staticmethod
+    def trackers_key(
+        story_graph: "StoryGraph", generator: "TrainingDataGenerator"
+    ) -> Text:
+        """Key of the trackers `generator` generates from `story_graph`."""
+
+        generator_config = generator.config._asdict()
+        # neither of them changes the generated trackers
+        del generator_config["rand"]
+        del generator_config["num_workers"]
+
+        return utils.get_dict_hash(
+            {
+                "stories": TrainingDataCache._stories_hash(story_graph),
+                "domain": hash(generator.domain),
+                "generator_config": generator_config,
+                "version": rasa.__version__,
+            }
+        )
+
+    @staticmethod
+    def _stories_hash(story_graph: "StoryGraph") -> Text:
+        """Hash of the stories which doesn't depend on the random names of the
+        checkpoints generated while reading them (e.g. for `OR` statements)."""
+
+        names = {}
+
+        def replace(match: Match) -> Text:
+            return names.setdefault(match.group(0), f"generated_{len(names)}")
+
+        stories = re.sub(
+            re.escape(GENERATED_CHECKPOINT_PREFIX) + r"\w+",
+            replace,
+            story_graph.as_story_string(),
+        )
+        return utils.get_text_hash(stories)
+
+    @staticmethod
+    def training_data_key(trackers_key: Text, featurizer: "TrackerFeaturizer") -> Text:
+        """Key of the training data `featurizer` creates from the trackers."""
+
+        return utils.get_dict_hash(
+            {
+                "trackers": trackers_key,
+                "featurizer": jsonpickle.encode(featurizer),
+                "format": TRAINING_DATA_FORMAT_VERSION,
+                "version": rasa.__version__,
+            }
+        )
+
+    def _trackers_path(self, key: Text) -> Text:
+        return os.path.join(self.cache_dir, TRACKERS_DIRECTORY_NAME, key + ".pkl")
+
+    def _training_data_path(self, key: Text) -> Text:
+        return os.path.join(self.cache_dir, TRAINING_DATA_DIRECTORY_NAME, key)
+
+    def load_or_generate_trackers(
+        self, story_graph: "StoryGraph", generator: "TrainingDataGenerator"
+    ) -> List["TrackerWithCachedStates"]:
+        """Load the trackers `generator` generates from `story_graph` from the
+        cache or generate them and store them in the cache."""
+
+        key = self.trackers_key(story_graph, generator)
+        trackers = self._load_trackers(key, generator.domain)
+
+        if trackers is None:
+            trackers = generator.generate()
+            self._save_trackers(key, trackers)
+
+        self._trackers = trackers
+        self._trackers_key = key
+        return trackers
+
+    def _load_trackers(
+        self, key: Text, domain: "Domain"
+    ) -> Optional[List["TrackerWithCachedStates"]]:
+        from rasa.core.training.generator import _set_domain
+
+        path = self._trackers_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                trackers = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load cached training trackers: {e}")
+            return None
+
+        _set_domain(trackers, domain)
+        _mark_as_used(path)
+        logger.debug(f"Loaded {len(trackers)} training trackers from '{path}'.")
+        return trackers
+
+    def _save_trackers(
+        self, key: Text, trackers: List["TrackerWithCachedStates"]
+    ) -> None:
+        from rasa.core.training.generator import _set_domain
+
+        path = self._trackers_path(key)
+        rasa.utils.io.create_directory_for_file(path)
+
+        # the domain is part of the key, so it doesn't need to be stored
+        domains = [tracker.domain for tracker in trackers]
+        _set_domain(trackers, None)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(trackers, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to cache training trackers: {e}")
+            os.remove(temp_path)
+        finally:
+            for tracker, domain in zip(trackers, domains):
+                tracker.domain = domain
+
+        self._evict_least_recently_used(os.path.dirname(path))
+
+    def featurize_trackers(
+        self,
+        featurizer: "TrackerFeaturizer",
+        trackers: List["TrackerWithCachedStates"],
+        domain: "Domain",
+    ) -> DialogueTrainingData:
+        """Create the training data of `featurizer` or load it from the cache.
+
+        Only trackers which were handed out by this cache can be looked up, as
+        their key is already known."""
+
+        if trackers is not self._trackers:
+            return featurizer.featurize_trackers(trackers, domain)
+
+        key = self.training_data_key(self._trackers_key, featurizer)
+        path = self._training_data_path(key)
+
+        training_data = self._load_training_data(path, featurizer)
+        if training_data is None:
+            training_data = featurizer.featurize_trackers(trackers, domain)
+            self._save_training_data(path, training_data, featurizer)
+            self._evict_least_recently_used(os.path.dirname(path))
+
+        return training_data
+
+    @staticmethod
+    def _load_training_data(
+        path: Text, featurizer: "TrackerFeaturizer"
+    ) -> Optional[DialogueTrainingData]:
+        if not os.path.exists(path):
+            return None
+
+        try:
+            if os.path.exists(os.path.join(path, "X.npz")):
+                stacked = scipy.sparse.load_npz(os.path.join(path, "X.npz"))
+                shape = tuple(np.load(os.path.join(path, SPARSE_SHAPE_FILE_NAME)))
+                # noinspection PyPep8Naming
+                X = np.empty(stacked.shape[0], dtype=object)
+                for idx in range(stacked.shape[0]):
+                    X[idx] = stacked[idx].reshape(shape).tocoo()
+            else:
+                # copy on write, so that policies can still modify their data
+                # noinspection PyPep8Naming
+                X = np.load(os.path.join(path, "X.npy"), mmap_mode="c")
+            y = np.load(os.path.join(path, "y.npy"), mmap_mode="c")
+            true_length = np.load(os.path.join(path, "true_length.npy")).tolist()
+
+            # featurizing prepares the featurizer for the domain, e.g. sets the
+            # maximal dialogue length, which has to be restored as well
+            fitted_featurizer = jsonpickle.decode(
+                rasa.utils.io.read_file(os.path.join(path, FEATURIZER_FILE_NAME))
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load cached training data: {e}")
+            return None
+
+        featurizer.__dict__.update(fitted_featurizer.__dict__)
+        _mark_as_used(path)
+        logger.debug(f"Loaded featurized training data from '{path}'.")
+        return DialogueTrainingData(X, y, true_length)
+
+    @staticmethod
+    def _save_training_data(
+        path: Text, training_data: DialogueTrainingData, featurizer: "TrackerFeaturizer"
+    ) -> None:
+        if training_data.X.dtype == object and not is_sparse_features(training_data.X):
+            # dialogues of different lengths which can't be memory mapped
+            return
+
+        parent = os.path.dirname(path)
+        rasa.utils.io.create_directory(parent)
+        temp_path = tempfile.mkdtemp(dir=parent)
+
+        try:
+            if is_sparse_features(training_data.X):
+                shape = training_data.X[0].shape
+                stacked = scipy.sparse.vstack(
+                    [x.reshape(1, -1) for x in training_data.X]
+                ).tocsr()
+                scipy.sparse.save_npz(os.path.join(temp_path, "X.npz"), stacked)
+                np.save(os.path.join(temp_path, SPARSE_SHAPE_FILE_NAME), shape)
+            else:
+                np.save(os.path.join(temp_path, "X.npy"), training_data.X)
+            np.save(os.path.join(temp_path, "y.npy"), training_data.y)
+            np.save(
+                os.path.join(temp_path, "true_length.npy"),
+                np.array(training_data.true_length, dtype=np.int64),
+            )
+            rasa.utils.io.write_text_file(
+                jsonpickle.encode(featurizer),
+                os.path.join(temp_path, FEATURIZER_FILE_NAME),
+            )
+            os.replace(temp_path, path)
+        except OSError as e:
+            # e.g. another training stored the same data concurrently
+            logger.debug(f"Failed to cache featurized training data: {e}")
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+    def _evict_least_recently_used(self, directory: Text) -> None:
+        """Remove all but the `max_entries` most recently used entries of
+        `directory`."""
+
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(directory)
+                # temporary files of entries which are just being stored
+                if not entry.name.startswith(tempfile.gettempprefix())
+            ]
+        except OSError:
+            return
+
+        entries.sort(key=_last_used, reverse=True)
+        for entry in entries[self.max_entries :]:
+            logger.debug(f"Removing cached training data '{entry.path}'.")
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+def _mark_as_used(path: Text) -> None:
+    """Update the modification time of a cache entry, which is used to find the
+    least recently used entries."""
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _last_used(entry: os.DirEntry) -> float:
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return 0.0
@@ -22,6 +22,9 @@ class DialogueTrainingData:
         return self.X.shape[0] == 0
 
     def max_history(self) -> int:
+        if self.X.ndim == 1:
+            # sparse features hold one matrix per example
+            return self.X[0].shape[0]
         return self.X.shape[1]
 
     def num_examples(self) -> int:
@@ -1,10 +1,11 @@
 from collections import defaultdict, namedtuple, deque
 
+import concurrent.futures
 import copy
 import logging
 import random
 from tqdm import tqdm
-from typing import Optional, List, Text, Set, Dict, Tuple
+from typing import Optional, List, Text, Set, Dict, Tuple, Iterable
 
 from rasa.constants import DOCS_URL_STORIES
 from rasa.core import utils
@@ -36,9 +37,14 @@ ExtractorConfig = namedtuple(
     "max_number_of_augmented_trackers "
     "tracker_limit "
     "use_story_concatenation "
+    "num_workers "
     "rand",
 )
 
+# a story step is only split across worker processes if every worker
+# gets at least this many trackers, otherwise pickling them isn't worth it
+MIN_TRACKERS_PER_WORKER = 50
+
 
 class TrackerWithCachedStates(DialogueStateTracker):
     """A tracker wrapper that caches the state creation of the tracker."""
@@ -48,6 +54,10 @@ class TrackerWithCachedStates(DialogueStateTracker):
     ):
         super().__init__(sender_id, slots, max_event_history)
         self._states = None
+        # persistent chain `(hash, previous chain)` of the hashes of all prefixes
+        # of `_states`. Copies of the tracker share the chain of their common
+        # history. `None` if the hashes weren't computed yet.
+        self._state_hash_chain = None
         self.domain = domain
         # T/F property to filter augmented stories
         self.is_augmented = is_augmented
@@ -63,13 +73,45 @@ class TrackerWithCachedStates(DialogueStateTracker):
         # if don't have it cached, we use the domain to calculate the states
         # from the events
         if self._states is None:
-            self._states = super().past_states(domain)
+            self._states = deque(
+                frozenset(s.items()) for s in domain.states_for_tracker_history(self)
+            )
 
         return self._states
 
+    def states_hash(self) -> int:
+        """Return a hash of the past states of the tracker.
+
+        The hash is updated incrementally with every state that is added, so
+        the shared history of copied trackers is only hashed once."""
+
+        states = self.past_states(self.domain)
+
+        if self._state_hash_chain is None:
+            self._state_hash_chain = ()
+            for state in states:
+                self._push_state_hash(state)
+
+        if self._state_hash_chain:
+            return self._state_hash_chain[0]
+        return hash(())
+
+    def _push_state_hash(self, state: frozenset) -> None:
+        if self._state_hash_chain is None:
+            return
+
+        previous_hash = self._state_hash_chain[0] if self._state_hash_chain else 0
+        self._state_hash_chain = (hash((previous_hash, state)), self._state_hash_chain)
+
+    def _pop_state(self) -> None:
+        self._states.pop()
+        if self._state_hash_chain:
+            self._state_hash_chain = self._state_hash_chain[1]
+
     def clear_states(self) -> None:
         """Reset the states."""
         self._states = None
+        self._state_hash_chain = None
 
     def init_copy(self) -> "TrackerWithCachedStates":
         """Create a new state tracker with the same initial values."""
@@ -84,28 +126,33 @@ class TrackerWithCachedStates(DialogueStateTracker):
     def copy(self, sender_id: Text = "") -> "TrackerWithCachedStates":
         """Creates a duplicate of this tracker.
 
-        A new tracker will be created and all events
-        will be replayed."""
-
-        # This is an optimization, we could use the original copy, but
-        # the states would be lost and we would need to recalculate them
+        Instead of replaying all events, the duplicate shares the events and
+        the cached states with this tracker. Only the containers holding them
+        and the mutable parts of the dialogue state are copied."""
 
-        tracker = self.init_copy()
+        tracker = object.__new__(type(self))
+        tracker.__dict__.update(self.__dict__)
         tracker.sender_id = sender_id
 
-        for event in self.events:
-            tracker.update(event, skip_states=True)
-
+        tracker.events = self._create_events(self.events)
+        tracker.slots = copy.deepcopy(self.slots)
+        tracker.active_form = dict(self.active_form)
+        if self._applied_events is not None:
+            tracker._applied_events = list(self._applied_events)
+        tracker._past_states_cache = None
+        tracker.number_of_persisted_events = None
+        tracker.number_of_published_events = None
         tracker._states = copy.copy(self._states)
 
-        return tracker  # yields the final state
+        return tracker
 
     def _append_current_state(self) -> None:
         if self._states is None:
             self._states = self.past_states(self.domain)
         else:
-            state = self.domain.get_active_states(self)
-            self._states.append(frozenset(state.items()))
+            state = frozenset(self.domain.get_active_states(self).items())
+            self._states.append(state)
+            self._push_state_hash(state)
 
     def update(self, event: Event, skip_states: bool = False) -> None:
         """Modify the state of the tracker according to an ``Event``. """
@@ -124,14 +171,14 @@ class TrackerWithCachedStates(DialogueStateTracker):
             if isinstance(event, ActionExecuted):
                 pass
             elif isinstance(event, ActionReverted):
-                self._states.pop()  # removes the state after the action
-                self._states.pop()  # removes the state used for the action
+                self._pop_state()  # removes the state after the action
+                self._pop_state()  # removes the state used for the action
             elif isinstance(event, UserUtteranceReverted):
                 self.clear_states()
             elif isinstance(event, Restarted):
                 self.clear_states()
             else:
-                self._states.pop()
+                self._pop_state()
 
             self._append_current_state()
 
@@ -141,6 +188,67 @@ TrackerLookupDict = Dict[Optional[Text], List[TrackerWithCachedStates]]
 
 TrackersTuple = Tuple[List[TrackerWithCachedStates], List[TrackerWithCachedStates]]
 
+# end trackers together with the index of the event and the tracker they were
+# created at, which restores their order after parallel processing
+IndexedEndTrackers = List[Tuple[int, int, TrackerWithCachedStates]]
+
+# domain of a worker process of the `TrainingDataGenerator`, which is only sent
+# once instead of with every tracker
+_worker_domain: Optional[Domain] = None
+
+
+def _init_worker(domain: Domain) -> None:
+    global _worker_domain
+    _worker_domain = domain
+
+
+def _set_domain(
+    trackers: Iterable[TrackerWithCachedStates], domain: Optional[Domain]
+) -> None:
+    """Attach trackers to a domain or detach them before they are pickled.
+
+    State hashes are dropped as string hashes differ between processes."""
+
+    for tracker in trackers:
+        tracker.domain = domain
+        tracker._state_hash_chain = None
+
+
+def _apply_step_events(
+    events: List[Event], trackers: List[TrackerWithCachedStates]
+) -> IndexedEndTrackers:
+    """Update the trackers with the events of a story step.
+
+    Returns copies of the trackers from before every event which reverts
+    previous events."""
+
+    end_trackers = []
+    for event_idx, event in enumerate(events):
+        for tracker_idx, tracker in enumerate(trackers):
+            if isinstance(event, (ActionReverted, UserUtteranceReverted, Restarted)):
+                end_trackers.append(
+                    (event_idx, tracker_idx, tracker.copy(tracker.sender_id))
+                )
+            tracker.update(event)
+
+    return end_trackers
+
+
+def _apply_step_events_in_worker(
+    events: List[Event], trackers: List[TrackerWithCachedStates]
+) -> Tuple[List[TrackerWithCachedStates], IndexedEndTrackers]:
+    """Run `_apply_step_events` in a worker process.
+
+    Has to be a module level function so it can be pickled and sent to the
+    workers of a process pool."""
+
+    _set_domain(trackers, _worker_domain)
+    end_trackers = _apply_step_events(events, trackers)
+
+    _set_domain(trackers, None)
+    _set_domain((tracker for _, _, tracker in end_trackers), None)
+    return trackers, end_trackers
+
 
 class TrainingDataGenerator:
     def __init__(
@@ -153,13 +261,17 @@ class TrainingDataGenerator:
         tracker_limit: Optional[int] = None,
         use_story_concatenation: bool = True,
         debug_plots: bool = False,
+        num_workers: int = 1,
     ):
         """Given a set of story parts, generates all stories that are possible.
 
         The different story parts can end and start with checkpoints
         and this generator will match start and end checkpoints to
         connect complete stories. Afterwards, duplicate stories will be
-        removed and the data is augmented (if augmentation is enabled)."""
+        removed and the data is augmented (if augmentation is enabled).
+
+        With `num_workers > 1` the trackers of large story steps are split
+        across a pool of worker processes. The generated trackers are the same."""
 
         self.story_graph = story_graph.with_cycles_removed()
         if debug_plots:
@@ -177,10 +289,12 @@ class TrainingDataGenerator:
             max_number_of_augmented_trackers=max_number_of_augmented_trackers,
             tracker_limit=tracker_limit,
             use_story_concatenation=use_story_concatenation,
+            num_workers=num_workers,
             rand=random.Random(42),
         )
         # hashed featurization of all finished trackers
         self.hashed_featurizations = set()
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
 
     @staticmethod
     def _phase_name(everything_reachable_is_reached, phase):
@@ -190,6 +304,21 @@ class TrainingDataGenerator:
             return f"data generation round {phase}"
 
     def generate(self) -> List[TrackerWithCachedStates]:
+        if self.config.num_workers > 1:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                self.config.num_workers,
+                initializer=_init_worker,
+                initargs=(self.domain,),
+            )
+
+        try:
+            return self._generate()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _generate(self) -> List[TrackerWithCachedStates]:
         if self.config.remove_duplicates and self.config.unique_last_num_states:
             logger.debug(
                 "Generated trackers will be deduplicated "
@@ -528,18 +657,60 @@ class TrainingDataGenerator:
                     new_sender = step.block_name
                 trackers.append(tracker.copy(new_sender))
 
-        end_trackers = []
-        for event in events:
-            for tracker in trackers:
-                if isinstance(
-                    event, (ActionReverted, UserUtteranceReverted, Restarted)
-                ):
-                    end_trackers.append(tracker.copy(tracker.sender_id))
-                tracker.update(event)
+        num_chunks = min(
+            self.config.num_workers, len(trackers) // MIN_TRACKERS_PER_WORKER
+        )
+        if self._pool is not None and num_chunks > 1:
+            trackers, end_trackers = self._apply_step_events_in_pool(
+                events, trackers, num_chunks
+            )
+        else:
+            end_trackers = _apply_step_events(events, trackers)
 
         # end trackers should be returned separately
         # to avoid using them for augmentation
-        return trackers, end_trackers
+        return trackers, [tracker for _, _, tracker in end_trackers]
+
+    def _apply_step_events_in_pool(
+        self,
+        events: List[Event],
+        trackers: List[TrackerWithCachedStates],
+        num_chunks: int,
+    ) -> Tuple[List[TrackerWithCachedStates], IndexedEndTrackers]:
+        """Split the trackers of a story step across the worker processes.
+
+        The trackers are copies which aren't used anywhere else yet, so they can
+        be detached from the domain before they are sent to the workers."""
+
+        _set_domain(trackers, None)
+
+        chunk_size = -(-len(trackers) // num_chunks)
+        offsets = range(0, len(trackers), chunk_size)
+        futures = [
+            self._pool.submit(
+                _apply_step_events_in_worker,
+                events,
+                trackers[offset : offset + chunk_size],
+            )
+            for offset in offsets
+        ]
+
+        processed_trackers = []
+        end_trackers = []
+        for offset, future in zip(offsets, futures):
+            chunk_trackers, chunk_end_trackers = future.result()
+            processed_trackers.extend(chunk_trackers)
+            end_trackers.extend(
+                (event_idx, offset + tracker_idx, tracker)
+                for event_idx, tracker_idx, tracker in chunk_end_trackers
+            )
+
+        _set_domain(processed_trackers, self.domain)
+        _set_domain((tracker for _, _, tracker in end_trackers), self.domain)
+
+        # same order as if the events were applied in this process
+        end_trackers.sort(key=lambda indexed: indexed[:2])
+        return processed_trackers, end_trackers
 
     def _remove_duplicate_trackers(
         self, trackers: List[TrackerWithCachedStates]
@@ -560,13 +731,13 @@ class TrainingDataGenerator:
         end_trackers = []  # for all steps
 
         for tracker in trackers:
-            states = tuple(tracker.past_states(self.domain))
-            hashed = hash(states)
+            hashed = tracker.states_hash()
 
             # only continue with trackers that created a
             # hashed_featurization we haven't observed
             if hashed not in step_hashed_featurizations:
                 if self.config.unique_last_num_states:
+                    states = tuple(tracker.past_states(self.domain))
                     last_states = states[-self.config.unique_last_num_states :]
                     last_hashed = hash(last_states)
 
@@ -599,8 +770,7 @@ class TrainingDataGenerator:
         # otherwise featurization does a lot of unnecessary work
 
         for tracker in trackers:
-            states = tuple(tracker.past_states(self.domain))
-            hashed = hash(states)
+            hashed = tracker.states_hash()
 
             # only continue with trackers that created a
             # hashed_featurization we haven't observed
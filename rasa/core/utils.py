@@ -496,12 +496,15 @@ def _lock_store_is_redis_lock_store(
     return lock_store is not None and lock_store.type == "redis"
 
 
-def number_of_sanic_workers(lock_store: Union[EndpointConfig, LockStore, None]) -> int:
+def number_of_sanic_workers(
+    lock_store: Union[EndpointConfig, LockStore, None], sharded: bool = False
+) -> int:
     """Get the number of Sanic workers to use in `app.run()`.
 
     If the environment variable constants.ENV_SANIC_WORKERS is set and is not equal to
     1, that value will only be permitted if the used lock store supports shared
-    resources across multiple workers (e.g. ``RedisLockStore``).
+    resources across multiple workers (e.g. ``RedisLockStore``), or if messages are
+    routed to the workers by their sender ID (`sharded`).
     """
 
     def _log_and_get_default_number_of_workers():
@@ -529,12 +532,13 @@ def number_of_sanic_workers(lock_store: Union[EndpointConfig, LockStore, None])
         )
         return _log_and_get_default_number_of_workers()
 
-    if _lock_store_is_redis_lock_store(lock_store):
+    if sharded or _lock_store_is_redis_lock_store(lock_store):
         logger.debug(f"Using {env_value} Sanic workers.")
         return env_value
 
     logger.debug(
         f"Unable to assign desired number of Sanic workers ({env_value}) as "
-        f"no `RedisLockStore` endpoint configuration has been found."
+        f"no `RedisLockStore` endpoint configuration has been found and messages "
+        f"aren't routed to the workers by sender ID."
     )
     return _log_and_get_default_number_of_workers()
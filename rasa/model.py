@@ -43,6 +43,12 @@ FINGERPRINT_RASA_VERSION_KEY = "version"
 FINGERPRINT_STORIES_KEY = "stories"
 FINGERPRINT_NLU_DATA_KEY = "messages"
 FINGERPRINT_TRAINED_AT_KEY = "trained_at"
+FINGERPRINT_POLICIES_KEY = "policies"
+FINGERPRINT_NLU_COMPONENTS_KEY = "nlu-components"
+
+# Subdirectory of the training directory to which the parts of the previous
+# model are moved which can be reused by the new model
+PREVIOUS_MODEL_SUBDIRECTORY_NAME = "previous"
 
 
 class Section(NamedTuple):
@@ -82,6 +88,8 @@ class FingerprintComparisonResult:
         core: bool = True,
         nlg: bool = True,
         force_training: bool = False,
+        reused_policies: Optional[Dict[int, int]] = None,
+        reused_nlu_components: Optional[Dict[int, int]] = None,
     ):
         """Creates a `FingerprintComparisonResult` instance.
 
@@ -90,11 +98,18 @@ class FingerprintComparisonResult:
             core: `True` if the Core model should be retrained.
             nlg: `True` if the templates in the domain should be updated.
             force_training: `True` if a training of all parts is forced.
+            reused_policies: Maps the index of a policy which doesn't have to be
+                retrained to the index of the policy in the previous model.
+            reused_nlu_components: Maps the index of an NLU component which
+                doesn't have to be retrained to the index of the component in
+                the previous model.
         """
         self.nlu = nlu
         self.core = core
         self.nlg = nlg
         self.force_training = force_training
+        self.reused_policies = reused_policies or {}
+        self.reused_nlu_components = reused_nlu_components or {}
 
     def is_training_required(self) -> bool:
         """Check if anything has to be retrained."""
@@ -289,7 +304,7 @@ async def model_fingerprint(file_importer: "TrainingDataImporter") -> Fingerprin
     templates = domain_dict.pop("responses")
     domain_without_nlg = Domain.from_dict(domain_dict)
 
-    return {
+    fingerprint = {
         FINGERPRINT_CONFIG_KEY: _get_hash_of_config(
             config, exclude_keys=CONFIG_MANDATORY_KEYS
         ),
@@ -306,6 +321,12 @@ async def model_fingerprint(file_importer: "TrainingDataImporter") -> Fingerprin
         FINGERPRINT_TRAINED_AT_KEY: time.time(),
         FINGERPRINT_RASA_VERSION_KEY: rasa.__version__,
     }
+    fingerprint[FINGERPRINT_POLICIES_KEY] = _get_hashes_of_policies(config, fingerprint)
+    fingerprint[FINGERPRINT_NLU_COMPONENTS_KEY] = _get_hashes_of_nlu_components(
+        config, fingerprint
+    )
+
+    return fingerprint
 
 
 def _get_hash_of_config(
@@ -323,6 +344,68 @@ def _get_hash_of_config(
     return get_dict_hash(sub_config)
 
 
+def _get_hashes_of_policies(
+    config: Optional[Dict], fingerprint: Fingerprint
+) -> List[Text]:
+    """Fingerprints every policy by its configuration and the training data it is
+    trained on."""
+
+    if not config or not isinstance(config.get("policies"), list):
+        return []
+
+    # everything which is relevant for the Core model except the configuration
+    # of the other policies
+    training_data_hash = get_dict_hash(
+        {
+            k: fingerprint.get(k)
+            for k in SECTION_CORE.relevant_keys
+            if k != FINGERPRINT_CONFIG_CORE_KEY
+        }
+    )
+
+    return [
+        get_dict_hash({"policy": policy, "data": training_data_hash})
+        for policy in config["policies"]
+    ]
+
+
+def _get_hashes_of_nlu_components(
+    config: Optional[Dict], fingerprint: Fingerprint
+) -> List[Text]:
+    """Fingerprints every component of the NLU pipeline by its configuration,
+    the configuration of the components before it and the NLU training data.
+
+    A component is trained on what the components before it extracted from the
+    training data, so it can only be reused if none of them changed."""
+
+    if not config:
+        return []
+
+    pipeline = config.get("pipeline")
+    if isinstance(pipeline, str):
+        from rasa.nlu import registry
+
+        pipeline = registry.pipeline_template(pipeline)
+    if not isinstance(pipeline, list):
+        return []
+
+    training_data_hash = get_dict_hash(
+        {
+            "language": config.get("language"),
+            **{
+                k: fingerprint.get(k)
+                for k in SECTION_NLU.relevant_keys
+                if k != FINGERPRINT_CONFIG_NLU_KEY
+            },
+        }
+    )
+
+    return [
+        get_dict_hash({"pipeline": pipeline[: i + 1], "data": training_data_hash})
+        for i in range(len(pipeline))
+    ]
+
+
 def fingerprint_from_path(model_path: Text) -> Fingerprint:
     """Load a persisted fingerprint.
 
@@ -386,6 +469,18 @@ def move_model(source: Text, target: Text) -> bool:
         return False
 
 
+def _reusable_parts(
+    old_hashes: Optional[List[Text]], new_hashes: Optional[List[Text]]
+) -> Dict[int, int]:
+    """Maps the index of every part of the new model to the index of the part of
+    the old model with the same fingerprint."""
+
+    old_indices = {h: i for i, h in enumerate(old_hashes or [])}
+    return {
+        i: old_indices[h] for i, h in enumerate(new_hashes or []) if h in old_indices
+    }
+
+
 def should_retrain(
     new_fingerprint: Fingerprint, old_model: Text, train_path: Text
 ) -> FingerprintComparisonResult:
@@ -398,7 +493,10 @@ def should_retrain(
 
     Returns:
         A FingerprintComparisonResult object indicating whether Rasa Core and/or Rasa NLU needs
-        to be retrained or not.
+        to be retrained or not. If they need to be retrained, the trained policies and
+        NLU components of the old model which didn't change are moved to the
+        `PREVIOUS_MODEL_SUBDIRECTORY_NAME` subdirectory of `train_path` so that they
+        can be reused.
 
     """
     fingerprint_comparison = FingerprintComparisonResult()
@@ -427,6 +525,18 @@ def should_retrain(
             target_path = os.path.join(train_path, DEFAULT_CORE_SUBDIRECTORY_NAME)
             core_merge_failed = not move_model(old_core, target_path)
             fingerprint_comparison.core = core_merge_failed
+        elif old_core:
+            reused_policies = _reusable_parts(
+                last_fingerprint.get(FINGERPRINT_POLICIES_KEY),
+                new_fingerprint.get(FINGERPRINT_POLICIES_KEY),
+            )
+            target_path = os.path.join(
+                train_path,
+                PREVIOUS_MODEL_SUBDIRECTORY_NAME,
+                DEFAULT_CORE_SUBDIRECTORY_NAME,
+            )
+            if reused_policies and move_model(old_core, target_path):
+                fingerprint_comparison.reused_policies = reused_policies
 
         if not fingerprint_comparison.should_retrain_nlg() and core_merge_failed:
             # If moving the Core model failed, we should also retrain NLG
@@ -435,6 +545,16 @@ def should_retrain(
         if not fingerprint_comparison.should_retrain_nlu():
             target_path = os.path.join(train_path, "nlu")
             fingerprint_comparison.nlu = not move_model(old_nlu, target_path)
+        elif old_nlu:
+            reused_nlu_components = _reusable_parts(
+                last_fingerprint.get(FINGERPRINT_NLU_COMPONENTS_KEY),
+                new_fingerprint.get(FINGERPRINT_NLU_COMPONENTS_KEY),
+            )
+            target_path = os.path.join(
+                train_path, PREVIOUS_MODEL_SUBDIRECTORY_NAME, "nlu"
+            )
+            if reused_nlu_components and move_model(old_nlu, target_path):
+                fingerprint_comparison.reused_nlu_components = reused_nlu_components
 
         return fingerprint_comparison
 
@@ -56,6 +56,8 @@ class EmbeddingIntentClassifier(Component):
 
     provides = ["intent", "intent_ranking"]
 
+    modifies_training_data = False
+
     requires = [
         any_of(
             DENSE_FEATURE_NAMES[TEXT_ATTRIBUTE], SPARSE_FEATURE_NAMES[TEXT_ATTRIBUTE]
@@ -770,7 +772,9 @@ class EmbeddingIntentClassifier(Component):
             self._train_op = tf.train.AdamOptimizer().minimize(loss)
 
             # train tensorflow graph
-            self.session = tf.Session(config=self._tf_config)
+            self.session = tf.Session(
+                config=train_utils.tf_config_for_training(self._tf_config)
+            )
             train_utils.train_tf_dataset(
                 train_init_op,
                 eval_init_op,
@@ -796,50 +800,47 @@ class EmbeddingIntentClassifier(Component):
     ) -> Tuple[np.ndarray, List[float]]:
         """Calculate message similarities"""
 
-        message_sim = self.session.run(
+        return self._calculate_batch_message_sim(batch, batch_size=1)[0]
+
+    # noinspection PyPep8Naming
+    def _calculate_batch_message_sim(
+        self, batch: Tuple[np.ndarray], batch_size: int
+    ) -> List[Tuple[np.ndarray, List[float]]]:
+        """Calculate message similarities for every message in the batch
+        with a single run of the tf session"""
+
+        batch_sim = self.session.run(
             self.pred_confidence,
             feed_dict={
                 _x_in: _x for _x_in, _x in zip(self.batch_in, batch) if _x is not None
             },
         )
 
-        message_sim = message_sim.flatten()  # sim is a matrix
+        # sim is a matrix, one row per message
+        batch_sim = batch_sim.reshape(batch_size, -1)
 
-        label_ids = message_sim.argsort()[::-1]
+        results = []
+        for message_sim in batch_sim:
+            label_ids = message_sim.argsort()[::-1]
 
-        if self.loss_type == "softmax" and self.ranking_length > 0:
-            message_sim = train_utils.normalize(message_sim, self.ranking_length)
+            if self.loss_type == "softmax" and self.ranking_length > 0:
+                message_sim = train_utils.normalize(message_sim, self.ranking_length)
 
-        message_sim[::-1].sort()
+            message_sim[::-1].sort()
 
-        # transform sim to python list for JSON serializing
-        return label_ids, message_sim.tolist()
+            # transform sim to python list for JSON serializing
+            results.append((label_ids, message_sim.tolist()))
 
-    def predict_label(
-        self, message: "Message"
+        return results
+
+    def _label_and_ranking(
+        self, label_ids: np.ndarray, message_sim: List[float]
     ) -> Tuple[Dict[Text, Any], List[Dict[Text, Any]]]:
-        """Predicts the intent of the provided message."""
+        """Create the label and the label ranking from the sorted similarities."""
 
         label = {"name": None, "confidence": 0.0}
         label_ranking = []
 
-        if self.session is None:
-            logger.error(
-                "There is no trained tf.session: "
-                "component is either not trained or "
-                "didn't receive enough training data."
-            )
-            return label, label_ranking
-
-        # create session data from message and convert it into a batch of 1
-        session_data = self._create_session_data([message])
-        batch = train_utils.prepare_batch(
-            session_data, tuple_sizes=self.batch_tuple_sizes
-        )
-
-        # load tf graph and session
-        label_ids, message_sim = self._calculate_message_sim(batch)
-
         # if X contains all zeros do not predict some label
         if label_ids.size > 0:
             label = {
@@ -861,13 +862,53 @@ class EmbeddingIntentClassifier(Component):
 
         return label, label_ranking
 
+    def predict_label(
+        self, message: "Message"
+    ) -> Tuple[Dict[Text, Any], List[Dict[Text, Any]]]:
+        """Predicts the intent of the provided message."""
+
+        return self.predict_labels([message])[0]
+
+    def predict_labels(
+        self, messages: List["Message"]
+    ) -> List[Tuple[Dict[Text, Any], List[Dict[Text, Any]]]]:
+        """Predicts the intents of the provided messages as a single batch."""
+
+        if self.session is None:
+            logger.error(
+                "There is no trained tf.session: "
+                "component is either not trained or "
+                "didn't receive enough training data."
+            )
+            return [({"name": None, "confidence": 0.0}, []) for _ in messages]
+
+        # create session data from messages and convert it into a single batch
+        session_data = self._create_session_data(messages)
+        batch = train_utils.prepare_batch(
+            session_data, tuple_sizes=self.batch_tuple_sizes
+        )
+
+        # load tf graph and session
+        batch_sim = self._calculate_batch_message_sim(batch, len(messages))
+
+        return [
+            self._label_and_ranking(label_ids, message_sim)
+            for label_ids, message_sim in batch_sim
+        ]
+
     def process(self, message: "Message", **kwargs: Any) -> None:
         """Return the most likely label and its similarity to the input."""
 
-        label, label_ranking = self.predict_label(message)
+        self.process_batch([message], **kwargs)
 
-        message.set("intent", label, add_to_output=True)
-        message.set("intent_ranking", label_ranking, add_to_output=True)
+    def process_batch(self, messages: List["Message"], **kwargs: Any) -> None:
+        """Predict the most likely labels of several messages at once."""
+
+        for message, (label, label_ranking) in zip(
+            messages, self.predict_labels(messages)
+        ):
+            message.set("intent", label, add_to_output=True)
+            message.set("intent_ranking", label_ranking, add_to_output=True)
 
     def persist(self, file_name: Text, model_dir: Text) -> Dict[Text, Any]:
         """Persist this model into the passed directory.
@@ -31,6 +31,8 @@ class KeywordIntentClassifier(Component):
 
     provides = [INTENT_ATTRIBUTE]
 
+    modifies_training_data = False
+
     defaults = {"case_sensitive": True}
 
     def __init__(
@@ -16,6 +16,8 @@ class MitieIntentClassifier(Component):
 
     provides = [INTENT_ATTRIBUTE]
 
+    modifies_training_data = False
+
     requires = [TOKENS_NAMES[TEXT_ATTRIBUTE], "mitie_feature_extractor", "mitie_file"]
 
     def __init__(
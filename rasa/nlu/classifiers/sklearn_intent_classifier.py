@@ -28,6 +28,8 @@ class SklearnIntentClassifier(Component):
 
     provides = ["intent", "intent_ranking"]
 
+    modifies_training_data = False
+
     requires = [DENSE_FEATURE_NAMES[TEXT_ATTRIBUTE]]
 
     defaults = {
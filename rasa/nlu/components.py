@@ -223,6 +223,14 @@ class Component(metaclass=ComponentMetaclass):
     # provided properties from the previous components.
     requires = []
 
+    # Whether the component changes the training data during training, e.g.
+    # tokenizers and featurizers add tokens and features to the training
+    # examples which the following components are trained on. Components
+    # which don't can be reused from a previously trained model if
+    # neither their configuration nor their training data changed. Their
+    # `train` must not return context updates, as it's skipped then.
+    modifies_training_data = True
+
     # Defines the default configuration parameters of a component
     # these values can be overwritten in the pipeline configuration
     # of the model. The component should choose sensible defaults
@@ -341,6 +349,17 @@ class Component(metaclass=ComponentMetaclass):
         of components previous to this one."""
         pass
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Process a batch of incoming messages.
+
+        Components which can process several messages at once more
+        efficiently (e.g. with a single model prediction) should overwrite
+        this method. By default every message is passed to
+        :meth:`rasa.nlu.components.Component.process` on its own."""
+
+        for message in messages:
+            self.process(message, **kwargs)
+
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this component to disk for future loading."""
 
@@ -43,3 +43,5 @@ DEFAULT_OPEN_UTTERANCE_TYPE = "default"
 OPEN_UTTERANCE_PREDICTION_KEY = "response"
 OPEN_UTTERANCE_RANKING_KEY = "ranking"
 RESPONSE_IDENTIFIER_DELIMITER = "/"
+
+DEFAULT_PARSE_BATCH_SIZE = 64
@@ -47,6 +47,8 @@ class CRFEntityExtractor(EntityExtractor):
 
     provides = [ENTITIES_ATTRIBUTE]
 
+    modifies_training_data = False
+
     requires = [TOKENS_NAMES[TEXT_ATTRIBUTE]]
 
     defaults = {
@@ -16,6 +16,8 @@ class EntitySynonymMapper(EntityExtractor):
 
     provides = [ENTITIES_ATTRIBUTE]
 
+    modifies_training_data = False
+
     def __init__(
         self,
         component_config: Optional[Dict[Text, Any]] = None,
@@ -21,6 +21,8 @@ class MitieEntityExtractor(EntityExtractor):
 
     provides = [ENTITIES_ATTRIBUTE]
 
+    modifies_training_data = False
+
     requires = [TOKENS_NAMES[TEXT_ATTRIBUTE], "mitie_feature_extractor", "mitie_file"]
 
     def __init__(self, component_config: Optional[Dict[Text, Any]] = None, ner=None):
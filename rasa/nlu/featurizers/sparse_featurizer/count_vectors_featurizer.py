@@ -407,21 +407,33 @@ class CountVectorsFeaturizer(Featurizer):
     ) -> List[scipy.sparse.coo_matrix]:
         X = []
 
-        for i, tokens in enumerate(all_tokens):
-            # vectorizer.transform returns a sparse matrix of size
-            # [n_samples, n_features]
-            # set input to list of tokens if sequence should be returned
-            # otherwise join all tokens to a single string and pass that as a list
-            tokens_without_cls = tokens
-            if attribute in [TEXT_ATTRIBUTE, RESPONSE_ATTRIBUTE]:
-                tokens_without_cls = tokens[:-1]
-
-            seq_vec = self.vectorizers[attribute].transform(tokens_without_cls)
+        # set input to list of tokens if sequence should be returned
+        # otherwise join all tokens to a single string and pass that as a list
+        all_tokens_without_cls = all_tokens
+        if attribute in [TEXT_ATTRIBUTE, RESPONSE_ATTRIBUTE]:
+            all_tokens_without_cls = [tokens[:-1] for tokens in all_tokens]
+
+        # vectorizer.transform returns a sparse matrix of size
+        # [n_samples, n_features]; the tokens of all examples are transformed
+        # at once and the rows are split up per example afterwards
+        flat_tokens = [token for tokens in all_tokens_without_cls for token in tokens]
+        seq_vecs = self.vectorizers[attribute].transform(flat_tokens).tocsr()
+
+        if attribute in [TEXT_ATTRIBUTE, RESPONSE_ATTRIBUTE]:
+            tokens_texts = [" ".join(tokens) for tokens in all_tokens_without_cls]
+            cls_vecs = self.vectorizers[attribute].transform(tokens_texts).tocsr()
+        else:
+            cls_vecs = None
+
+        start = 0
+        for i, tokens_without_cls in enumerate(all_tokens_without_cls):
+            end = start + len(tokens_without_cls)
+            seq_vec = seq_vecs[start:end]
             seq_vec.sort_indices()
+            start = end
 
-            if attribute in [TEXT_ATTRIBUTE, RESPONSE_ATTRIBUTE]:
-                tokens_text = [" ".join(tokens_without_cls)]
-                cls_vec = self.vectorizers[attribute].transform(tokens_text)
+            if cls_vecs is not None:
+                cls_vec = cls_vecs[i]
                 cls_vec.sort_indices()
 
                 x = scipy.sparse.vstack([seq_vec, cls_vec])
@@ -502,6 +514,11 @@ class CountVectorsFeaturizer(Featurizer):
     def process(self, message: Message, **kwargs: Any) -> None:
         """Process incoming message and compute and set features"""
 
+        self.process_batch([message], **kwargs)
+
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Compute and set features for several incoming messages at once."""
+
         if self.vectorizers is None:
             logger.error(
                 "There is no trained CountVectorizer: "
@@ -511,21 +528,23 @@ class CountVectorsFeaturizer(Featurizer):
             return
 
         attribute = TEXT_ATTRIBUTE
-        message_tokens = self._get_processed_message_tokens_by_attribute(
-            message, attribute
-        )
+        all_message_tokens = [
+            self._get_processed_message_tokens_by_attribute(message, attribute)
+            for message in messages
+        ]
 
-        # features shape (1, seq, dim)
-        features = self._create_sequence(attribute, [message_tokens])
+        # features shape (batch, seq, dim)
+        features = self._create_sequence(attribute, all_message_tokens)
 
-        message.set(
-            SPARSE_FEATURE_NAMES[attribute],
-            self._combine_with_existing_sparse_features(
-                message,
-                features[0],  # 0 -> batch dimension
-                feature_name=SPARSE_FEATURE_NAMES[attribute],
-            ),
-        )
+        for message, message_features in zip(messages, features):
+            message.set(
+                SPARSE_FEATURE_NAMES[attribute],
+                self._combine_with_existing_sparse_features(
+                    message,
+                    message_features,
+                    feature_name=SPARSE_FEATURE_NAMES[attribute],
+                ),
+            )
 
     def _collect_vectorizer_vocabularies(self) -> Dict[Text, Optional[Dict[Text, int]]]:
         """Get vocabulary for all attributes"""
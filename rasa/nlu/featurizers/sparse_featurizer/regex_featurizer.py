@@ -2,7 +2,7 @@ import logging
 import os
 import re
 import typing
-from typing import Any, Dict, List, Optional, Text, Union
+from typing import Any, Dict, List, Optional, Pattern, Text, Tuple, Union
 
 import numpy as np
 
@@ -55,16 +55,35 @@ class RegexFeaturizer(Featurizer):
         self.known_patterns = training_data.regex_features
         self._add_lookup_table_regexes(training_data.lookup_tables)
 
+        compiled_patterns = self._compile_patterns()
         for example in training_data.training_examples:
             for attribute in [TEXT_ATTRIBUTE, RESPONSE_ATTRIBUTE]:
-                self._text_features_with_regex(example, attribute)
+                self._text_features_with_regex(example, attribute, compiled_patterns)
 
     def process(self, message: Message, **kwargs: Any) -> None:
         self._text_features_with_regex(message, TEXT_ATTRIBUTE)
 
-    def _text_features_with_regex(self, message: Message, attribute: Text) -> None:
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        # compile the patterns only once for the whole batch
+        compiled_patterns = self._compile_patterns()
+        for message in messages:
+            self._text_features_with_regex(message, TEXT_ATTRIBUTE, compiled_patterns)
+
+    def _compile_patterns(self) -> List[Tuple[Text, Pattern]]:
+        """Compiles the known patterns, returns tuples of name and regex."""
+        return [
+            (pattern["name"], re.compile(pattern["pattern"]))
+            for pattern in self.known_patterns
+        ]
+
+    def _text_features_with_regex(
+        self,
+        message: Message,
+        attribute: Text,
+        compiled_patterns: Optional[List[Tuple[Text, Pattern]]] = None,
+    ) -> None:
         if self.known_patterns:
-            extras = self._features_for_patterns(message, attribute)
+            extras = self._features_for_patterns(message, attribute, compiled_patterns)
             features = self._combine_with_existing_sparse_features(
                 message, extras, feature_name=SPARSE_FEATURE_NAMES[attribute]
             )
@@ -80,7 +99,10 @@ class RegexFeaturizer(Featurizer):
             self.known_patterns.append(lookup_regex)
 
     def _features_for_patterns(
-        self, message: Message, attribute: Text
+        self,
+        message: Message,
+        attribute: Text,
+        compiled_patterns: Optional[List[Tuple[Text, Pattern]]] = None,
     ) -> scipy.sparse.coo_matrix:
         """Checks which known patterns match the message.
 
@@ -88,18 +110,21 @@ class RegexFeaturizer(Featurizer):
         regexes did match. Furthermore, if the
         message is tokenized, the function will mark all tokens with a dict
         relating the name of the regex to whether it was matched."""
+        if compiled_patterns is None:
+            compiled_patterns = self._compile_patterns()
+
         tokens = message.get(TOKENS_NAMES[attribute], [])
         seq_length = len(tokens)
 
-        vec = np.zeros([seq_length, len(self.known_patterns)])
+        vec = np.zeros([seq_length, len(compiled_patterns)])
 
-        for pattern_index, pattern in enumerate(self.known_patterns):
-            matches = re.finditer(pattern["pattern"], message.text)
+        for pattern_index, (pattern_name, regex) in enumerate(compiled_patterns):
+            matches = regex.finditer(message.text)
             matches = list(matches)
 
             for token_index, t in enumerate(tokens):
                 patterns = t.get("pattern", default={})
-                patterns[pattern["name"]] = False
+                patterns[pattern_name] = False
 
                 if t.text == CLS_TOKEN:
                     # make sure to set all patterns for the CLS token to False
@@ -109,7 +134,7 @@ class RegexFeaturizer(Featurizer):
 
                 for match in matches:
                     if t.start < match.end() and t.end > match.start():
-                        patterns[pattern["name"]] = True
+                        patterns[pattern_name] = True
                         vec[token_index][pattern_index] = 1.0
                         if attribute in [RESPONSE_ATTRIBUTE, TEXT_ATTRIBUTE]:
                             # CLS token vector should contain all patterns
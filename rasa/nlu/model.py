@@ -133,10 +133,16 @@ class Trainer:
         self.skip_validation = skip_validation
         self.training_data = None  # type: Optional[TrainingData]
 
+        # trained components of a previous model which are used instead of
+        # training the components again
+        self.previous_model_metadata = None  # type: Optional[Metadata]
+        self.reused_components = {}  # type: Dict[int, int]
+
         if component_builder is None:
             # If no builder is passed, every interpreter creation will result in
             # a new builder. hence, no components are reused.
             component_builder = components.ComponentBuilder()
+        self.component_builder = component_builder
 
         # Before instantiating the component classes, lets check if all
         # required packages are available
@@ -161,6 +167,43 @@ class Trainer:
 
         return pipeline
 
+    def reuse_trained_components(
+        self, model_dir: Text, component_indices: Dict[int, int]
+    ) -> None:
+        """Uses trained components of a persisted model instead of training them.
+
+        Only components which don't modify the training data can be reused, as
+        the components after them are trained on the modified training data.
+        Tokenizers and featurizers are always trained again: replaying their
+        `process` over the training data doesn't add what their `train` adds
+        (e.g. tokens and features of intents and responses). Reused components
+        don't update the training context, their `train` is skipped.
+
+        Args:
+            model_dir: Directory of the persisted model.
+            component_indices: Maps the index of a component of the pipeline to
+                the index of the trained component in the persisted model.
+        """
+
+        self.previous_model_metadata = Metadata.load(model_dir)
+        self.reused_components = {
+            i: persisted_index
+            for i, persisted_index in component_indices.items()
+            if not self.pipeline[i].modifies_training_data
+        }
+
+    def _load_reused_component(self, index: int, context: Dict[Text, Any]) -> Component:
+        metadata = self.previous_model_metadata
+        component_meta = metadata.for_component(self.reused_components[index])
+        component = self.component_builder.load_component(
+            component_meta, metadata.model_dir, metadata, **context
+        )
+        logger.info(
+            f"Reusing trained component {component.name} of the previous model, "
+            f"as neither its configuration nor its training data changed."
+        )
+        return component
+
     def train(self, data: TrainingData, **kwargs: Any) -> "Interpreter":
         """Trains the underlying pipeline using the provided training data."""
 
@@ -186,6 +229,10 @@ class Trainer:
         working_data = copy.deepcopy(data)
 
         for i, component in enumerate(self.pipeline):
+            if i in self.reused_components:
+                self.pipeline[i] = self._load_reused_component(i, context)
+                continue
+
             logger.info(f"Starting to train component {component.name}")
             component.prepare_partial_processing(self.pipeline[:i], context)
             updates = component.train(working_data, self.config, **context)
@@ -378,3 +425,47 @@ class Interpreter:
         output = self.default_output_attributes()
         output.update(message.as_dict(only_output_properties=only_output_properties))
         return output
+
+    def parse_batch(
+        self,
+        texts: List[Text],
+        time: Optional[datetime.datetime] = None,
+        only_output_properties: bool = True,
+        times: Optional[List[Any]] = None,
+    ) -> List[Dict[Text, Any]]:
+        """Parse several input texts at once and return the pipeline results.
+
+        The messages are passed through the pipeline together so that
+        components can process the whole batch at once (see
+        :meth:`rasa.nlu.components.Component.process_batch`). The results are
+        returned in the order of `texts`. `times` holds the time of each text
+        and is used instead of `time` if it's given."""
+
+        if times is None:
+            times = [time] * len(texts)
+
+        messages = [
+            Message(text, self.default_output_attributes(), time=text_time)
+            for text, text_time in zip(texts, times)
+            if text
+        ]
+
+        if messages:
+            for component in self.pipeline:
+                component.process_batch(messages, **self.context)
+
+        outputs = []
+        processed = iter(messages)
+        for text in texts:
+            output = self.default_output_attributes()
+            if text:
+                message = next(processed)
+                output.update(
+                    message.as_dict(only_output_properties=only_output_properties)
+                )
+            else:
+                # see `parse` for why empty texts don't run through the pipeline
+                output["text"] = ""
+            outputs.append(output)
+
+        return outputs
@@ -1,6 +1,6 @@
 import logging
 import typing
-from typing import Any, Dict, Text
+from typing import Any, Dict, List, Text
 
 from rasa.nlu.components import any_of
 from rasa.nlu.classifiers.embedding_intent_classifier import EmbeddingIntentClassifier
@@ -173,7 +173,10 @@ class ResponseSelector(EmbeddingIntentClassifier):
     def process(self, message: "Message", **kwargs: Any) -> None:
         """Return the most likely response and its similarity to the input."""
 
-        label, label_ranking = self.predict_label(message)
+        self.process_batch([message], **kwargs)
+
+    def process_batch(self, messages: List["Message"], **kwargs: Any) -> None:
+        """Predict the most likely responses of several messages at once."""
 
         selector_key = (
             self.retrieval_intent
@@ -185,6 +188,9 @@ class ResponseSelector(EmbeddingIntentClassifier):
             f"Adding following selector key to message property: {selector_key}"
         )
 
-        prediction_dict = {"response": label, "ranking": label_ranking}
+        for message, (label, label_ranking) in zip(
+            messages, self.predict_labels(messages)
+        ):
+            prediction_dict = {"response": label, "ranking": label_ranking}
 
-        self._set_message_property(message, prediction_dict, selector_key)
+            self._set_message_property(message, prediction_dict, selector_key)
@@ -23,6 +23,7 @@ import rasa.utils.io as io_utils
 from rasa.constants import TEST_DATA_FILE, TRAIN_DATA_FILE
 from rasa.nlu.constants import (
     DEFAULT_OPEN_UTTERANCE_TYPE,
+    DEFAULT_PARSE_BATCH_SIZE,
     RESPONSE_SELECTOR_PROPERTY_NAME,
     OPEN_UTTERANCE_PREDICTION_KEY,
     EXTRACTOR_ATTRIBUTE,
@@ -34,6 +35,7 @@ from rasa.nlu.utils import write_to_file
 from rasa.nlu.components import ComponentBuilder
 from rasa.nlu.config import RasaNLUModelConfig
 from rasa.nlu.model import Interpreter, Trainer, TrainingData
+from rasa.nlu.training_data import Message
 from rasa.nlu.components import Component
 from rasa.nlu.tokenizers.tokenizer import Token
 
@@ -938,8 +940,10 @@ def get_eval_data(
 
     should_eval_entities = is_entity_extractor_present(interpreter)
 
-    for example in tqdm(test_data.training_examples):
-        result = interpreter.parse(example.text, only_output_properties=False)
+    for example, result in tqdm(
+        _parse_examples(interpreter, test_data.training_examples),
+        total=len(test_data.training_examples),
+    ):
 
         if should_eval_intents:
             intent_prediction = result.get("intent", {}) or {}
@@ -992,6 +996,21 @@ def get_eval_data(
     return intent_results, response_selection_results, entity_results
 
 
+def _parse_examples(
+    interpreter: Interpreter,
+    examples: List[Message],
+    batch_size: int = DEFAULT_PARSE_BATCH_SIZE,
+) -> Iterator[Tuple[Message, Dict[Text, Any]]]:
+    """Parses the examples in batches and yields every example with its result."""
+
+    for start in range(0, len(examples), batch_size):
+        batch = examples[start : start + batch_size]
+        results = interpreter.parse_batch(
+            [example.text for example in batch], only_output_properties=False
+        )
+        yield from zip(batch, results)
+
+
 def get_entity_extractors(interpreter: Interpreter) -> Set[Text]:
     """Finds the names of entity extractors used by the interpreter.
     Processors are removed since they do not
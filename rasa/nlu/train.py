@@ -60,9 +60,15 @@ async def train(
     component_builder: Optional[ComponentBuilder] = None,
     training_data_endpoint: Optional[EndpointConfig] = None,
     persist_nlu_training_data: bool = False,
+    previous_model: Optional[Text] = None,
+    reused_components: Optional[Dict[int, int]] = None,
     **kwargs: Any,
 ) -> Tuple[Trainer, Interpreter, Optional[Text]]:
-    """Loads the trainer and the data and runs the training of the model."""
+    """Loads the trainer and the data and runs the training of the model.
+
+    If `previous_model` is given, the components of the pipeline which are
+    mapped to a component of the previous model by `reused_components` are
+    not trained again but loaded from the previous model."""
     from rasa.importers.importer import TrainingDataImporter
 
     if not isinstance(nlu_config, RasaNLUModelConfig):
@@ -72,6 +78,8 @@ async def train(
     # WARN: there is still a race condition if a model with the same name is
     # trained in another subprocess
     trainer = Trainer(nlu_config, component_builder)
+    if previous_model and reused_components:
+        trainer.reuse_trained_components(previous_model, reused_components)
     persistor = create_persistor(storage)
     if training_data_endpoint is not None:
         training_data = await load_data_from_endpoint(
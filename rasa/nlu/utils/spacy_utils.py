@@ -231,6 +231,26 @@ class SpacyNLP(Component):
 
         message.set(SPACY_DOCS[TEXT_ATTRIBUTE], self.doc_for_text(message.text))
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Creates the docs of all messages with a single call to spaCy's pipe."""
+
+        indexed_samples = [
+            (idx, self.preprocess_text(message.text))
+            for idx, message in enumerate(messages)
+        ]
+        samples_to_pipe, empty_samples = self.filter_training_samples_by_content(
+            indexed_samples
+        )
+
+        docs = self.merge_content_lists(
+            indexed_samples,
+            self.process_content_bearing_samples(samples_to_pipe)
+            + self.process_non_content_bearing_samples(empty_samples),
+        )
+
+        for message, (_, doc) in zip(messages, docs):
+            message.set(SPACY_DOCS[TEXT_ATTRIBUTE], doc)
+
     @classmethod
     def load(
         cls,
@@ -18,11 +18,13 @@ import rasa.utils.io
 from rasa import model
 from rasa.constants import (
     DEFAULT_DOMAIN_PATH,
+    DEFAULT_MAX_PARSE_BATCH_TEXTS,
     DEFAULT_MODELS_PATH,
     DOCS_BASE_URL,
+    ENV_MAX_PARSE_BATCH_TEXTS,
     MINIMUM_COMPATIBLE_VERSION,
 )
-from rasa.core.agent import Agent, load_agent
+from rasa.core.agent import Agent, close_replaced_interpreter, load_agent
 from rasa.core.brokers.broker import EventBroker
 from rasa.core.channels.channel import (
     CollectingOutputChannel,
@@ -31,11 +33,13 @@ from rasa.core.channels.channel import (
 )
 from rasa.core.domain import InvalidDomain
 from rasa.core.events import Event
+from rasa.core.executor import inference_executor, int_from_env
 from rasa.core.lock_store import LockStore
 from rasa.core.test import test
 from rasa.core.tracker_store import TrackerStore
 from rasa.core.trackers import DialogueStateTracker, EventVerbosity
 from rasa.core.utils import AvailableEndpoints
+from rasa.nlu.constants import DEFAULT_PARSE_BATCH_SIZE
 from rasa.nlu.emulators.no_emulator import NoEmulator
 from rasa.nlu.test import run_evaluation
 from rasa.utils.endpoints import EndpointConfig
@@ -382,6 +386,10 @@ def create_app(
     app.config.RESPONSE_TIMEOUT = 60 * 60
     configure_cors(app, cors_origins)
 
+    max_parse_batch_texts = int_from_env(
+        ENV_MAX_PARSE_BATCH_TEXTS, DEFAULT_MAX_PARSE_BATCH_TEXTS
+    )
+
     # Setup the Sanic-JWT extension
     if jwt_secret and jwt_method:
         # since we only want to check signatures, we don't actually care
@@ -430,6 +438,7 @@ def create_app(
                 or app.agent.model_directory,
                 "fingerprint": model.fingerprint_from_path(app.agent.model_directory),
                 "num_active_training_jobs": app.active_training_processes.value,
+                "inference_executor": inference_executor().metrics.as_dict(),
             }
         )
 
@@ -481,7 +490,7 @@ def create_app(
 
                 for event in events:
                     tracker.update(event, app.agent.domain)
-                app.agent.tracker_store.save(tracker)
+                await app.agent.tracker_store.save_async(tracker)
 
             return response.json(tracker.current_state(verbosity))
         except Exception as e:
@@ -533,7 +542,7 @@ def create_app(
                 )
 
                 # will override an existing tracker with the same id!
-                app.agent.tracker_store.save(tracker)
+                await app.agent.tracker_store.save_async(tracker)
 
             return response.json(tracker.current_state(verbosity))
         except Exception as e:
@@ -998,6 +1007,67 @@ def create_app(
                 500, "ParsingError", f"An unexpected error occurred. Error: {e}"
             )
 
+    @app.post("/model/parse/batch")
+    @requires_auth(app, auth_token)
+    @ensure_loaded_agent(app)
+    async def parse_batch(request: Request):
+        validate_request_body(
+            request,
+            "No text messages defined in request_body. Add a list of `texts` (or "
+            "one message per line for `text/plain` requests) to the request body "
+            "in order to obtain the intents and extracted entities.",
+        )
+        emulation_mode = request.args.get("emulation_mode")
+        emulator = _create_emulator(emulation_mode)
+
+        try:
+            batch_size = int(request.args.get("batch_size", DEFAULT_PARSE_BATCH_SIZE))
+        except ValueError:
+            raise ErrorResponse(
+                400, "BadRequest", "The `batch_size` parameter has to be an integer."
+            )
+
+        if request.content_type.startswith("text/plain"):
+            texts = [line for line in request.body.decode().splitlines() if line]
+        else:
+            texts = (request.json or {}).get("texts")
+
+        if not isinstance(texts, list) or batch_size < 1:
+            raise ErrorResponse(
+                400,
+                "BadRequest",
+                "Invalid request. Expected a list of `texts` and a positive "
+                "`batch_size`.",
+            )
+
+        if len(texts) > max_parse_batch_texts:
+            raise ErrorResponse(
+                400,
+                "BadRequest",
+                f"Too many texts. At most {max_parse_batch_texts} texts can be "
+                f"parsed per request.",
+                {"parameter": "texts", "in": "body"},
+            )
+
+        try:
+            response_data = []
+            # large requests are split up so that other requests are served
+            # in between the batches
+            for start in range(0, len(texts), batch_size):
+                parsed_data = await app.agent.parse_messages_using_nlu_interpreter(
+                    texts[start : start + batch_size]
+                )
+                response_data.extend(
+                    emulator.normalise_response_json(data) for data in parsed_data
+                )
+        except Exception as e:
+            logger.debug(traceback.format_exc())
+            raise ErrorResponse(
+                400, "ParsingError", f"An unexpected error occurred. Error: {e}"
+            )
+
+        return response.json(response_data)
+
     @app.put("/model")
     @requires_auth(app, auth_token)
     async def load_model(request: Request):
@@ -1019,9 +1089,11 @@ def create_app(
                     {"parameter": "model_server", "in": "body"},
                 )
 
+        previous_agent = app.agent
         app.agent = await _load_agent(
             model_path, model_server, remote_storage, endpoints, app.agent.lock_store
         )
+        close_replaced_interpreter(previous_agent.interpreter, app.agent.interpreter)
 
         logger.debug(f"Successfully loaded model '{model_path}'.")
         return response.json(None, status=204)
@@ -1031,7 +1103,9 @@ def create_app(
     async def unload_model(request: Request):
         model_file = app.agent.model_directory
 
+        previous_agent = app.agent
         app.agent = Agent(lock_store=app.agent.lock_store)
+        close_replaced_interpreter(previous_agent.interpreter, app.agent.interpreter)
 
         logger.debug(f"Successfully unloaded model '{model_file}'.")
         return response.json(None, status=204)
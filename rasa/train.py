@@ -1,14 +1,24 @@
 import asyncio
+import functools
+import multiprocessing
 import os
+import shutil
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import ExitStack
-from typing import Text, Optional, List, Union, Dict
+from typing import Awaitable, Callable, Text, Optional, List, Union, Dict
 
 from rasa.importers.importer import TrainingDataImporter
 from rasa import model
 from rasa.model import FingerprintComparisonResult
 from rasa.core.domain import Domain
-from rasa.utils.common import TempDirectoryPath
+from rasa.utils.common import (
+    TempDirectoryPath,
+    can_be_sent_to_processes,
+    init_training_job_process,
+    threads_per_training_job,
+)
 
 from rasa.cli.utils import (
     print_success,
@@ -17,7 +27,11 @@ from rasa.cli.utils import (
     bcolors,
     print_color,
 )
-from rasa.constants import DEFAULT_MODELS_PATH, DEFAULT_CORE_SUBDIRECTORY_NAME
+from rasa.constants import (
+    DEFAULT_MODELS_PATH,
+    DEFAULT_CORE_SUBDIRECTORY_NAME,
+    DEFAULT_TRAINING_CACHE_DIRECTORY_NAME,
+)
 
 
 def train(
@@ -214,13 +228,74 @@ async def _do_training(
     if not fingerprint_comparison_result:
         fingerprint_comparison_result = FingerprintComparisonResult()
 
-    if fingerprint_comparison_result.should_retrain_core():
-        await _train_core_with_validated_data(
+    try:
+        await _train_changed_models(
+            file_importer,
+            output_path,
+            train_path,
+            fingerprint_comparison_result,
+            fixed_model_name,
+            persist_nlu_training_data,
+            additional_arguments,
+        )
+    finally:
+        # the reused parts of the previous model must not end up in the new one
+        shutil.rmtree(
+            os.path.join(train_path, model.PREVIOUS_MODEL_SUBDIRECTORY_NAME),
+            ignore_errors=True,
+        )
+
+
+async def _train_changed_models(
+    file_importer: TrainingDataImporter,
+    output_path: Text,
+    train_path: Text,
+    fingerprint_comparison_result: FingerprintComparisonResult,
+    fixed_model_name: Optional[Text],
+    persist_nlu_training_data: bool,
+    additional_arguments: Optional[Dict],
+):
+    additional_arguments = dict(additional_arguments or {})
+    training_jobs = additional_arguments.pop("training_jobs", 1)
+    threads_per_job = additional_arguments.pop("threads_per_job", None)
+
+    train_core = fingerprint_comparison_result.should_retrain_core()
+    train_nlu = fingerprint_comparison_result.should_retrain_nlu()
+    # Core and NLU share only the importer, so they can be trained in parallel
+    in_parallel = (
+        train_core
+        and train_nlu
+        and training_jobs > 1
+        and can_be_sent_to_processes(file_importer)
+    )
+    if in_parallel:
+        threads_per_job = threads_per_job or threads_per_training_job(training_jobs)
+        # NLU is trained in one of the processes, the others can train policies
+        policy_training_jobs = max(1, training_jobs - 1)
+    else:
+        policy_training_jobs = training_jobs
+
+    jobs = {}
+    if train_core:
+        if fingerprint_comparison_result.reused_policies:
+            print_color(
+                "Reusing {} unchanged policies of the previous model.".format(
+                    len(fingerprint_comparison_result.reused_policies)
+                ),
+                color=bcolors.OKBLUE,
+            )
+        jobs["Core model"] = functools.partial(
+            _train_core_with_validated_data,
             file_importer,
             output=output_path,
             train_path=train_path,
             fixed_model_name=fixed_model_name,
-            additional_arguments=additional_arguments,
+            additional_arguments={
+                **additional_arguments,
+                "training_jobs": policy_training_jobs,
+                "threads_per_job": threads_per_job,
+            },
+            reused_policies=fingerprint_comparison_result.reused_policies,
         )
     elif fingerprint_comparison_result.should_retrain_nlg():
         print_color(
@@ -236,13 +311,16 @@ async def _do_training(
             color=bcolors.OKBLUE,
         )
 
-    if fingerprint_comparison_result.should_retrain_nlu():
-        await _train_nlu_with_validated_data(
+    if train_nlu:
+        jobs["NLU model"] = functools.partial(
+            _train_nlu_with_validated_data,
             file_importer,
             output=output_path,
             train_path=train_path,
             fixed_model_name=fixed_model_name,
             persist_nlu_training_data=persist_nlu_training_data,
+            reused_components=fingerprint_comparison_result.reused_nlu_components,
+            num_threads=threads_per_job or 1,
         )
     else:
         print_color(
@@ -250,6 +328,50 @@ async def _do_training(
             color=bcolors.OKBLUE,
         )
 
+    if in_parallel:
+        print_color(
+            f"Training Core and NLU model in parallel (threads per training "
+            f"job: {threads_per_job}).",
+            color=bcolors.OKBLUE,
+        )
+        loop = asyncio.get_event_loop()
+        with ProcessPoolExecutor(
+            max_workers=len(jobs),
+            # TensorFlow doesn't support to continue in forked processes
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_training_job_process,
+            initargs=(threads_per_job,),
+        ) as executor:
+            training_times = await asyncio.gather(
+                *[
+                    loop.run_in_executor(executor, _run_training_job, job)
+                    for job in jobs.values()
+                ]
+            )
+    else:
+        training_times = []
+        for job in jobs.values():
+            start = time.time()
+            await job()
+            training_times.append(time.time() - start)
+
+    for name, training_time in zip(jobs.keys(), training_times):
+        print_color(f"{name} training took {training_time:.1f}s.", color=bcolors.OKBLUE)
+
+
+def _run_training_job(job: Callable[[], Awaitable]) -> float:
+    """Runs a training in a process of the training pool and returns how long
+    it took."""
+
+    start = time.time()
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(job())
+    finally:
+        loop.close()
+
+    return time.time() - start
+
 
 def train_core(
     domain: Union[Domain, Text],
@@ -335,8 +457,12 @@ async def _train_core_with_validated_data(
     train_path: Optional[Text] = None,
     fixed_model_name: Optional[Text] = None,
     additional_arguments: Optional[Dict] = None,
+    reused_policies: Optional[Dict[int, int]] = None,
 ) -> Optional[Text]:
-    """Train Core with validated training and config data."""
+    """Train Core with validated training and config data.
+
+    The policies in `reused_policies` are taken from the previous model which
+    `model.should_retrain` moved to `train_path` instead of training them."""
 
     import rasa.core.train
 
@@ -348,6 +474,13 @@ async def _train_core_with_validated_data(
             # Otherwise, create a temp train path and clean it up on exit.
             _train_path = stack.enter_context(TempDirectoryPath(tempfile.mkdtemp()))
 
+        additional_arguments = dict(additional_arguments or {})
+        if additional_arguments.pop("use_training_cache", True):
+            # generated and featurized training data is reused across trainings
+            additional_arguments["training_cache_dir"] = os.path.join(
+                output, DEFAULT_TRAINING_CACHE_DIRECTORY_NAME
+            )
+
         # normal (not compare) training
         print_color("Training Core model...", color=bcolors.OKBLUE)
         domain, config = await asyncio.gather(
@@ -359,6 +492,10 @@ async def _train_core_with_validated_data(
             output_path=os.path.join(_train_path, DEFAULT_CORE_SUBDIRECTORY_NAME),
             policy_config=config,
             additional_arguments=additional_arguments,
+            previous_model=_previous_model_path(
+                train_path, DEFAULT_CORE_SUBDIRECTORY_NAME
+            ),
+            reused_policies=reused_policies,
         )
         print_color("Core model training completed.", color=bcolors.OKBLUE)
 
@@ -376,6 +513,24 @@ async def _train_core_with_validated_data(
         return _train_path
 
 
+def _previous_model_path(
+    train_path: Optional[Text], subdirectory: Text
+) -> Optional[Text]:
+    """Path of the part of the previous model which was moved to `train_path` to
+    reuse what didn't change since it was trained."""
+
+    if not train_path:
+        return None
+
+    path = os.path.join(
+        train_path, model.PREVIOUS_MODEL_SUBDIRECTORY_NAME, subdirectory
+    )
+    if not os.path.isdir(path):
+        return None
+
+    return path
+
+
 def train_nlu(
     config: Text,
     nlu_data: Text,
@@ -452,8 +607,14 @@ async def _train_nlu_with_validated_data(
     train_path: Optional[Text] = None,
     fixed_model_name: Optional[Text] = None,
     persist_nlu_training_data: bool = False,
+    reused_components: Optional[Dict[int, int]] = None,
+    num_threads: int = 1,
 ) -> Optional[Text]:
-    """Train NLU with validated training and config data."""
+    """Train NLU with validated training and config data.
+
+    The components in `reused_components` are taken from the previous model
+    which `model.should_retrain` moved to `train_path` instead of training
+    them. Components which support it are trained with `num_threads` threads."""
 
     import rasa.nlu.train
 
@@ -472,6 +633,9 @@ async def _train_nlu_with_validated_data(
             _train_path,
             fixed_model_name="nlu",
             persist_nlu_training_data=persist_nlu_training_data,
+            previous_model=_previous_model_path(train_path, "nlu"),
+            reused_components=reused_components,
+            num_threads=num_threads,
         )
         print_color("NLU model training completed.", color=bcolors.OKBLUE)
 
@@ -12,6 +12,8 @@ from rasa.cli.utils import bcolors
 from rasa.constants import (
     DEFAULT_LOG_LEVEL,
     DEFAULT_LOG_LEVEL_LIBRARIES,
+    ENV_CPU_INTER_OP_CONFIG,
+    ENV_CPU_INTRA_OP_CONFIG,
     ENV_LOG_LEVEL,
     ENV_LOG_LEVEL_LIBRARIES,
     GLOBAL_USER_CONFIG_PATH,
@@ -178,6 +180,42 @@ def is_logging_disabled() -> bool:
     return log_level == "ERROR" or log_level == "WARNING"
 
 
+def threads_per_training_job(num_jobs: int) -> int:
+    """Returns how many threads each of `num_jobs` parallel trainings can use
+    without oversubscribing the CPUs."""
+
+    return max(1, (os.cpu_count() or 1) // max(1, num_jobs))
+
+
+def init_training_job_process(num_threads: int) -> None:
+    """Initializes a process which runs one of several trainings in parallel.
+
+    Logging is configured with the log level of the parent process. The
+    TensorFlow sessions created for training and OpenMP based libraries are
+    limited to `num_threads` threads."""
+
+    # the parent process stored its log level in the environment
+    set_log_level()
+    rasa.utils.io.configure_colored_logging(None)
+
+    os.environ[ENV_CPU_INTRA_OP_CONFIG] = str(num_threads)
+    os.environ[ENV_CPU_INTER_OP_CONFIG] = str(num_threads)
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+
+
+def can_be_sent_to_processes(*objects: Any) -> bool:
+    """Checks whether `objects` can be pickled to send them to other processes."""
+
+    import pickle
+
+    try:
+        pickle.dumps(objects)
+        return True
+    except Exception as e:
+        logger.debug(f"Can't send objects to other processes: {e}")
+        return False
+
+
 def sort_list_of_dicts_by_first_key(dicts: List[Dict]) -> List[Dict]:
     """Sorts a list of dictionaries by their first key."""
     return sorted(dicts, key=lambda d: list(d.keys())[0])
@@ -1,17 +1,31 @@
+import asyncio
 import logging
 import os
 
 import aiohttp
-from typing import Any, Optional, Text, Dict
+from typing import Any, Optional, Set, Text, Dict
 
 from sanic.request import Request
 
 import rasa.utils.io
-from rasa.constants import DEFAULT_REQUEST_TIMEOUT
+from rasa.constants import (
+    DEFAULT_HTTP_CONNECTION_LIMIT,
+    DEFAULT_HTTP_CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_HTTP_DNS_CACHE_TTL,
+    DEFAULT_HTTP_KEEPALIVE_TIMEOUT,
+    DEFAULT_REQUEST_TIMEOUT,
+    ENV_HTTP_CONNECTION_LIMIT,
+    ENV_HTTP_CONNECTION_LIMIT_PER_HOST,
+    ENV_HTTP_DNS_CACHE_TTL,
+    ENV_HTTP_KEEPALIVE_TIMEOUT,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# long-lived sessions of all endpoints, closed by `close_pooled_sessions`
+_pooled_sessions: Set[aiohttp.ClientSession] = set()
+
 
 def read_endpoint_config(
     filename: Text, endpoint_type: Text
@@ -62,6 +76,28 @@ def concat_url(base: Text, subpath: Optional[Text]) -> Text:
     return url + subpath
 
 
+def _create_pooled_connector() -> aiohttp.TCPConnector:
+    """Connector for pooled sessions configured by the environment."""
+
+    return aiohttp.TCPConnector(
+        limit=int(
+            os.environ.get(ENV_HTTP_CONNECTION_LIMIT, DEFAULT_HTTP_CONNECTION_LIMIT)
+        ),
+        limit_per_host=int(
+            os.environ.get(
+                ENV_HTTP_CONNECTION_LIMIT_PER_HOST,
+                DEFAULT_HTTP_CONNECTION_LIMIT_PER_HOST,
+            )
+        ),
+        keepalive_timeout=float(
+            os.environ.get(ENV_HTTP_KEEPALIVE_TIMEOUT, DEFAULT_HTTP_KEEPALIVE_TIMEOUT)
+        ),
+        ttl_dns_cache=int(
+            os.environ.get(ENV_HTTP_DNS_CACHE_TTL, DEFAULT_HTTP_DNS_CACHE_TTL)
+        ),
+    )
+
+
 class EndpointConfig:
     """Configuration for an external HTTP endpoint."""
 
@@ -84,7 +120,12 @@ class EndpointConfig:
         self.type = kwargs.pop("store_type", kwargs.pop("type", None))
         self.kwargs = kwargs
 
-    def session(self) -> aiohttp.ClientSession:
+        self._pooled_session: Optional[aiohttp.ClientSession] = None
+        self._pooled_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def session(
+        self, connector: Optional[aiohttp.BaseConnector] = None
+    ) -> aiohttp.ClientSession:
         # create authentication parameters
         if self.basic_auth:
             auth = aiohttp.BasicAuth(
@@ -97,8 +138,38 @@ class EndpointConfig:
             headers=self.headers,
             auth=auth,
             timeout=aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT),
+            connector=connector,
         )
 
+    def pooled_session(self) -> aiohttp.ClientSession:
+        """Long-lived session which keeps the connections to the endpoint alive.
+
+        In contrast to `session` the returned session must not be closed by the
+        caller. It belongs to the running event loop and is closed by
+        `close_pooled_sessions`. The size of its connection pool, the keep-alive
+        timeout of idle connections and how long DNS lookups are cached can be
+        set with the `HTTP_CONNECTION_LIMIT`, `HTTP_CONNECTION_LIMIT_PER_HOST`,
+        `HTTP_KEEPALIVE_TIMEOUT` and `HTTP_DNS_CACHE_TTL` environment variables.
+        """
+
+        loop = asyncio.get_event_loop()
+        session = self._pooled_session
+        if session is not None and not session.closed:
+            if self._pooled_session_loop is loop:
+                return session
+
+            # sessions can't be used across event loops
+            _pooled_sessions.discard(session)
+            _close_session_on_loop(session, self._pooled_session_loop)
+
+        session = self.session(_create_pooled_connector())
+
+        self._pooled_session = session
+        self._pooled_session_loop = loop
+        _pooled_sessions.add(session)
+
+        return session
+
     def combine_parameters(
         self, kwargs: Optional[Dict[Text, Any]] = None
     ) -> Dict[Text, Any]:
@@ -137,19 +208,18 @@ class EndpointConfig:
             del kwargs["headers"]
 
         url = concat_url(self.url, subpath)
-        async with self.session() as session:
-            async with session.request(
-                method,
-                url,
-                headers=headers,
-                params=self.combine_parameters(kwargs),
-                **kwargs,
-            ) as resp:
-                if resp.status >= 400:
-                    raise ClientResponseError(
-                        resp.status, resp.reason, await resp.content.read()
-                    )
-                return await getattr(resp, return_method)()
+        async with self.pooled_session().request(
+            method,
+            url,
+            headers=headers,
+            params=self.combine_parameters(kwargs),
+            **kwargs,
+        ) as resp:
+            if resp.status >= 400:
+                raise ClientResponseError(
+                    resp.status, resp.reason, await resp.content.read()
+                )
+            return await getattr(resp, return_method)()
 
     @classmethod
     def from_dict(cls, data) -> "EndpointConfig":
@@ -183,6 +253,33 @@ class EndpointConfig:
         return not self.__eq__(other)
 
 
+def _close_session_on_loop(
+    session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close a session which belongs to another event loop than the current one.
+
+    The connections of a session can only be closed by the loop which created
+    them, so closing is scheduled on that loop. If the loop was closed already,
+    its connections are gone with it."""
+
+    if loop is None or loop.is_closed():
+        session.detach()
+    else:
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+
+async def close_pooled_sessions() -> None:
+    """Close the pooled sessions of all endpoints (see
+    `EndpointConfig.pooled_session`)."""
+
+    sessions = list(_pooled_sessions)
+    _pooled_sessions.clear()
+
+    for session in sessions:
+        if not session.closed:
+            await session.close()
+
+
 class ClientResponseError(aiohttp.ClientError):
     def __init__(self, status: int, message: Text, text: Text) -> None:
         self.status = status
@@ -1,5 +1,6 @@
 from collections import defaultdict
 import logging
+import os
 import scipy.sparse
 import typing
 from typing import List, Optional, Text, Dict, Tuple, Union, Generator, Callable, Any
@@ -13,6 +14,7 @@ from tensor2tensor.models.transformer import (
     transformer_encoder,
 )
 from tensor2tensor.layers.common_attention import large_compatible_negative
+from rasa.constants import ENV_CPU_INTER_OP_CONFIG, ENV_CPU_INTRA_OP_CONFIG
 from rasa.utils.common import is_logging_disabled
 
 
@@ -38,6 +40,29 @@ def load_tf_config(config: Dict[Text, Any]) -> Optional[tf.compat.v1.ConfigProto
         return None
 
 
+def tf_config_for_training(
+    tf_config: Optional[tf.compat.v1.ConfigProto],
+) -> Optional[tf.compat.v1.ConfigProto]:
+    """Returns the config of the session a model is trained in.
+
+    Unless a `tf_config` was configured, the session uses the thread budget of
+    the training process (see `rasa.utils.common.init_training_job_process`).
+    The budget is not stored with the model, as it only applies to training."""
+
+    if tf_config is not None:
+        return tf_config
+
+    intra_op_threads = os.environ.get(ENV_CPU_INTRA_OP_CONFIG)
+    inter_op_threads = os.environ.get(ENV_CPU_INTER_OP_CONFIG)
+    if not intra_op_threads and not inter_op_threads:
+        return None
+
+    return tf.compat.v1.ConfigProto(
+        intra_op_parallelism_threads=int(intra_op_threads or 0),
+        inter_op_parallelism_threads=int(inter_op_threads or 0),
+    )
+
+
 def create_label_ids(label_ids: "np.ndarray") -> "np.ndarray":
     """Convert various size label_ids into single dim array.
 